@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Answer Cache for NotebookLM
+Stores answers locally so repeated questions skip the browser round trip
+
+Answers are keyed by notebook and normalized question, so "What is X?" and
+"what is  x" hit the same entry. Only questions asked at the start of a
+conversation are cached: a follow-up like "elaborate on the second point"
+depends on what came before it. Entries expire after a TTL, and the least
+recently used ones are evicted once the cache holds too many.
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import ANSWER_CACHE_FILE, ANSWER_CACHE_TTL_SECONDS, ANSWER_CACHE_MAX_ENTRIES
+
+
+def notebook_key(notebook_url: str) -> str:
+    """NotebookLM's notebook ID from its URL, or the bare URL for other pages"""
+    match = re.search(r"/notebook/([^/?#]+)", notebook_url)
+    if match:
+        return match.group(1)
+    return notebook_url.split("#")[0].rstrip("/")
+
+
+def normalize_question(question: str) -> str:
+    """Case, whitespace and trailing punctuation don't change the question"""
+    text = unicodedata.normalize("NFKC", question).casefold()
+    text = " ".join(text.split())
+    return text.rstrip(" ?!.")
+
+
+class AnswerCache:
+    """SQLite-backed answer cache with TTL and size-based eviction"""
+
+    def __init__(
+        self,
+        db_path: Path = ANSWER_CACHE_FILE,
+        ttl_seconds: int = ANSWER_CACHE_TTL_SECONDS,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES
+    ):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS answers (
+                    notebook TEXT NOT NULL,
+                    question_key TEXT NOT NULL,
+                    question TEXT NOT NULL,
+                    answer TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (notebook, question_key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Several scripts (and the daemon) may use the cache at the same time
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, notebook_url: str, question: str) -> Optional[str]:
+        """
+        Look up a cached answer
+
+        Returns:
+            The answer, or None if there is no fresh entry
+        """
+        key = (notebook_key(notebook_url), normalize_question(question))
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT answer FROM answers WHERE notebook = ? AND question_key = ? AND created_at > ?",
+                (*key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE answers SET last_used = ?, hits = hits + 1 WHERE notebook = ? AND question_key = ?",
+                (now, *key)
+            )
+        return row[0]
+
+    def put(self, notebook_url: str, question: str, answer: str):
+        """Store an answer and evict expired and least recently used entries"""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO answers (notebook, question_key, question, answer, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (notebook_key(notebook_url), normalize_question(question), question, answer, now, now)
+            )
+            conn.execute("DELETE FROM answers WHERE created_at <= ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM answers WHERE rowid IN "
+                "(SELECT rowid FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self, notebook_url: Optional[str] = None) -> int:
+        """Remove all entries, or those of one notebook. Returns the number removed."""
+        with closing(self._connect()) as conn, conn:
+            if notebook_url:
+                cursor = conn.execute("DELETE FROM answers WHERE notebook = ?", (notebook_key(notebook_url),))
+            else:
+                cursor = conn.execute("DELETE FROM answers")
+            return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count, hit count and notebooks in the cache"""
+        with closing(self._connect()) as conn:
+            entries, hits, notebooks = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(hits), 0), COUNT(DISTINCT notebook) FROM answers"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "hits": hits,
+            "notebooks": notebooks,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+def get_cached_answer(notebook_url: str, question: str) -> Optional[str]:
+    """AnswerCache().get that never fails: a broken cache just means a miss"""
+    try:
+        return AnswerCache().get(notebook_url, question)
+    except (sqlite3.Error, OSError) as e:
+        print(f"  ⚠️ Answer cache unavailable: {e}")
+        return None
+
+
+def cache_answer(notebook_url: str, question: str, answer: str):
+    """AnswerCache().put that never fails"""
+    try:
+        AnswerCache().put(notebook_url, question, answer)
+    except (sqlite3.Error, OSError) as e:
+        print(f"  ⚠️ Could not cache answer: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the local NotebookLM answer cache')
+
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+    subparsers.add_parser('stats', help='Show cache statistics')
+    clear_parser = subparsers.add_parser('clear', help='Remove cached answers')
+    clear_parser.add_argument('--notebook-url', help='Only remove answers for this notebook')
+
+    args = parser.parse_args()
+    cache = AnswerCache()
+
+    if args.command == 'stats':
+        stats = cache.get_stats()
+        print("📊 Answer Cache:")
+        print(f"  Entries: {stats['entries']} (max {stats['max_entries']})")
+        print(f"  Notebooks: {stats['notebooks']}")
+        print(f"  Hits: {stats['hits']}")
+        print(f"  TTL: {stats['ttl_seconds'] / 3600:.0f} hours")
+        return 0
+
+    elif args.command == 'clear':
+        removed = cache.clear(args.notebook_url)
+        print(f"✅ Removed {removed} cached answers")
+        return 0
+
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Batch Question Runner for NotebookLM
+Runs a JSONL file of questions through warm browser sessions
+
+Each input line is a JSON object with a "question" and optionally a
+"notebook_id" or "notebook_url" (default: --notebook-id/--notebook-url or the
+active notebook), or just a JSON string. One BrowserSession is kept open per
+notebook for the whole batch. Every answer is appended to the output JSONL
+file as soon as it arrives, and a rerun with the same files skips the
+questions that already have an answer, so an interrupted batch picks up
+where it stopped. Questions are matched by notebook and question text (and
+which repeat of that pair it is), not by line number, so lines can be added
+to or removed from the input between runs.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from auth_manager import AuthManager
+from notebook_manager import NotebookLibrary
+from config import INPUT_STRATEGIES, INPUT_STRATEGY
+from answer_cache import notebook_key, normalize_question
+import notebook_daemon
+
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def load_questions(path: Path) -> List[Dict[str, Any]]:
+    """
+    Read the input JSONL file
+
+    Returns:
+        One dict per question with its 1-based input "line" number
+    """
+    questions = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"question": item}
+            elif not isinstance(item, dict):
+                raise ValueError(f"{path}:{line_number}: expected an object or a string")
+            if not item.get("question"):
+                raise ValueError(f"{path}:{line_number}: missing \"question\"")
+            questions.append(dict(item, line=line_number))
+    return questions
+
+
+def question_key(notebook: str, question: str, occurrence: int = 0) -> str:
+    """
+    Resume key for one question
+
+    The same question (as the answer cache normalizes it) to the same
+    notebook gets the same key; `occurrence` tells repeats apart.
+    """
+    text = f"{notebook_key(notebook)}\n{normalize_question(question)}\n{occurrence}"
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def load_completed(path: Path) -> Set[str]:
+    """Keys of the questions that already have a successful answer in the output file"""
+    completed = set()
+    if not path.exists():
+        return completed
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partly written line from a crash
+            if result.get("status") == "success" and result.get("key"):
+                completed.add(result["key"])
+    return completed
+
+
+def open_results(path: Path):
+    """Open the output file for appending, starting on a fresh line"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = open(path, 'a+b')
+    if f.tell() > 0:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+    return f
+
+
+def append_result(f, result: Dict[str, Any]):
+    """Write one result line and make sure it reaches the disk"""
+    f.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def resolve_notebook(item: Dict[str, Any], library: NotebookLibrary, default_notebook_url: Optional[str]):
+    """
+    Notebook URL for one question
+
+    Returns:
+        (notebook_url, error); exactly one of them is None
+    """
+    if item.get("notebook_url"):
+        return item["notebook_url"], None
+    notebook_id = item.get("notebook_id")
+    if notebook_id:
+        notebook = library.get_notebook(notebook_id)
+        if notebook:
+            return notebook['url'], None
+        return None, f"Notebook '{notebook_id}' not found"
+    if default_notebook_url:
+        return default_notebook_url, None
+    return None, "No notebook for this question"
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """Per-question latency percentiles in seconds"""
+    if not latencies:
+        return {}
+    summary = {f"p{pct}": percentile(latencies, pct) for pct in PERCENTILES}
+    summary["max"] = max(latencies)
+    summary["mean"] = sum(latencies) / len(latencies)
+    return summary
+
+
+class BatchRunner:
+    """Asks questions through one warm BrowserSession per notebook"""
+
+    def __init__(self, headless: bool = True, input_strategy: Optional[str] = None, use_cache: bool = True):
+        self.headless = headless
+        self.input_strategy = input_strategy
+        self.use_cache = use_cache
+        self.playwright = None
+        self.context = None
+        self.sessions: Dict[str, Any] = {}
+
+    def _get_session(self, notebook_url: str):
+        """Return the warm tab for a notebook, opening it (and the browser) if needed"""
+        from browser_session import BrowserSession
+
+        if self.context is None:
+            from patchright.sync_api import sync_playwright
+            from browser_utils import BrowserFactory
+
+            print("🌐 Launching browser...")
+            self.playwright = sync_playwright().start()
+            self.context = BrowserFactory.launch_persistent_context(
+                self.playwright,
+                headless=self.headless
+            )
+
+        session = self.sessions.get(notebook_url)
+        if session is None:
+            session_id = hashlib.sha1(notebook_url.encode("utf-8")).hexdigest()[:8]
+            session = BrowserSession(session_id, self.context, notebook_url)
+            self.sessions[notebook_url] = session
+        return session
+
+    def ask(self, question: str, notebook_url: str) -> Dict[str, Any]:
+        """Ask one question in a new conversation; a failed session is closed and reopened next time"""
+        try:
+            session = self._get_session(notebook_url)
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
+        # Questions are independent, and only an empty conversation uses the cache
+        if session.message_count:
+            try:
+                session.reset()
+            except Exception as e:
+                self.sessions.pop(notebook_url, None)
+                session.close()
+                return {"status": "error", "error": str(e)}
+
+        result = session.ask(question, self.input_strategy, use_cache=self.use_cache)
+        if result.get("status") != "success":
+            self.sessions.pop(notebook_url, None)
+            session.close()
+        return result
+
+    def close(self):
+        """Close all sessions and the browser"""
+        for session in self.sessions.values():
+            try:
+                session.close()
+            except Exception as e:
+                print(f"  ⚠️ Error closing session: {e}")
+        self.sessions = {}
+
+        if self.context:
+            try:
+                self.context.close()
+            except Exception:
+                pass
+            self.context = None
+
+        if self.playwright:
+            try:
+                self.playwright.stop()
+            except Exception:
+                pass
+            self.playwright = None
+
+
+def run_batch(
+    input_path: Path,
+    output_path: Path,
+    library: NotebookLibrary,
+    default_notebook_url: Optional[str] = None,
+    headless: bool = True,
+    input_strategy: Optional[str] = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Run every question in input_path that has no answer in output_path yet
+
+    Returns:
+        Counts and latency percentiles for this run. Percentiles only cover
+        answers from NotebookLM; cached answers are counted separately.
+    """
+    questions = load_questions(input_path)
+    completed = load_completed(output_path)
+
+    occurrences: Dict[tuple, int] = {}
+    for item in questions:
+        item["notebook_url"], item["error"] = resolve_notebook(item, library, default_notebook_url)
+        notebook = item["notebook_url"] or item.get("notebook_id") or ""
+        pair = (notebook_key(notebook), normalize_question(item["question"]))
+        item["key"] = question_key(notebook, item["question"], occurrences.get(pair, 0))
+        occurrences[pair] = occurrences.get(pair, 0) + 1
+
+    pending = [q for q in questions if q["key"] not in completed]
+    print(f"📋 {len(questions)} questions, {len(questions) - len(pending)} already answered, "
+          f"{len(pending)} to go")
+
+    runner = BatchRunner(headless=headless, input_strategy=input_strategy, use_cache=use_cache)
+    latencies = []
+    cached = 0
+    failed = 0
+
+    try:
+        with open_results(output_path) as out:
+            for index, item in enumerate(pending, start=1):
+                notebook_id = item.get("notebook_id")
+                notebook_url = item["notebook_url"]
+                error = item["error"]
+
+                print(f"\n[{index}/{len(pending)}] line {item['line']}")
+                started = time.time()
+                if error:
+                    result = {"status": "error", "error": error}
+                else:
+                    result = runner.ask(item["question"], notebook_url)
+                elapsed = time.time() - started
+
+                record = {
+                    "key": item["key"],
+                    "line": item["line"],
+                    "question": item["question"],
+                    "notebook_id": notebook_id,
+                    "notebook_url": notebook_url,
+                    "status": result.get("status"),
+                    "latency_seconds": round(elapsed, 3),
+                }
+                if result.get("status") == "success":
+                    record["answer"] = result["answer"]
+                    record["cached"] = bool(result.get("cached"))
+                    if record["cached"]:
+                        cached += 1
+                    else:
+                        latencies.append(elapsed)
+                    if notebook_id and library.get_notebook(notebook_id):
+                        library.increment_use_count(notebook_id)
+                else:
+                    record["error"] = result.get("error")
+                    failed += 1
+                append_result(out, record)
+    finally:
+        runner.close()
+
+    return {
+        "total": len(questions),
+        "skipped": len(questions) - len(pending),
+        "answered": len(latencies) + cached,
+        "cached": cached,
+        "failed": failed,
+        "latency_seconds": latency_summary(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a JSONL file of questions through NotebookLM')
+
+    parser.add_argument('input', help='JSONL file with one question per line')
+    parser.add_argument('output', help='JSONL file to append answers to (also used to resume)')
+    parser.add_argument('--notebook-url', help='Notebook URL for questions that do not name one')
+    parser.add_argument('--notebook-id', help='Notebook ID for questions that do not name one')
+    parser.add_argument('--input-strategy', choices=INPUT_STRATEGIES,
+                        help=f'How to enter questions (default: {INPUT_STRATEGY})')
+    parser.add_argument('--no-cache', action='store_true', help='Ask NotebookLM even if an answer is cached')
+    parser.add_argument('--show-browser', action='store_true', help='Show browser')
+
+    args = parser.parse_args()
+
+    if not AuthManager().is_authenticated():
+        print("⚠️ Not authenticated. Run: python auth_manager.py setup")
+        return 1
+
+    if notebook_daemon.is_running():
+        print("⚠️ The browser daemon is using the browser profile. Stop it first:")
+        print("python scripts/run.py notebook_daemon.py stop")
+        return 1
+
+    # Resolve the default notebook
+    library = NotebookLibrary()
+    default_url = args.notebook_url
+    if not default_url and args.notebook_id:
+        notebook = library.get_notebook(args.notebook_id)
+        if not notebook:
+            print(f"❌ Notebook '{args.notebook_id}' not found")
+            return 1
+        default_url = notebook['url']
+    if not default_url:
+        active = library.get_active_notebook()
+        if active:
+            default_url = active['url']
+            print(f"📚 Using active notebook: {active['name']}")
+
+    try:
+        summary = run_batch(
+            Path(args.input),
+            Path(args.output),
+            library,
+            default_notebook_url=default_url,
+            headless=not args.show_browser,
+            input_strategy=args.input_strategy,
+            use_cache=not args.no_cache
+        )
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    print("\n" + "=" * 60)
+    print(f"✅ {summary['answered']} answered ({summary['cached']} from cache), ❌ {summary['failed']} failed, "
+          f"⏭️ {summary['skipped']} already done (of {summary['total']})")
+    latency = summary["latency_seconds"]
+    if latency:
+        print("⏱️ NotebookLM latency: " + ", ".join(f"{name} {value:.1f}s" for name, value in latency.items()))
+    print(f"📄 Results: {args.output}")
+    if summary['failed']:
+        print("Rerun the same command to retry the failed questions.")
+    print("=" * 60)
+    return 0 if not summary['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
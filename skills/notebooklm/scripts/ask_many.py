@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Ask several NotebookLM notebooks the same question at once
+
+Opens one tab per notebook in a single browser context and submits the
+question in all of them concurrently (Playwright async API), so the total
+time is close to the slowest single answer rather than the sum of all of
+them. Answers are printed as they complete.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from auth_manager import AuthManager
+from notebook_manager import NotebookLibrary
+from config import (
+    QUERY_INPUT_SELECTORS, RESPONSE_SELECTORS, QUERY_TIMEOUT_SECONDS, PAGE_LOAD_TIMEOUT,
+    INPUT_STRATEGIES, INPUT_STRATEGY
+)
+from ask_question import FOLLOW_UP_REMINDER
+import notebook_daemon
+
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+async def _find_query_input(page) -> str:
+    """Wait for the chat input and return the selector that matched"""
+    for selector in QUERY_INPUT_SELECTORS:
+        try:
+            await page.wait_for_selector(selector, timeout=10000, state="visible")
+            return selector
+        except Exception:
+            continue
+    raise RuntimeError("Could not find query input")
+
+
+async def _latest_response_text(page) -> Optional[str]:
+    """Async counterpart of ResponseUtils.latest_response_text"""
+    for selector in RESPONSE_SELECTORS:
+        elements = await page.query_selector_all(selector)
+        if elements:
+            return (await elements[-1].inner_text()).strip()
+    return None
+
+
+async def ask_notebook(
+    context,
+    notebook: Dict[str, Any],
+    question: str,
+    timeout_seconds: float,
+    input_strategy: Optional[str] = None
+) -> str:
+    """
+    Ask one notebook in its own tab
+
+    Returns:
+        Answer text from NotebookLM
+    """
+    from browser_utils import ANSWER_READY_JS, ResponseUtils, StealthUtils
+
+    page = await context.new_page()
+    try:
+        await page.goto(notebook['url'], wait_until="domcontentloaded", timeout=PAGE_LOAD_TIMEOUT)
+        if "accounts.google.com" in page.url:
+            raise RuntimeError("Authentication required. Please run auth_manager.py setup first.")
+
+        input_selector = await _find_query_input(page)
+        previous_answer = await _latest_response_text(page)
+
+        await StealthUtils.enter_text_async(page, input_selector, question, input_strategy)
+        await page.keyboard.press("Enter")
+
+        handle = await page.wait_for_function(
+            ANSWER_READY_JS,
+            arg=ResponseUtils.answer_ready_arg(previous_answer),
+            polling=100,
+            timeout=timeout_seconds * 1000
+        )
+        return await handle.json_value()
+    finally:
+        await page.close()
+
+
+async def ask_many(
+    notebooks: List[Dict[str, Any]],
+    question: str,
+    headless: bool = True,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    timeout_seconds: float = QUERY_TIMEOUT_SECONDS,
+    input_strategy: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Ask every notebook the same question concurrently
+
+    Args:
+        notebooks: Library entries (need 'id', 'name' and 'url')
+        question: Question to ask
+        headless: Run browser in headless mode
+        max_concurrency: Maximum number of notebooks asked at the same time
+        timeout_seconds: Time limit for each notebook, including page load
+        input_strategy: How to enter the question (default: config.INPUT_STRATEGY)
+
+    Returns:
+        One result dict per notebook, in the order they completed
+    """
+    from patchright.async_api import async_playwright
+    from browser_utils import BrowserFactory
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async with async_playwright() as playwright:
+        context = await playwright.chromium.launch_persistent_context(
+            **BrowserFactory.context_options(headless)
+        )
+        # Same cookie workaround as BrowserFactory.launch_persistent_context
+        cookies = BrowserFactory.load_state_cookies()
+        if cookies:
+            await context.add_cookies(cookies)
+
+        async def run(notebook: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                # Timed from when this notebook's turn starts, not from the fan-out
+                started = time.time()
+                result = {"notebook_id": notebook['id'], "name": notebook['name'], "question": question}
+                try:
+                    answer = await asyncio.wait_for(
+                        ask_notebook(context, notebook, question, timeout_seconds, input_strategy),
+                        timeout=timeout_seconds
+                    )
+                    result.update(status="success", answer=answer)
+                except asyncio.TimeoutError:
+                    result.update(status="error", error=f"No response received within {timeout_seconds} seconds")
+                except Exception as e:
+                    result.update(status="error", error=str(e) or type(e).__name__)
+                result["elapsed_seconds"] = round(time.time() - started, 1)
+                return result
+
+        results = []
+        try:
+            for next_result in asyncio.as_completed([run(nb) for nb in notebooks]):
+                result = await next_result
+                if result["status"] == "success":
+                    print(f"  ✅ {result['name']} ({result['elapsed_seconds']}s)")
+                else:
+                    print(f"  ❌ {result['name']}: {result['error']}")
+                results.append(result)
+        finally:
+            await context.close()
+
+    return results
+
+
+def resolve_notebooks(library: NotebookLibrary, args) -> List[Dict[str, Any]]:
+    """Pick the target notebooks from --notebook-ids, --search or --all"""
+    if args.notebook_ids:
+        notebooks = []
+        for notebook_id in args.notebook_ids.split(','):
+            notebook = library.get_notebook(notebook_id.strip())
+            if not notebook:
+                raise ValueError(f"Notebook '{notebook_id.strip()}' not found")
+            notebooks.append(notebook)
+        return notebooks
+    if args.search:
+        return library.search_notebooks(args.search)
+    return library.list_notebooks()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ask several NotebookLM notebooks the same question')
+
+    parser.add_argument('--question', required=True, help='Question to ask')
+    targets = parser.add_mutually_exclusive_group(required=True)
+    targets.add_argument('--notebook-ids', help='Comma-separated notebook IDs from library')
+    targets.add_argument('--search', help='Ask every notebook matching this search query')
+    targets.add_argument('--all', action='store_true', help='Ask every notebook in the library')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help=f'Notebooks asked at the same time (default: {DEFAULT_MAX_CONCURRENCY})')
+    parser.add_argument('--timeout', type=float, default=QUERY_TIMEOUT_SECONDS,
+                        help=f'Seconds allowed per notebook (default: {QUERY_TIMEOUT_SECONDS})')
+    parser.add_argument('--input-strategy', choices=INPUT_STRATEGIES,
+                        help=f'How to enter the question (default: {INPUT_STRATEGY})')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    parser.add_argument('--show-browser', action='store_true', help='Show browser')
+
+    args = parser.parse_args()
+
+    library = NotebookLibrary()
+    try:
+        notebooks = resolve_notebooks(library, args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if not notebooks:
+        print("❌ No matching notebooks in library")
+        return 1
+
+    if not AuthManager().is_authenticated():
+        print("⚠️ Not authenticated. Run: python auth_manager.py setup")
+        return 1
+
+    if notebook_daemon.is_running():
+        print("⚠️ The browser daemon is using the browser profile. Stop it first:")
+        print("python scripts/run.py notebook_daemon.py stop")
+        return 1
+
+    print(f"💬 Asking {len(notebooks)} notebooks: {args.question}")
+    results = asyncio.run(ask_many(
+        notebooks,
+        args.question,
+        headless=not args.show_browser,
+        max_concurrency=args.max_concurrency,
+        timeout_seconds=args.timeout,
+        input_strategy=args.input_strategy
+    ))
+
+    for result in results:
+        if result["status"] == "success":
+            library.increment_use_count(result["notebook_id"])
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    for result in results:
+        print("\n" + "=" * 60)
+        print(f"📚 {result['name']} ({result['notebook_id']})")
+        print("=" * 60)
+        print()
+        print(result.get("answer") or f"❌ {result['error']}")
+    print()
+    print("=" * 60)
+    print(FOLLOW_UP_REMINDER.strip())
+    print()
+
+    succeeded = sum(1 for r in results if r["status"] == "success")
+    print(f"✅ {succeeded}/{len(results)} notebooks answered")
+    return 0 if succeeded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
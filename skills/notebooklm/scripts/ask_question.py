@@ -11,19 +11,18 @@ See: https://github.com/microsoft/playwright/issues/36139
 
 import argparse
 import sys
-import time
 import re
 from pathlib import Path
-
-from patchright.sync_api import sync_playwright
+from typing import Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from auth_manager import AuthManager
 from notebook_manager import NotebookLibrary
-from config import QUERY_INPUT_SELECTORS, RESPONSE_SELECTORS
-from browser_utils import BrowserFactory, StealthUtils
+from config import QUERY_INPUT_SELECTORS, QUERY_TIMEOUT_SECONDS, INPUT_STRATEGIES, INPUT_STRATEGY
+from answer_cache import get_cached_answer, cache_answer
+import notebook_daemon
 
 
 # Follow-up reminder (adapted from MCP server for stateless operation)
@@ -33,18 +32,75 @@ FOLLOW_UP_REMINDER = (
     "You can always ask another question! Think about it carefully: "
     "before you reply to the user, review their original request and this answer. "
     "If anything is still unclear or missing, ask me another comprehensive question "
-    "that includes all necessary context (since each question opens a new browser session)."
+    "that includes all necessary context (since each question starts a new conversation)."
 )
 
 
-def ask_notebooklm(question: str, notebook_url: str, headless: bool = True) -> str:
+def ask_via_daemon(
+    question: str,
+    notebook_url: str,
+    input_strategy: Optional[str] = None,
+    use_cache: bool = True
+) -> str:
+    """
+    Ask a question through the browser daemon, starting it if needed
+
+    The daemon keeps the browser and the notebook tab open between calls,
+    so only the first question pays for browser startup and page load.
+
+    Returns:
+        Answer text from NotebookLM
     """
-    Ask a question to NotebookLM
+    auth = AuthManager()
+
+    if not auth.is_authenticated():
+        print("⚠️ Not authenticated. Run: python auth_manager.py setup")
+        return None
+
+    print(f"💬 Asking: {question}")
+    print(f"📚 Notebook: {notebook_url}")
+
+    if not notebook_daemon.start_daemon():
+        return None
+
+    print("  ⏳ Waiting for answer...")
+    try:
+        result = notebook_daemon.send_request(
+            {"action": "ask", "question": question, "notebook_url": notebook_url,
+             "input_strategy": input_strategy, "use_cache": use_cache},
+            # Allow for opening the notebook tab on top of the answer itself
+            timeout=QUERY_TIMEOUT_SECONDS + 60
+        )
+    except OSError as e:
+        print(f"  ❌ Error talking to daemon: {e}")
+        return None
+
+    if not result or result.get("status") != "success":
+        error = result.get("error") if result else "daemon closed the connection"
+        print(f"  ❌ Error: {error}")
+        return None
+
+    print("  ✅ Got answer!")
+    # Add follow-up reminder to encourage Claude to ask more questions
+    return result["answer"] + FOLLOW_UP_REMINDER
+
+
+def ask_notebooklm(
+    question: str,
+    notebook_url: str,
+    headless: bool = True,
+    input_strategy: Optional[str] = None,
+    use_cache: bool = True
+) -> str:
+    """
+    Ask a question to NotebookLM in a browser started just for this question
 
     Args:
         question: Question to ask
         notebook_url: NotebookLM notebook URL
         headless: Run browser in headless mode
+        input_strategy: How to enter the question (default: config.INPUT_STRATEGY)
+        use_cache: Store the answer in the answer cache
 
     Returns:
         Answer text from NotebookLM
@@ -58,6 +114,9 @@ def ask_notebooklm(question: str, notebook_url: str, headless: bool = True) -> s
     print(f"💬 Asking: {question}")
     print(f"📚 Notebook: {notebook_url}")
 
+    from patchright.sync_api import sync_playwright
+    from browser_utils import BrowserFactory, StealthUtils, ResponseUtils
+
     playwright = None
     context = None
 
@@ -100,69 +159,34 @@ def ask_notebooklm(question: str, notebook_url: str, headless: bool = True) -> s
             print("  ❌ Could not find query input")
             return None
 
-        # Type question (human-like, fast)
-        print("  ⏳ Typing question...")
-        
-        # Use primary selector for typing
+        # Remember the newest answer already on the page, so it isn't mistaken for ours
+        previous_answer = ResponseUtils.latest_response_text(page)
+
+        # Enter question
+        print("  ⏳ Entering question...")
+
+        # Use primary selector for input
         input_selector = QUERY_INPUT_SELECTORS[0]
-        StealthUtils.human_type(page, input_selector, question)
+        StealthUtils.enter_text(page, input_selector, question, input_strategy)
 
         # Submit
         print("  📤 Submitting...")
         page.keyboard.press("Enter")
 
-        # Small pause
-        StealthUtils.random_delay(500, 1500)
-
-        # Wait for response (MCP approach: poll for stable text)
+        # Wait for response (returns once the answer stops changing)
         print("  ⏳ Waiting for answer...")
-
-        answer = None
-        stable_count = 0
-        last_text = None
-        deadline = time.time() + 120  # 2 minutes timeout
-
-        while time.time() < deadline:
-            # Check if NotebookLM is still thinking (most reliable indicator)
-            try:
-                thinking_element = page.query_selector('div.thinking-message')
-                if thinking_element and thinking_element.is_visible():
-                    time.sleep(1)
-                    continue
-            except:
-                pass
-
-            # Try to find response with MCP selectors
-            for selector in RESPONSE_SELECTORS:
-                try:
-                    elements = page.query_selector_all(selector)
-                    if elements:
-                        # Get last (newest) response
-                        latest = elements[-1]
-                        text = latest.inner_text().strip()
-
-                        if text:
-                            if text == last_text:
-                                stable_count += 1
-                                if stable_count >= 3:  # Stable for 3 polls
-                                    answer = text
-                                    break
-                            else:
-                                stable_count = 0
-                                last_text = text
-                except:
-                    continue
-
-            if answer:
-                break
-
-            time.sleep(1)
+        try:
+            answer = ResponseUtils.wait_for_answer(page, previous_answer, timeout_seconds=QUERY_TIMEOUT_SECONDS)
+        except TimeoutError:
+            answer = None
 
         if not answer:
             print("  ❌ Timeout waiting for answer")
             return None
 
         print("  ✅ Got answer!")
+        if use_cache:
+            cache_answer(notebook_url, question, answer)
         # Add follow-up reminder to encourage Claude to ask more questions
         return answer + FOLLOW_UP_REMINDER
 
@@ -194,6 +218,12 @@ def main():
     parser.add_argument('--notebook-url', help='NotebookLM notebook URL')
     parser.add_argument('--notebook-id', help='Notebook ID from library')
     parser.add_argument('--show-browser', action='store_true', help='Show browser')
+    parser.add_argument('--input-strategy', choices=INPUT_STRATEGIES,
+                        help=f'How to enter the question (default: {INPUT_STRATEGY})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always ask NotebookLM, even if the answer is cached')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='Use a one-off browser instead of the background daemon')
 
     args = parser.parse_args()
 
@@ -221,8 +251,9 @@ def main():
             notebooks = library.list_notebooks()
             if notebooks:
                 print("\n📚 Available notebooks:")
+                active_notebook_id = library.active_notebook_id
                 for nb in notebooks:
-                    mark = " [ACTIVE]" if nb.get('id') == library.active_notebook_id else ""
+                    mark = " [ACTIVE]" if nb.get('id') == active_notebook_id else ""
                     print(f"  {nb['id']}: {nb['name']}{mark}")
                 print("\nSpecify with --notebook-id or set active:")
                 print("python scripts/run.py notebook_manager.py activate --id ID")
@@ -231,12 +262,31 @@ def main():
                 print("python scripts/run.py notebook_manager.py add --url URL --name NAME --description DESC --topics TOPICS")
             return 1
 
-    # Ask the question
-    answer = ask_notebooklm(
-        question=args.question,
-        notebook_url=notebook_url,
-        headless=not args.show_browser
-    )
+    # Ask the question. The daemon runs headless, so a visible browser
+    # always uses a one-off session.
+    if args.no_daemon or args.show_browser or not notebook_daemon.daemon_supported():
+        # A one-off session always starts a new conversation, so repeated
+        # questions can be answered from the local cache
+        cached = None if args.no_cache else get_cached_answer(notebook_url, args.question)
+        if cached:
+            print("💾 Answer from cache (use --no-cache to ask again)")
+            answer = cached + FOLLOW_UP_REMINDER
+        elif notebook_daemon.is_running():
+            print("⚠️ The browser daemon is using the browser profile. Stop it first:")
+            print("python scripts/run.py notebook_daemon.py stop")
+            return 1
+        else:
+            answer = ask_notebooklm(
+                question=args.question,
+                notebook_url=notebook_url,
+                headless=not args.show_browser,
+                input_strategy=args.input_strategy,
+                use_cache=not args.no_cache
+            )
+    else:
+        # The daemon's tab may already hold a conversation; it only uses
+        # the cache while the conversation is empty
+        answer = ask_via_daemon(args.question, notebook_url, args.input_strategy, use_cache=not args.no_cache)
 
     if answer:
         print("\n" + "=" * 60)
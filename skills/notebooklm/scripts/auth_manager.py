@@ -24,8 +24,12 @@ from patchright.sync_api import sync_playwright, BrowserContext
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import BROWSER_STATE_DIR, STATE_FILE, AUTH_INFO_FILE, DATA_DIR
+from config import (
+    BROWSER_STATE_DIR, STATE_FILE, AUTH_INFO_FILE, DATA_DIR,
+    AUTH_COOKIE_NAMES, AUTH_VALIDATION_CACHE_SECONDS
+)
 from browser_utils import BrowserFactory
+from notebook_daemon import is_running, stop_daemon
 
 
 class AuthManager:
@@ -54,6 +58,11 @@ class AuthManager:
         if not self.state_file.exists():
             return False
 
+        # Saved sign-in cookies that have all expired can't work
+        if self.auth_cookies_expired():
+            print("⚠️ Google sign-in cookies have expired, re-authentication needed")
+            return False
+
         # Check if state file is not too old (7 days)
         age_days = (time.time() - self.state_file.stat().st_mtime) / 86400
         if age_days > 7:
@@ -61,6 +70,46 @@ class AuthManager:
 
         return True
 
+    def _load_auth_cookies(self) -> list:
+        """Google sign-in cookies saved in state.json"""
+        try:
+            with open(self.state_file, 'r') as f:
+                cookies = json.load(f).get('cookies', [])
+        except Exception:
+            return []
+        return [
+            c for c in cookies
+            if c.get('name') in AUTH_COOKIE_NAMES and c.get('domain', '').endswith('google.com')
+        ]
+
+    def auth_cookie_expiry(self) -> Optional[float]:
+        """
+        When the saved sign-in cookies expire
+
+        Returns:
+            Latest expiry timestamp, -1 for session cookies, or None if there are none
+        """
+        expiries = [c.get('expires', -1) for c in self._load_auth_cookies()]
+        if not expiries:
+            return None
+        if any(e is None or e < 0 for e in expiries):
+            return -1
+        return max(expiries)
+
+    def auth_cookies_expired(self) -> bool:
+        """True only if sign-in cookies were saved and all of them have expired"""
+        expiry = self.auth_cookie_expiry()
+        return expiry is not None and expiry != -1 and expiry < time.time()
+
+    def _cached_validation(self) -> bool:
+        """Whether a browser validation succeeded recently for the current state.json"""
+        info = self._load_auth_info()
+        validated_at = info.get('validated_at')
+        if not validated_at or time.time() - validated_at > AUTH_VALIDATION_CACHE_SECONDS:
+            return False
+        # A new login or saved state invalidates the cached result
+        return info.get('validated_state_mtime') == self.state_file.stat().st_mtime
+
     def get_auth_info(self) -> Dict[str, Any]:
         """Get authentication information"""
         info = {
@@ -69,20 +118,35 @@ class AuthManager:
             'state_exists': self.state_file.exists()
         }
 
-        if self.auth_info_file.exists():
-            try:
-                with open(self.auth_info_file, 'r') as f:
-                    saved_info = json.load(f)
-                    info.update(saved_info)
-            except Exception:
-                pass
+        info.update(self._load_auth_info())
 
         if info['state_exists']:
             age_hours = (time.time() - self.state_file.stat().st_mtime) / 3600
             info['state_age_hours'] = age_hours
+            info['cookie_expiry'] = self.auth_cookie_expiry()
 
         return info
 
+    def _load_auth_info(self) -> Dict[str, Any]:
+        """Saved authentication metadata"""
+        if self.auth_info_file.exists():
+            try:
+                with open(self.auth_info_file, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return {}
+
+    def _update_auth_info(self, **fields):
+        """Merge fields into the saved authentication metadata"""
+        try:
+            info = self._load_auth_info()
+            info.update(fields)
+            with open(self.auth_info_file, 'w') as f:
+                json.dump(info, f, indent=2)
+        except Exception:
+            pass  # Non-critical
+
     def setup_auth(self, headless: bool = False, timeout_minutes: int = 10) -> bool:
         """
         Perform interactive authentication setup
@@ -97,6 +161,10 @@ class AuthManager:
         print("🔐 Starting authentication setup...")
         print(f"  Timeout: {timeout_minutes} minutes")
 
+        # The daemon holds the browser profile open
+        if stop_daemon():
+            print("  🛑 Stopped browser daemon")
+
         playwright = None
         context = None
 
@@ -169,15 +237,21 @@ class AuthManager:
 
     def _save_auth_info(self):
         """Save authentication metadata"""
-        try:
-            info = {
-                'authenticated_at': time.time(),
-                'authenticated_at_iso': time.strftime('%Y-%m-%d %H:%M:%S')
-            }
-            with open(self.auth_info_file, 'w') as f:
-                json.dump(info, f, indent=2)
-        except Exception:
-            pass  # Non-critical
+        self._update_auth_info(
+            authenticated_at=time.time(),
+            authenticated_at_iso=time.strftime('%Y-%m-%d %H:%M:%S')
+        )
+        self._record_validation(True)
+
+    def _record_validation(self, valid: bool):
+        """Remember a successful validation of the current state.json, or forget it"""
+        if valid and self.state_file.exists():
+            self._update_auth_info(
+                validated_at=time.time(),
+                validated_state_mtime=self.state_file.stat().st_mtime
+            )
+        else:
+            self._update_auth_info(validated_at=None, validated_state_mtime=None)
 
     def clear_auth(self) -> bool:
         """
@@ -188,6 +262,10 @@ class AuthManager:
         """
         print("🗑️ Clearing authentication data...")
 
+        # Don't leave a daemon running with the old session
+        if stop_daemon():
+            print("  🛑 Stopped browser daemon")
+
         try:
             # Remove browser state
             if self.state_file.exists():
@@ -230,10 +308,18 @@ class AuthManager:
         # Setup new auth
         return self.setup_auth(headless, timeout_minutes)
 
-    def validate_auth(self) -> bool:
+    def validate_auth(self, use_browser: bool = False) -> bool:
         """
         Validate that stored authentication works
-        Uses persistent context to match actual usage pattern
+
+        Expired sign-in cookies in state.json fail without a browser, and a
+        browser validation that succeeded within AUTH_VALIDATION_CACHE_SECONDS
+        is reused. Otherwise NotebookLM is opened in the persistent context
+        to match the actual usage pattern. While the browser daemon holds the
+        profile, only the saved cookies are checked.
+
+        Args:
+            use_browser: Always check in the browser
 
         Returns:
             True if authentication is valid
@@ -241,8 +327,25 @@ class AuthManager:
         if not self.is_authenticated():
             return False
 
+        if not use_browser and self._cached_validation():
+            print("  ✅ Authentication is valid (validated recently)")
+            return True
+
+        if is_running():
+            print("  ⚠️ The browser daemon is using the browser profile; only the saved sign-in cookies were checked")
+            print("     To check in the browser, stop it first: python scripts/run.py notebook_daemon.py stop")
+            return True
+
         print("🔍 Validating authentication...")
+        valid = self._validate_in_browser()
+        if valid is None:
+            # The browser couldn't check; that says nothing about the login
+            return False
+        self._record_validation(valid)
+        return valid
 
+    def _validate_in_browser(self) -> Optional[bool]:
+        """Open NotebookLM and check for a login redirect; None if the check couldn't run"""
         playwright = None
         context = None
 
@@ -269,7 +372,7 @@ class AuthManager:
 
         except Exception as e:
             print(f"  ❌ Validation failed: {e}")
-            return False
+            return None
 
         finally:
             if context:
@@ -299,7 +402,9 @@ def main():
     subparsers.add_parser('status', help='Check authentication status')
 
     # Validate command
-    subparsers.add_parser('validate', help='Validate authentication')
+    validate_parser = subparsers.add_parser('validate', help='Validate authentication')
+    validate_parser.add_argument('--browser', action='store_true',
+                                 help='Always check in the browser, even if validated recently')
 
     # Clear command
     subparsers.add_parser('clear', help='Clear authentication')
@@ -330,10 +435,15 @@ def main():
             print(f"  State age: {info['state_age_hours']:.1f} hours")
         if info.get('authenticated_at_iso'):
             print(f"  Last auth: {info['authenticated_at_iso']}")
+        if info.get('cookie_expiry') == -1:
+            print("  Sign-in cookies: session only")
+        elif info.get('cookie_expiry'):
+            expires = time.strftime('%Y-%m-%d %H:%M', time.localtime(info['cookie_expiry']))
+            print(f"  Sign-in cookies expire: {expires}")
         print(f"  State file: {info['state_file']}")
 
     elif args.command == 'validate':
-        if auth.validate_auth():
+        if auth.validate_auth(use_browser=args.browser):
             print("Authentication is valid and working")
         else:
             print("Authentication is invalid or expired")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Answer Detection Benchmark
+Measures how soon a finished answer is picked up, against a local page
+
+Runs questions against testdata/stand_in_notebook.html, which streams its
+answers like NotebookLM, and compares ResponseUtils.wait_for_answer with the
+fixed-interval polling it replaced: BrowserSession's (used by the daemon and
+ask_batch.py) and ask_notebooklm's. For each question it reports how long
+after the last chunk arrived the answer was returned, and whether the
+returned text was the complete answer. No Google account is needed; the
+browser uses a throwaway profile.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import QUERY_INPUT_SELECTORS, THINKING_SELECTOR, ANSWER_QUIET_MS
+
+
+STAND_IN_PAGE = Path(__file__).parent / "testdata" / "stand_in_notebook.html"
+
+# The checks used before ANSWER_READY_JS: (poll interval in seconds, reads of
+# the same text needed, counting the first)
+LEGACY_POLLING = {
+    "session": (0.5, 3),   # BrowserSession._wait_for_latest_answer
+    "polling": (1.0, 4),   # ask_notebooklm
+}
+METHODS = ["observer", *LEGACY_POLLING]
+
+
+def legacy_poll(page, previous_answer: Optional[str], method: str, timeout_seconds: float = 120) -> str:
+    """Poll at a fixed interval until the same new text has been read enough times"""
+    from browser_utils import ResponseUtils
+
+    interval, reads = LEGACY_POLLING[method]
+    stable_count = 0
+    last_text = None
+    deadline = time.time() + timeout_seconds
+    while time.time() < deadline:
+        thinking = page.query_selector(THINKING_SELECTOR)
+        if thinking and thinking.is_visible():
+            time.sleep(interval)
+            continue
+
+        text = ResponseUtils.latest_response_text(page)
+        if text and text != previous_answer:
+            if text == last_text:
+                stable_count += 1
+                if stable_count >= reads:
+                    return text
+            else:
+                stable_count = 1
+                last_text = text
+        time.sleep(interval)
+    raise TimeoutError(f"No response received within {timeout_seconds} seconds")
+
+
+def run_question(page, question: str, method: str, quiet_ms: int) -> Dict[str, object]:
+    """Ask one question on the stand-in page and time its detection"""
+    from browser_utils import StealthUtils, ResponseUtils
+
+    previous_answer = ResponseUtils.latest_response_text(page)
+    page.evaluate("() => { delete document.body.dataset.answeredAt; }")
+    StealthUtils.enter_text(page, QUERY_INPUT_SELECTORS[0], question)
+    page.keyboard.press("Enter")
+
+    if method == "observer":
+        answer = ResponseUtils.wait_for_answer(page, previous_answer, quiet_ms=quiet_ms)
+    else:
+        answer = legacy_poll(page, previous_answer, method)
+
+    # Page clock: time since the last chunk, or null if it is still streaming
+    latency_ms = page.evaluate(
+        "() => document.body.dataset.answeredAt === undefined ? null"
+        " : performance.now() - Number(document.body.dataset.answeredAt)"
+    )
+    page.wait_for_function("() => document.body.dataset.answeredAt !== undefined", timeout=120000)
+    complete = answer == ResponseUtils.latest_response_text(page)
+    return {"latency_seconds": None if latency_ms is None else latency_ms / 1000, "complete": complete}
+
+
+def benchmark(
+    url: str,
+    runs: int = 5,
+    quiet_ms: int = ANSWER_QUIET_MS,
+    methods: List[str] = METHODS,
+    headless: bool = True
+) -> Dict[str, List[Dict[str, object]]]:
+    """Ask `runs` questions per method, each method in a fresh tab"""
+    import tempfile
+    from patchright.sync_api import sync_playwright
+    from browser_utils import BrowserFactory
+
+    results = {}
+    with tempfile.TemporaryDirectory() as profile_dir, sync_playwright() as playwright:
+        context = BrowserFactory.launch_persistent_context(playwright, headless=headless, user_data_dir=profile_dir)
+        try:
+            for method in methods:
+                page = context.new_page()
+                page.goto(url, wait_until="domcontentloaded")
+                results[method] = []
+                for run in range(1, runs + 1):
+                    result = run_question(page, f"Question {run} for {method}?", method, quiet_ms)
+                    results[method].append(result)
+                    latency = result["latency_seconds"]
+                    print(f"  {method} #{run}: " + (f"{latency:.2f}s after the last chunk" if latency is not None
+                                                   else "returned while still streaming")
+                          + ("" if result["complete"] else " (truncated)"))
+                page.close()
+        finally:
+            context.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark answer completion detection on a local stand-in page')
+
+    parser.add_argument('--runs', type=int, default=5, help='Questions per method (default: 5)')
+    parser.add_argument('--quiet-ms', type=int, default=ANSWER_QUIET_MS,
+                        help=f'Quiet window for the observer (default: {ANSWER_QUIET_MS})')
+    parser.add_argument('--method', choices=METHODS, action='append',
+                        help='Only run this method (can be repeated)')
+    parser.add_argument('--think', type=int, default=1000, help='Page: ms before the answer starts')
+    parser.add_argument('--chunks', type=int, default=20, help='Page: chunks per answer')
+    parser.add_argument('--interval', type=int, default=150, help='Page: ms between chunks')
+    parser.add_argument('--pause', type=int, default=0, help='Page: extra ms pause halfway through')
+    parser.add_argument('--words', type=int, default=200, help='Page: answer length in words')
+    parser.add_argument('--noise', type=int, default=100, help='Page: ms between unrelated DOM updates (0 = off)')
+    parser.add_argument('--show-browser', action='store_true', help='Show browser')
+
+    args = parser.parse_args()
+
+    url = (STAND_IN_PAGE.resolve().as_uri() + f"?think={args.think}&chunks={args.chunks}&interval={args.interval}"
+           f"&pause={args.pause}&words={args.words}&noise={args.noise}")
+    print(f"📄 {url}")
+
+    results = benchmark(
+        url,
+        runs=args.runs,
+        quiet_ms=args.quiet_ms,
+        methods=args.method or METHODS,
+        headless=not args.show_browser
+    )
+
+    print("\n" + "=" * 60)
+    for method, runs in results.items():
+        latencies = [r["latency_seconds"] for r in runs if r["latency_seconds"] is not None]
+        truncated = sum(1 for r in runs if not r["complete"])
+        parts = []
+        if latencies:
+            parts.append(f"mean {statistics.mean(latencies):.2f}s, max {max(latencies):.2f}s after the last chunk")
+        parts.append(f"{truncated}/{len(runs)} truncated")
+        print(f"{method:>8}: " + ", ".join(parts))
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
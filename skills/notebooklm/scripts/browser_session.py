@@ -15,7 +15,9 @@ from patchright.sync_api import BrowserContext, Page
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from browser_utils import StealthUtils
+from browser_utils import StealthUtils, ResponseUtils
+from config import QUERY_TIMEOUT_SECONDS
+from answer_cache import get_cached_answer, cache_answer
 
 
 class BrowserSession:
@@ -88,22 +90,47 @@ class BrowserSession:
             # Try alternative selector
             self.page.wait_for_selector('textarea[aria-label="Feld für Anfragen"]', timeout=5000, state="visible")
 
-    def ask(self, question: str) -> Dict[str, Any]:
+    def ask(
+        self,
+        question: str,
+        input_strategy: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
         """
         Ask a question in this session
 
         Args:
             question: The question to ask
+            input_strategy: How to enter the question (default: config.INPUT_STRATEGY)
+            use_cache: Use the answer cache while this tab's conversation is empty.
+                Later questions may refer to earlier answers, so they are
+                neither looked up nor cached.
 
         Returns:
-            Dict with status, question, answer, session_id
+            Dict with status, question, answer, session_id (and cached=True for cache hits)
         """
         try:
             self.last_activity = time.time()
-            self.message_count += 1
 
             print(f"💬 [{self.id}] Asking: {question}")
 
+            # A cache hit is never typed, so the conversation stays empty
+            use_cache = use_cache and self.message_count == 0
+            if use_cache:
+                cached = get_cached_answer(self.notebook_url, question)
+                if cached:
+                    print(f"  ✅ Cached response ({len(cached)} chars)")
+                    return {
+                        "status": "success",
+                        "question": question,
+                        "answer": cached,
+                        "session_id": self.id,
+                        "notebook_url": self.notebook_url,
+                        "cached": True
+                    }
+
+            self.message_count += 1
+
             # Snapshot current answer to detect new response
             previous_answer = self._snapshot_latest_response()
 
@@ -115,9 +142,9 @@ class BrowserSession:
                 chat_input_selector = 'textarea[aria-label="Feld für Anfragen"]'
                 self.page.wait_for_selector(chat_input_selector, timeout=5000, state="visible")
 
-            # Click and type with human-like behavior
+            # Click and enter the question
             self.stealth.realistic_click(self.page, chat_input_selector)
-            self.stealth.human_type(self.page, chat_input_selector, question)
+            self.stealth.enter_text(self.page, chat_input_selector, question, input_strategy)
 
             # Small pause before submit
             self.stealth.random_delay(300, 800)
@@ -127,7 +154,6 @@ class BrowserSession:
 
             # Wait for response
             print("  ⏳ Waiting for response...")
-            self.stealth.random_delay(1500, 3000)
 
             # Get new answer
             answer = self._wait_for_latest_answer(previous_answer)
@@ -136,6 +162,8 @@ class BrowserSession:
                 raise Exception("Empty response from NotebookLM")
 
             print(f"  ✅ Got response ({len(answer)} chars)")
+            if use_cache:
+                cache_answer(self.notebook_url, question, answer)
 
             return {
                 "status": "success",
@@ -157,54 +185,13 @@ class BrowserSession:
     def _snapshot_latest_response(self) -> Optional[str]:
         """Get the current latest response text"""
         try:
-            # Use correct NotebookLM selector
-            responses = self.page.query_selector_all(".to-user-container .message-text-content")
-            if responses:
-                return responses[-1].inner_text()
+            return ResponseUtils.latest_response_text(self.page)
         except Exception:
-            pass
-        return None
+            return None
 
-    def _wait_for_latest_answer(self, previous_answer: Optional[str], timeout: int = 120) -> str:
+    def _wait_for_latest_answer(self, previous_answer: Optional[str], timeout: int = QUERY_TIMEOUT_SECONDS) -> str:
         """Wait for and extract the new answer"""
-        start_time = time.time()
-        last_candidate = None
-        stable_count = 0
-
-        while time.time() - start_time < timeout:
-            # Check if NotebookLM is still thinking (most reliable indicator)
-            try:
-                thinking_element = self.page.query_selector('div.thinking-message')
-                if thinking_element and thinking_element.is_visible():
-                    time.sleep(0.5)
-                    continue
-            except Exception:
-                pass
-
-            try:
-                # Use correct NotebookLM selector
-                responses = self.page.query_selector_all(".to-user-container .message-text-content")
-
-                if responses:
-                    latest_text = responses[-1].inner_text().strip()
-
-                    # Check if it's a new response
-                    if latest_text and latest_text != previous_answer:
-                        # Check if text is stable (3 consecutive polls)
-                        if latest_text == last_candidate:
-                            stable_count += 1
-                            if stable_count >= 3:
-                                return latest_text
-                        else:
-                            stable_count = 1
-                            last_candidate = latest_text
-
-            except Exception:
-                pass
-
-            time.sleep(0.5)
-
-        raise TimeoutError(f"No response received within {timeout} seconds")
+        return ResponseUtils.wait_for_answer(self.page, previous_answer, timeout_seconds=timeout)
 
     def reset(self):
         """Reset the chat by reloading the page"""
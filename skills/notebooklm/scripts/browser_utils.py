@@ -9,12 +9,33 @@ import random
 from typing import Optional, List
 
 from patchright.sync_api import Playwright, BrowserContext, Page
-from config import BROWSER_PROFILE_DIR, STATE_FILE, BROWSER_ARGS, USER_AGENT
+from patchright.sync_api import TimeoutError as PlaywrightTimeoutError
+from config import (
+    BROWSER_PROFILE_DIR, STATE_FILE, BROWSER_ARGS, USER_AGENT,
+    RESPONSE_SELECTORS, THINKING_SELECTOR, QUERY_TIMEOUT_SECONDS, ANSWER_QUIET_MS,
+    INPUT_STRATEGIES, INPUT_STRATEGY
+)
 
 
 class BrowserFactory:
     """Factory for creating configured browser contexts"""
 
+    @staticmethod
+    def context_options(
+        headless: bool = True,
+        user_data_dir: str = str(BROWSER_PROFILE_DIR)
+    ) -> dict:
+        """Keyword arguments for launch_persistent_context (sync or async API)"""
+        return dict(
+            user_data_dir=user_data_dir,
+            channel="chrome",  # Use real Chrome
+            headless=headless,
+            no_viewport=True,
+            ignore_default_args=["--enable-automation"],
+            user_agent=USER_AGENT,
+            args=BROWSER_ARGS
+        )
+
     @staticmethod
     def launch_persistent_context(
         playwright: Playwright,
@@ -27,13 +48,7 @@ class BrowserFactory:
         """
         # Launch persistent context
         context = playwright.chromium.launch_persistent_context(
-            user_data_dir=user_data_dir,
-            channel="chrome",  # Use real Chrome
-            headless=headless,
-            no_viewport=True,
-            ignore_default_args=["--enable-automation"],
-            user_agent=USER_AGENT,
-            args=BROWSER_ARGS
+            **BrowserFactory.context_options(headless, user_data_dir)
         )
 
         # Cookie Workaround for Playwright bug #36139
@@ -43,17 +58,24 @@ class BrowserFactory:
         return context
 
     @staticmethod
-    def _inject_cookies(context: BrowserContext):
-        """Inject cookies from state.json if available"""
+    def load_state_cookies() -> List[dict]:
+        """Cookies saved in state.json, if available"""
         if STATE_FILE.exists():
             try:
                 with open(STATE_FILE, 'r') as f:
                     state = json.load(f)
-                    if 'cookies' in state and len(state['cookies']) > 0:
-                        context.add_cookies(state['cookies'])
-                        # print(f"  🔧 Injected {len(state['cookies'])} cookies from state.json")
+                    return state.get('cookies') or []
             except Exception as e:
                 print(f"  ⚠️  Could not load state.json: {e}")
+        return []
+
+    @staticmethod
+    def _inject_cookies(context: BrowserContext):
+        """Inject cookies from state.json if available"""
+        cookies = BrowserFactory.load_state_cookies()
+        if cookies:
+            context.add_cookies(cookies)
+            # print(f"  🔧 Injected {len(cookies)} cookies from state.json")
 
 
 class StealthUtils:
@@ -88,6 +110,74 @@ class StealthUtils:
             if random.random() < 0.05:
                 time.sleep(random.uniform(0.15, 0.4))
 
+    @staticmethod
+    def enter_text(page: Page, selector: str, text: str, strategy: Optional[str] = None):
+        """
+        Put text into an input using one of config.INPUT_STRATEGIES
+
+        Apart from "type", the time taken does not depend on the text length.
+
+        Args:
+            page: Page containing the input
+            selector: Input to enter the text into
+            text: Text to enter
+            strategy: Input strategy (default: config.INPUT_STRATEGY)
+        """
+        strategy = strategy or INPUT_STRATEGY
+        if strategy not in INPUT_STRATEGIES:
+            raise ValueError(f"Unknown input strategy: {strategy} (choose from {', '.join(INPUT_STRATEGIES)})")
+
+        if strategy == "type":
+            StealthUtils.human_type(page, selector, text)
+            return
+
+        element = page.wait_for_selector(selector, timeout=2000, state="visible")
+        if strategy == "fill":
+            element.fill(text)
+            return
+
+        element.click()
+        if strategy == "insert_text":
+            page.keyboard.insert_text(text)
+        else:  # clipboard
+            page.context.grant_permissions(["clipboard-read", "clipboard-write"])
+            page.evaluate("text => navigator.clipboard.writeText(text)", text)
+            page.keyboard.press("ControlOrMeta+V")
+
+    @staticmethod
+    async def enter_text_async(page, selector: str, text: str, strategy: Optional[str] = None):
+        """enter_text for a page from the Playwright async API"""
+        strategy = strategy or INPUT_STRATEGY
+        if strategy not in INPUT_STRATEGIES:
+            raise ValueError(f"Unknown input strategy: {strategy} (choose from {', '.join(INPUT_STRATEGIES)})")
+
+        element = await page.wait_for_selector(selector, timeout=2000, state="visible")
+        if strategy == "fill":
+            await element.fill(text)
+            return
+
+        await element.click()
+        if strategy == "type":
+            await page.keyboard.type(text, delay=random.uniform(25, 75))
+        elif strategy == "insert_text":
+            await page.keyboard.insert_text(text)
+        else:  # clipboard
+            await page.context.grant_permissions(["clipboard-read", "clipboard-write"])
+            await page.evaluate("text => navigator.clipboard.writeText(text)", text)
+            await page.keyboard.press("ControlOrMeta+V")
+
+    @staticmethod
+    def random_mouse_movement(page: Page, moves: int = 3):
+        """Move the mouse to a few random points in the viewport"""
+        size = page.viewport_size or page.evaluate(
+            "() => ({width: window.innerWidth, height: window.innerHeight})"
+        )
+        for _ in range(moves):
+            x = random.uniform(0, size['width'])
+            y = random.uniform(0, size['height'])
+            page.mouse.move(x, y, steps=random.randint(3, 8))
+            StealthUtils.random_delay(50, 150)
+
     @staticmethod
     def realistic_click(page: Page, selector: str):
         """Click with realistic movement"""
@@ -105,3 +195,101 @@ class StealthUtils:
         StealthUtils.random_delay(100, 300)
         element.click()
         StealthUtils.random_delay(100, 300)
+
+
+# Runs inside the page. A MutationObserver watches only the latest response
+# element and records when it last changed; when a newer response appears,
+# the observer moves to it. The answer is complete once the thinking
+# indicator is gone, the latest response differs from the one before the
+# question, and it hasn't changed for `quietMs`. Activity elsewhere on the
+# page (spinners, timestamps, the sources panel) does not delay it.
+# Returns the answer text, or false to keep waiting.
+ANSWER_READY_JS = """
+({selectors, thinkingSelector, previous, quietMs}) => {
+    let node = null;
+    for (const selector of selectors) {
+        const nodes = document.querySelectorAll(selector);
+        if (nodes.length > 0) {
+            node = nodes[nodes.length - 1];
+            break;
+        }
+    }
+
+    const state = window.__nlmAnswerState || (window.__nlmAnswerState = {node: null, observer: null});
+    if (node !== state.node) {
+        if (state.observer) {
+            state.observer.disconnect();
+        }
+        state.node = node;
+        state.observer = null;
+        state.lastMutation = performance.now();
+        if (node) {
+            state.observer = new MutationObserver(() => { state.lastMutation = performance.now(); });
+            state.observer.observe(node, {childList: true, subtree: true, characterData: true});
+        }
+    }
+
+    const thinking = document.querySelector(thinkingSelector);
+    if (thinking && thinking.getClientRects().length > 0
+            && getComputedStyle(thinking).visibility !== 'hidden') {
+        return false;
+    }
+    if (!node || performance.now() - state.lastMutation < quietMs) {
+        return false;
+    }
+
+    const text = node.innerText.trim();
+    return text && text !== previous ? text : false;
+}
+"""
+
+
+class ResponseUtils:
+    """Reading NotebookLM answers from the page"""
+
+    @staticmethod
+    def latest_response_text(page: Page) -> Optional[str]:
+        """Text of the newest response on the page, if any"""
+        for selector in RESPONSE_SELECTORS:
+            elements = page.query_selector_all(selector)
+            if elements:
+                return elements[-1].inner_text().strip()
+        return None
+
+    @staticmethod
+    def answer_ready_arg(previous_answer: Optional[str] = None, quiet_ms: int = ANSWER_QUIET_MS) -> dict:
+        """Argument for ANSWER_READY_JS"""
+        return {
+            "selectors": RESPONSE_SELECTORS,
+            "thinkingSelector": THINKING_SELECTOR,
+            "previous": (previous_answer or "").strip(),
+            "quietMs": quiet_ms,
+        }
+
+    @staticmethod
+    def wait_for_answer(
+        page: Page,
+        previous_answer: Optional[str] = None,
+        timeout_seconds: float = QUERY_TIMEOUT_SECONDS,
+        quiet_ms: int = ANSWER_QUIET_MS
+    ) -> str:
+        """
+        Wait for a new, complete answer and return its text
+
+        The check runs inside the page, driven by a MutationObserver on the
+        response element, so the answer is returned `quiet_ms` after it stops
+        changing instead of after several fixed-interval polls.
+
+        Raises:
+            TimeoutError: if no complete answer appears in time
+        """
+        try:
+            handle = page.wait_for_function(
+                ANSWER_READY_JS,
+                arg=ResponseUtils.answer_ready_arg(previous_answer, quiet_ms),
+                polling=100,
+                timeout=timeout_seconds * 1000
+            )
+        except PlaywrightTimeoutError:
+            raise TimeoutError(f"No response received within {timeout_seconds} seconds")
+        return handle.json_value()
@@ -4,10 +4,62 @@ Cleanup Manager for NotebookLM Skill
 Manages cleanup of skill data and browser state
 """
 
+import os
 import shutil
 import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import notebook_daemon
+
+
+# Threads for walking directories; stat calls release the GIL
+SIZE_WALK_WORKERS = 8
+
+# Chrome cache directories in the browser profile, pruned by --max-age/--max-size
+CACHE_DIR_NAMES = {
+    'Cache', 'Code Cache', 'GPUCache', 'GrShaderCache', 'ShaderCache',
+    'DawnCache', 'DawnGraphiteCache', 'DawnWebGPUCache', 'CacheStorage', 'ScriptCache'
+}
+
+
+def _scan_dir(path: str) -> Tuple[int, List[str]]:
+    """Size of the files directly in a directory, and its subdirectories"""
+    size = 0
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        size += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return size, subdirs
+
+
+def _list_files(path: str) -> List[Tuple[float, int, str]]:
+    """(mtime, size, path) of every file under a directory"""
+    files = []
+    for root, _, names in os.walk(path):
+        for name in names:
+            file_path = os.path.join(root, name)
+            try:
+                stat = os.stat(file_path, follow_symlinks=False)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, file_path))
+    return files
 
 
 class CleanupManager:
@@ -21,18 +73,23 @@ class CleanupManager:
     - Safe deletion with confirmation
     """
 
+    # The notebook library database, and the library.json it was migrated from
+    LIBRARY_FILES = ['library.db', 'library.db-wal', 'library.db-shm', 'library.json', 'library.json.bak']
+
     def __init__(self):
         """Initialize the cleanup manager"""
         # Skill directory paths
         self.skill_dir = Path(__file__).parent.parent
         self.data_dir = self.skill_dir / "data"
+        # Directory sizes found so far, so each directory is walked once per run
+        self._dir_sizes: Dict[str, int] = {}
 
     def get_cleanup_paths(self, preserve_library: bool = False) -> Dict[str, Any]:
         """
         Get paths that would be cleaned up
 
         Args:
-            preserve_library: Keep library.json if True
+            preserve_library: Keep the notebook library if True
 
         Returns:
             Dict with paths and sizes
@@ -75,15 +132,16 @@ class CleanupManager:
 
             # Library (unless preserved)
             if not preserve_library:
-                library_file = self.data_dir / "library.json"
-                if library_file.exists():
-                    size = library_file.stat().st_size
-                    paths['library'].append({
-                        'path': str(library_file),
-                        'size': size,
-                        'type': 'file'
-                    })
-                    total_size += size
+                for name in self.LIBRARY_FILES:
+                    library_file = self.data_dir / name
+                    if library_file.exists():
+                        size = library_file.stat().st_size
+                        paths['library'].append({
+                            'path': str(library_file),
+                            'size': size,
+                            'type': 'file'
+                        })
+                        total_size += size
 
             # Auth info
             auth_info = self.data_dir / "auth_info.json"
@@ -98,7 +156,7 @@ class CleanupManager:
 
             # Other files in data dir (but NEVER .venv!)
             for item in self.data_dir.iterdir():
-                if item.name not in ['browser_state', 'sessions.json', 'library.json', 'auth_info.json']:
+                if item.name not in ['browser_state', 'sessions.json', 'auth_info.json', *self.LIBRARY_FILES]:
                     size = self._get_size(item)
                     paths['other'].append({
                         'path': str(item),
@@ -115,19 +173,117 @@ class CleanupManager:
 
     def _get_size(self, path: Path) -> int:
         """Get size of file or directory in bytes"""
-        if path.is_file():
-            return path.stat().st_size
-        elif path.is_dir():
-            total = 0
-            try:
-                for item in path.rglob('*'):
-                    if item.is_file():
-                        total += item.stat().st_size
-            except Exception:
-                pass
-            return total
+        try:
+            if path.is_file():
+                return path.stat().st_size
+            elif path.is_dir():
+                return self._dir_size(str(path))
+        except OSError:
+            pass
         return 0
 
+    def _dir_size(self, root: str) -> int:
+        """
+        Total size of the files under a directory
+
+        Walks the tree one level at a time, scanning each level's directories
+        in parallel, and remembers the total of every directory it visits.
+        """
+        if root in self._dir_sizes:
+            return self._dir_sizes[root]
+
+        own_sizes: Dict[str, int] = {}
+        children: Dict[str, List[str]] = {}
+        level = [root]
+        with ThreadPoolExecutor(max_workers=SIZE_WALK_WORKERS) as executor:
+            while level:
+                to_scan = [d for d in level if d not in self._dir_sizes]
+                level = []
+                for directory, (size, subdirs) in zip(to_scan, executor.map(_scan_dir, to_scan)):
+                    own_sizes[directory] = size
+                    children[directory] = subdirs
+                    level.extend(subdirs)
+
+        # Subdirectories were found after their parents, so sum in reverse
+        for directory in reversed(list(own_sizes)):
+            self._dir_sizes[directory] = own_sizes[directory] + sum(
+                self._dir_sizes[child] for child in children[directory]
+            )
+        return self._dir_sizes[root]
+
+    def find_cache_dirs(self) -> List[str]:
+        """Chrome cache directories in the browser profile"""
+        cache_dirs = []
+        browser_state_dir = self.data_dir / "browser_state"
+        for root, dirs, _ in os.walk(browser_state_dir):
+            for name in [d for d in dirs if d in CACHE_DIR_NAMES]:
+                cache_dirs.append(os.path.join(root, name))
+                dirs.remove(name)  # Everything below is counted with the cache
+        return cache_dirs
+
+    def prune_cache(
+        self,
+        max_age_days: Optional[float] = None,
+        max_size_bytes: Optional[int] = None,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Delete browser cache files, oldest first
+
+        Args:
+            max_age_days: Delete cache files not modified for this many days
+            max_size_bytes: Then delete the oldest files until the caches fit in this size
+            dry_run: Preview only, don't delete
+
+        Returns:
+            Dict with cache size and what was (or would be) pruned
+        """
+        with ThreadPoolExecutor(max_workers=SIZE_WALK_WORKERS) as executor:
+            files = [f for listing in executor.map(_list_files, self.find_cache_dirs()) for f in listing]
+        files.sort()  # Oldest first
+
+        cache_size = sum(size for _, size, _ in files)
+        remaining = cache_size
+        cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+
+        to_prune = []
+        for mtime, size, path in files:
+            too_old = cutoff is not None and mtime < cutoff
+            too_big = max_size_bytes is not None and remaining > max_size_bytes
+            if not (too_old or too_big):
+                # The remaining files are newer still, and the size limit is met
+                break
+            to_prune.append((size, path))
+            remaining -= size
+
+        pruned_count = 0
+        pruned_size = 0
+        failed_count = 0
+        for size, path in to_prune:
+            if dry_run:
+                pruned_count += 1
+                pruned_size += size
+                continue
+            try:
+                os.unlink(path)
+                pruned_count += 1
+                pruned_size += size
+            except OSError:
+                failed_count += 1
+
+        if not dry_run:
+            self._dir_sizes.clear()
+
+        return {
+            'dry_run': dry_run,
+            'cache_size': cache_size,
+            'cache_files': len(files),
+            'pruned_count': pruned_count,
+            'pruned_size': pruned_size,
+            'failed_count': failed_count,
+            'remaining_size': cache_size - pruned_size
+        }
+
     def _format_size(self, size: int) -> str:
         """Format size in human-readable form"""
         for unit in ['B', 'KB', 'MB', 'GB']:
@@ -145,7 +301,7 @@ class CleanupManager:
         Perform the actual cleanup
 
         Args:
-            preserve_library: Keep library.json if True
+            preserve_library: Keep the notebook library if True
             dry_run: Preview only, don't delete
 
         Returns:
@@ -183,6 +339,9 @@ class CleanupManager:
                     })
                     print(f"  ❌ Failed: {path.name} ({e})")
 
+        # Sizes of deleted directories are stale now
+        self._dir_sizes.clear()
+
         # Recreate browser_state dir if everything was deleted
         if not preserve_library and not failed_items:
             browser_state_dir = self.data_dir / "browser_state"
@@ -223,6 +382,33 @@ class CleanupManager:
         print("Use --confirm to actually perform the cleanup.")
 
 
+def prune_caches(manager: CleanupManager, args) -> int:
+    """Retention mode: prune browser caches instead of deleting everything"""
+    max_size_bytes = int(args.max_size * 1024 * 1024) if args.max_size is not None else None
+    dry_run = not args.confirm
+
+    if not dry_run and notebook_daemon.is_running():
+        print("⚠️ The browser daemon is using the browser profile. Stop it first:")
+        print("python scripts/run.py notebook_daemon.py stop")
+        return 1
+
+    result = manager.prune_cache(args.max_age, max_size_bytes, dry_run=dry_run)
+
+    print("\n🧹 Browser Cache Retention")
+    print("=" * 60)
+    print(f"Cache size: {manager._format_size(result['cache_size'])} in {result['cache_files']} files")
+    if dry_run:
+        print(f"Would prune: {result['pruned_count']} files ({manager._format_size(result['pruned_size'])})")
+        print(f"Would remain: {manager._format_size(result['remaining_size'])}")
+        print("\nUse --confirm to actually prune the caches.")
+    else:
+        print(f"✅ Pruned: {result['pruned_count']} files ({manager._format_size(result['pruned_size'])})")
+        print(f"Remaining: {manager._format_size(result['remaining_size'])}")
+        if result['failed_count'] > 0:
+            print(f"⚠️ Failed: {result['failed_count']} files")
+    return 0
+
+
 def main():
     """Command-line interface for cleanup management"""
     parser = argparse.ArgumentParser(
@@ -241,6 +427,9 @@ Examples:
 
   # Force cleanup without preview
   python cleanup_manager.py --confirm --force
+
+  # Only prune browser caches: files older than 14 days, then down to 200 MB
+  python cleanup_manager.py --max-age 14 --max-size 200 --confirm
         """
     )
 
@@ -253,7 +442,7 @@ Examples:
     parser.add_argument(
         '--preserve-library',
         action='store_true',
-        help='Keep the notebook library (library.json)'
+        help='Keep the notebook library (library.db)'
     )
 
     parser.add_argument(
@@ -262,11 +451,28 @@ Examples:
         help='Skip confirmation prompt'
     )
 
+    parser.add_argument(
+        '--max-age',
+        type=float,
+        metavar='DAYS',
+        help='Only prune browser cache files older than this many days'
+    )
+
+    parser.add_argument(
+        '--max-size',
+        type=float,
+        metavar='MB',
+        help='Only prune browser caches, oldest files first, down to this size'
+    )
+
     args = parser.parse_args()
 
     # Initialize manager
     manager = CleanupManager()
 
+    if args.max_age is not None or args.max_size is not None:
+        return prune_caches(manager, args)
+
     if args.confirm:
         # Show preview first unless forced
         if not args.force:
@@ -299,4 +505,4 @@ Examples:
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -12,7 +12,8 @@ BROWSER_STATE_DIR = DATA_DIR / "browser_state"
 BROWSER_PROFILE_DIR = BROWSER_STATE_DIR / "browser_profile"
 STATE_FILE = BROWSER_STATE_DIR / "state.json"
 AUTH_INFO_FILE = DATA_DIR / "auth_info.json"
-LIBRARY_FILE = DATA_DIR / "library.json"
+LIBRARY_FILE = DATA_DIR / "library.db"
+ANSWER_CACHE_FILE = DATA_DIR / "answer_cache.db"
 
 # NotebookLM Selectors
 QUERY_INPUT_SELECTORS = [
@@ -27,6 +28,17 @@ RESPONSE_SELECTORS = [
     "[data-message-author='assistant']",
 ]
 
+# Shown while NotebookLM is still working on an answer
+THINKING_SELECTOR = "div.thinking-message"
+
+# How questions are entered into the chat input:
+#   "type"        - one key at a time with human-like delays (slow for long questions)
+#   "fill"        - set the input's value in one step
+#   "insert_text" - a single text input event, like an IME commit
+#   "clipboard"   - copy to the clipboard and paste
+INPUT_STRATEGIES = ("type", "fill", "insert_text", "clipboard")
+INPUT_STRATEGY = "insert_text"
+
 # Browser Configuration
 BROWSER_ARGS = [
     '--disable-blink-features=AutomationControlled',  # Patches navigator.webdriver
@@ -38,7 +50,26 @@ BROWSER_ARGS = [
 
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 
+# Google sign-in cookies; when all of them have expired, the login is gone
+AUTH_COOKIE_NAMES = ("SID", "HSID", "SSID", "APISID", "SAPISID", "__Secure-1PSID", "__Secure-3PSID")
+
 # Timeouts
 LOGIN_TIMEOUT_MINUTES = 10
+AUTH_VALIDATION_CACHE_SECONDS = 3600  # Trust a successful browser validation for this long
 QUERY_TIMEOUT_SECONDS = 120
+# An answer is complete once its text stops changing for this long. This is the
+# ~1 s stability window of BrowserSession's old check (the same text on three
+# polls 0.5 s apart); a mid-answer pause longer than this ends the answer early.
+ANSWER_QUIET_MS = 1000
 PAGE_LOAD_TIMEOUT = 30000
+
+# Browser daemon (notebook_daemon.py)
+DAEMON_SOCKET = DATA_DIR / "daemon.sock"
+DAEMON_LOG_FILE = DATA_DIR / "daemon.log"
+DAEMON_IDLE_TIMEOUT_SECONDS = 1800  # Shut down after 30 minutes without requests
+SESSION_IDLE_TIMEOUT_SECONDS = 900  # Close notebook tabs unused for 15 minutes
+DAEMON_START_TIMEOUT_SECONDS = 60
+
+# Answer cache (answer_cache.py)
+ANSWER_CACHE_TTL_SECONDS = 86400  # Notebook sources change, so answers expire after a day
+ANSWER_CACHE_MAX_ENTRIES = 1000
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+"""
+NotebookLM Browser Daemon
+Keeps one browser context and warm notebook tabs alive between questions
+
+Starting Chrome and loading a notebook takes several seconds, which used to be
+paid by every ask_question.py call. The daemon owns a single persistent
+context (BrowserFactory) and one BrowserSession tab per notebook URL, and
+serves requests over a Unix socket. Requests and responses are single lines
+of JSON:
+
+    {"action": "ask", "question": "...", "notebook_url": "...", "input_strategy": null, "use_cache": true,
+     "new_conversation": true}
+    {"action": "status"} | {"action": "reset", "notebook_url": "..."}
+    {"action": "ping"} | {"action": "shutdown"}
+
+Connections are served on their own threads, so "ping" and "status" answer
+at once even while a question is being asked. Questions and resets run one at
+a time on the thread that owns the browser. A live daemon holds an exclusive
+lock on the file next to its socket (daemon.sock.lock) for its whole
+lifetime, which is how clients tell whether one is running.
+
+Each ask starts a new conversation in the notebook's tab (the tab is reloaded
+if it has answered before), so unrelated ask_question.py calls don't see each
+other's questions. Send "new_conversation": false to follow up on the
+previous answer instead.
+
+Any page with the NotebookLM chat markup can be used as a notebook URL, so
+the daemon also works against a local stand-in page for testing
+(testdata/stand_in_notebook.html).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import (
+    DATA_DIR,
+    DAEMON_SOCKET,
+    DAEMON_LOG_FILE,
+    DAEMON_IDLE_TIMEOUT_SECONDS,
+    DAEMON_START_TIMEOUT_SECONDS,
+    SESSION_IDLE_TIMEOUT_SECONDS,
+    QUERY_TIMEOUT_SECONDS,
+)
+
+
+# How long a starting daemon retries the lock while clients briefly hold it
+LOCK_RETRY_SECONDS = 2
+
+
+def daemon_supported() -> bool:
+    """Unix sockets and file locks are needed to run and find the daemon"""
+    return hasattr(socket, "AF_UNIX") and fcntl is not None
+
+
+def lock_file_for(socket_path: Path) -> Path:
+    """Lock file held by the daemon serving on socket_path"""
+    socket_path = Path(socket_path)
+    return socket_path.with_name(socket_path.name + ".lock")
+
+
+def send_request(
+    payload: Dict[str, Any],
+    timeout: Optional[float] = None,
+    socket_path: Path = DAEMON_SOCKET
+) -> Optional[Dict[str, Any]]:
+    """
+    Send one request to the daemon
+
+    Returns:
+        The daemon's response, or None if the daemon is not running
+    """
+    if not daemon_supported():
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def is_running(socket_path: Path = DAEMON_SOCKET) -> bool:
+    """
+    Check whether a daemon process is alive
+
+    This asks the lock file rather than the socket, so a daemon that is
+    busy, starting up or shutting down still counts as running.
+    """
+    if not daemon_supported():
+        return False
+
+    try:
+        with open(lock_file_for(socket_path), "rb") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            fcntl.flock(f, fcntl.LOCK_UN)
+    except FileNotFoundError:
+        pass
+    return False
+
+
+def wait_until_ready(socket_path: Path = DAEMON_SOCKET, timeout: float = DAEMON_START_TIMEOUT_SECONDS) -> bool:
+    """Wait until a daemon answers a ping on the socket"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if send_request({"action": "ping"}, timeout=5, socket_path=socket_path) is not None:
+                return True
+        except OSError:
+            pass
+        if not is_running(socket_path):
+            return False
+        time.sleep(0.2)
+    return False
+
+
+def _socket_accepts(socket_path: Path) -> bool:
+    """Whether some process is still accepting connections on socket_path"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1)
+            sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+
+
+def start_daemon(headless: bool = True, socket_path: Path = DAEMON_SOCKET) -> bool:
+    """
+    Start the daemon in the background unless it is already running
+
+    Returns:
+        True once the daemon answers on its socket
+    """
+    if is_running(socket_path):
+        return wait_until_ready(socket_path)
+
+    print("  🚀 Starting browser daemon...")
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    cmd = [sys.executable, str(Path(__file__).resolve()), "serve", "--socket", str(socket_path)]
+    if not headless:
+        cmd.append("--show-browser")
+
+    with open(DAEMON_LOG_FILE, "ab") as log:
+        subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True  # Survive the calling script
+        )
+
+    # The new process may lose the race to another client's daemon; either
+    # way, one of them answers on the socket
+    deadline = time.time() + DAEMON_START_TIMEOUT_SECONDS
+    while time.time() < deadline:
+        if is_running(socket_path):
+            return wait_until_ready(socket_path, deadline - time.time())
+        time.sleep(0.2)
+
+    print(f"  ❌ Daemon did not start; see {DAEMON_LOG_FILE}")
+    return False
+
+
+def stop_daemon(socket_path: Path = DAEMON_SOCKET, timeout: float = QUERY_TIMEOUT_SECONDS + 60) -> bool:
+    """
+    Ask a running daemon to shut down and wait until it has exited
+
+    A question in progress is finished first. Returns True if a daemon was running.
+    """
+    if not is_running(socket_path):
+        return False
+    try:
+        send_request({"action": "shutdown"}, timeout=30, socket_path=socket_path)
+    except OSError:
+        pass
+
+    deadline = time.time() + timeout
+    while is_running(socket_path) and time.time() < deadline:
+        time.sleep(0.2)
+    return True
+
+
+class NotebookDaemon:
+    """
+    Owns the browser and a pool of warm BrowserSession tabs keyed by notebook URL
+
+    Connections are accepted on worker threads, but everything that touches
+    the browser runs on the thread that called serve_forever: the Playwright
+    sync API is bound to the thread that started it. Requests for the browser
+    are queued and handled one at a time.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path = DAEMON_SOCKET,
+        headless: bool = True,
+        idle_timeout: int = DAEMON_IDLE_TIMEOUT_SECONDS
+    ):
+        self.socket_path = Path(socket_path)
+        self.headless = headless
+        self.idle_timeout = idle_timeout
+        self.started_at = time.time()
+        self.last_request = time.time()
+        self.request_count = 0
+        self.running = False
+        self.busy_since: Optional[float] = None
+
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._lock_file = None
+
+        self.playwright = None
+        self.context = None
+        self.sessions: Dict[str, Any] = {}
+
+    # Browser and sessions
+
+    def _ensure_context(self):
+        """Start the browser on first use"""
+        if self.context is None:
+            from patchright.sync_api import sync_playwright
+            from browser_utils import BrowserFactory
+
+            print("🌐 Launching browser...")
+            self.playwright = sync_playwright().start()
+            self.context = BrowserFactory.launch_persistent_context(
+                self.playwright,
+                headless=self.headless
+            )
+        return self.context
+
+    def get_session(self, notebook_url: str):
+        """Return the warm tab for a notebook, opening it if needed"""
+        self._close_expired_sessions()
+
+        session = self.sessions.get(notebook_url)
+        if session is None:
+            from browser_session import BrowserSession
+
+            session_id = hashlib.sha1(notebook_url.encode("utf-8")).hexdigest()[:8]
+            session = BrowserSession(session_id, self._ensure_context(), notebook_url)
+            self.sessions[notebook_url] = session
+        return session
+
+    def close_session(self, notebook_url: str):
+        """Close and forget a notebook tab"""
+        session = self.sessions.pop(notebook_url, None)
+        if session:
+            session.close()
+
+    def _close_expired_sessions(self):
+        for notebook_url, session in list(self.sessions.items()):
+            if session.is_expired(SESSION_IDLE_TIMEOUT_SECONDS):
+                self.close_session(notebook_url)
+
+    def close(self):
+        """Close all tabs and the browser"""
+        for notebook_url in list(self.sessions):
+            try:
+                self.close_session(notebook_url)
+            except Exception as e:
+                print(f"  ⚠️ Error closing session: {e}")
+
+        if self.context:
+            try:
+                self.context.close()
+            except Exception:
+                pass
+            self.context = None
+
+        if self.playwright:
+            try:
+                self.playwright.stop()
+            except Exception:
+                pass
+            self.playwright = None
+
+    # Requests
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Dispatch one request and return its response
+
+        Called on connection threads. Requests that need the browser wait
+        for their turn on the browser thread.
+        """
+        with self._lock:
+            self.last_request = time.time()
+            self.request_count += 1
+        action = request.get("action")
+
+        if action == "ping":
+            return {"status": "success"}
+
+        if action == "status":
+            busy_since = self.busy_since
+            return {
+                "status": "success",
+                "pid": os.getpid(),
+                "uptime_seconds": time.time() - self.started_at,
+                "request_count": self.request_count,
+                "busy_seconds": time.time() - busy_since if busy_since else None,
+                "queued": self._jobs.qsize(),
+                "sessions": [s.get_info() for s in list(self.sessions.values())]
+            }
+
+        if action == "shutdown":
+            self.running = False
+            return {"status": "success"}
+
+        if not self.running:
+            return {"status": "error", "error": "Daemon is shutting down"}
+
+        reply: "queue.Queue" = queue.Queue(maxsize=1)
+        self._jobs.put((request, reply))
+        return reply.get()
+
+    def handle_in_browser(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a request that uses the browser (browser thread only)"""
+        action = request.get("action")
+        notebook_url = request.get("notebook_url")
+        if not notebook_url:
+            return {"status": "error", "error": "notebook_url is required"}
+
+        if action == "reset":
+            if notebook_url in self.sessions:
+                self.sessions[notebook_url].reset()
+            return {"status": "success"}
+
+        if action == "ask":
+            question = request.get("question")
+            if not question:
+                return {"status": "error", "error": "question is required"}
+            try:
+                session = self.get_session(notebook_url)
+                if request.get("new_conversation", True) and session.message_count:
+                    try:
+                        session.reset()
+                    except Exception as e:
+                        print(f"⚠️ Reset failed, reopening the notebook: {e}")
+                        self.close_session(notebook_url)
+                        session = self.get_session(notebook_url)
+            except Exception as e:
+                return {"status": "error", "question": question, "error": str(e)}
+
+            result = session.ask(
+                question,
+                request.get("input_strategy"),
+                use_cache=request.get("use_cache", True)
+            )
+            if result.get("status") != "success":
+                # Start from a fresh tab next time rather than reuse a broken page
+                self.close_session(notebook_url)
+            return result
+
+        return {"status": "error", "error": f"Unknown action: {action}"}
+
+    def _acquire_lock(self) -> bool:
+        """Take the daemon lock; False if another daemon holds it"""
+        lock_path = lock_file_for(self.socket_path)
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(lock_path, "a+")
+
+        # Clients take the lock shared for a moment to check on us, so retry briefly
+        deadline = time.time() + LOCK_RETRY_SECONDS
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.time() >= deadline:
+                    lock_file.close()
+                    return False
+                time.sleep(0.05)
+
+        lock_file.truncate(0)
+        lock_file.write(f"{os.getpid()}\n")
+        lock_file.flush()
+        self._lock_file = lock_file
+        return True
+
+    def _release_lock(self):
+        if self._lock_file:
+            # Closing the file drops the lock
+            self._lock_file.close()
+            self._lock_file = None
+
+    def serve_forever(self):
+        """Serve requests until shutdown or the idle timeout"""
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    response = daemon.handle(json.loads(line))
+                except Exception as e:
+                    response = {"status": "error", "error": str(e)}
+                try:
+                    self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                except OSError:
+                    pass  # The client gave up waiting
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        if not self._acquire_lock():
+            print("❌ Daemon is already running")
+            return
+
+        # Holding the lock means no other daemon is alive, so a socket file
+        # left here belongs to a crashed one. Still never remove a socket
+        # that somebody is accepting connections on.
+        if self.socket_path.exists():
+            if _socket_accepts(self.socket_path):
+                print(f"❌ Another process is serving on {self.socket_path}")
+                self._release_lock()
+                return
+            self.socket_path.unlink()
+
+        server = Server(str(self.socket_path), Handler)
+        # The browser carries the user's Google session; keep the socket private
+        os.chmod(self.socket_path, 0o600)
+        self.running = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        print(f"✅ Daemon listening on {self.socket_path} (pid {os.getpid()})")
+        try:
+            while self.running:
+                try:
+                    request, reply = self._jobs.get(timeout=1)
+                except queue.Empty:
+                    if time.time() - self.last_request > self.idle_timeout:
+                        print("💤 Idle timeout reached")
+                        break
+                    continue
+
+                self.busy_since = time.time()
+                try:
+                    reply.put(self.handle_in_browser(request))
+                except Exception as e:
+                    reply.put({"status": "error", "error": str(e)})
+                finally:
+                    self.busy_since = None
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print("🛑 Shutting down daemon...")
+            self.running = False
+            server.shutdown()
+            server.server_close()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+            # Requests that arrived while we were finishing up
+            while True:
+                try:
+                    _, reply = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                reply.put({"status": "error", "error": "Daemon is shutting down"})
+
+            self.close()
+            self._release_lock()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Background browser daemon for NotebookLM questions')
+
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    start_parser = subparsers.add_parser('start', help='Start the daemon in the background')
+    start_parser.add_argument('--show-browser', action='store_true', help='Show browser')
+
+    serve_parser = subparsers.add_parser('serve', help='Run the daemon in the foreground')
+    serve_parser.add_argument('--show-browser', action='store_true', help='Show browser')
+    serve_parser.add_argument('--socket', default=str(DAEMON_SOCKET), help='Socket path')
+
+    subparsers.add_parser('stop', help='Stop the daemon')
+    subparsers.add_parser('status', help='Show daemon status and open notebooks')
+
+    args = parser.parse_args()
+
+    if not daemon_supported():
+        print("❌ The daemon needs Unix domain sockets, which this platform does not support")
+        return 1
+
+    if args.command == 'start':
+        if start_daemon(headless=not args.show_browser):
+            print("✅ Daemon running")
+            return 0
+        return 1
+
+    elif args.command == 'serve':
+        NotebookDaemon(Path(args.socket), headless=not args.show_browser).serve_forever()
+        return 0
+
+    elif args.command == 'stop':
+        if stop_daemon():
+            print("✅ Daemon stopped")
+        else:
+            print("ℹ️ Daemon is not running")
+        return 0
+
+    elif args.command == 'status':
+        if not is_running():
+            print("ℹ️ Daemon is not running")
+            return 0
+        try:
+            status = send_request({"action": "status"}, timeout=5)
+        except OSError:
+            status = None
+        if not status:
+            print("⏳ Daemon is starting or shutting down")
+            return 0
+        print(f"✅ Daemon running (pid {status['pid']}, up {status['uptime_seconds'] / 60:.1f} min, "
+              f"{status['request_count']} requests)")
+        if status.get('busy_seconds') is not None:
+            print(f"  ⏳ Answering a question for {status['busy_seconds']:.0f}s, {status['queued']} waiting")
+        for info in status['sessions']:
+            print(f"  📚 {info['notebook_url']} - {info['message_count']} questions, "
+                  f"idle {info['inactive_seconds']:.0f}s")
+        return 0
+
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
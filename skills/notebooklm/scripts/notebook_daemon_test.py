@@ -0,0 +1,234 @@
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import notebook_daemon
+from notebook_daemon import NotebookDaemon, is_running, send_request, stop_daemon
+
+
+STAND_IN_PAGE = Path(__file__).parent / "testdata" / "stand_in_notebook.html"
+
+
+class FakeSession:
+    """Stands in for BrowserSession: answers after `delay` seconds"""
+
+    def __init__(self, notebook_url, delay):
+        self.notebook_url = notebook_url
+        self.delay = delay
+        self.message_count = 0
+        self.resets = 0
+
+    def reset(self):
+        self.message_count = 0
+        self.resets += 1
+
+    def ask(self, question, input_strategy=None, use_cache=True):
+        time.sleep(self.delay)
+        self.message_count += 1
+        return {"status": "success", "question": question, "answer": f"Answer to: {question}"}
+
+    def get_info(self):
+        return {"notebook_url": self.notebook_url, "message_count": self.message_count,
+                "inactive_seconds": 0}
+
+    def close(self):
+        pass
+
+
+class FakeDaemon(NotebookDaemon):
+    """NotebookDaemon without a browser"""
+
+    delay = 2
+
+    def get_session(self, notebook_url):
+        if notebook_url not in self.sessions:
+            self.sessions[notebook_url] = FakeSession(notebook_url, self.delay)
+        return self.sessions[notebook_url]
+
+
+class DaemonTestCase(unittest.TestCase):
+    """Serves a daemon class on a temporary socket"""
+
+    daemon_class = FakeDaemon
+    notebook_url = "about:blank"
+
+    def setUp(self):
+        # Unix socket paths are limited to ~100 characters, so keep them short
+        self.tmp = Path(tempfile.mkdtemp(prefix="nlm"))
+        self.socket_path = self.tmp / "d.sock"
+        self.threads = []
+
+    def tearDown(self):
+        stop_daemon(self.socket_path, timeout=30)
+        for thread in self.threads:
+            thread.join(timeout=30)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def start(self):
+        """Serve the daemon on a background thread and wait until it answers"""
+        daemon = self.daemon_class(self.socket_path, idle_timeout=60)
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+        deadline = time.time() + 10
+        while not is_running(self.socket_path) and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertTrue(notebook_daemon.wait_until_ready(self.socket_path, timeout=10))
+        return daemon
+
+    def ask_in_background(self, question, **options):
+        results = []
+        thread = threading.Thread(target=lambda: results.append(send_request(
+            {"action": "ask", "question": question, "notebook_url": self.notebook_url, "use_cache": False,
+             **options},
+            timeout=120, socket_path=self.socket_path
+        )))
+        thread.start()
+        self.threads.append(thread)
+        return thread, results
+
+    def assert_ping_is_quick(self):
+        started = time.time()
+        self.assertEqual(send_request({"action": "ping"}, timeout=5, socket_path=self.socket_path),
+                         {"status": "success"})
+        self.assertLess(time.time() - started, 1)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestDaemonLiveness(DaemonTestCase):
+
+    def test_not_running(self):
+        self.assertFalse(is_running(self.socket_path))
+        self.assertIsNone(send_request({"action": "ping"}, timeout=1, socket_path=self.socket_path))
+        self.assertFalse(stop_daemon(self.socket_path))
+
+    def test_ping_answers_while_busy(self):
+        self.start()
+        thread, results = self.ask_in_background("slow question")
+        time.sleep(0.3)
+
+        self.assert_ping_is_quick()
+        self.assertTrue(is_running(self.socket_path))
+
+        status = send_request({"action": "status"}, timeout=5, socket_path=self.socket_path)
+        self.assertIsNotNone(status["busy_seconds"])
+
+        thread.join(timeout=10)
+        self.assertEqual(results[0]["answer"], "Answer to: slow question")
+
+    def test_second_daemon_leaves_live_socket_alone(self):
+        self.start()
+        thread, results = self.ask_in_background("slow question")
+        time.sleep(0.3)
+
+        # Returns at once instead of taking over the socket
+        NotebookDaemon(self.socket_path).serve_forever()
+
+        self.assertTrue(self.socket_path.exists())
+        thread.join(timeout=10)
+        self.assertEqual(results[0]["status"], "success")
+        self.assert_ping_is_quick()
+
+    def test_asks_are_serialized(self):
+        self.start()
+        first, first_results = self.ask_in_background("first")
+        second, second_results = self.ask_in_background("second")
+        started = time.time()
+        first.join(timeout=10)
+        second.join(timeout=10)
+        self.assertGreaterEqual(time.time() - started, 2 * FakeDaemon.delay - 0.5)
+        self.assertEqual(first_results[0]["status"], "success")
+        self.assertEqual(second_results[0]["status"], "success")
+
+    def test_each_ask_starts_a_new_conversation(self):
+        daemon = self.start()
+        for question, options in (("first", {}), ("second", {}), ("follow-up", {"new_conversation": False})):
+            thread, results = self.ask_in_background(question, **options)
+            thread.join(timeout=10)
+            self.assertEqual(results[0]["status"], "success")
+
+        session = daemon.sessions[self.notebook_url]
+        self.assertEqual(session.resets, 1)
+        self.assertEqual(session.message_count, 2)
+
+    def test_stale_socket_is_replaced(self):
+        # A socket file left behind by a crashed daemon: nobody accepts on it
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(str(self.socket_path))
+        self.assertTrue(self.socket_path.exists())
+        self.assertFalse(is_running(self.socket_path))
+
+        self.start()
+        self.assertTrue(is_running(self.socket_path))
+
+    def test_stop_waits_for_exit(self):
+        self.start()
+        thread, results = self.ask_in_background("slow question")
+        time.sleep(0.3)
+
+        self.assertTrue(stop_daemon(self.socket_path, timeout=10))
+        self.assertFalse(is_running(self.socket_path))
+        self.assertFalse(self.socket_path.exists())
+        # The question in progress was still answered
+        thread.join(timeout=10)
+        self.assertEqual(results[0]["status"], "success")
+
+
+def browser_available() -> bool:
+    try:
+        from patchright.sync_api import sync_playwright
+        with sync_playwright() as playwright:
+            playwright.chromium.launch(channel="chrome", headless=True).close()
+        return True
+    except Exception:
+        return False
+
+
+class StandInDaemon(NotebookDaemon):
+    """The real daemon with a throwaway browser profile, so the user's login is left alone"""
+
+    def _ensure_context(self):
+        if self.context is None:
+            from patchright.sync_api import sync_playwright
+            from browser_utils import BrowserFactory
+
+            self.playwright = sync_playwright().start()
+            self.context = BrowserFactory.launch_persistent_context(
+                self.playwright, headless=True, user_data_dir=str(self.socket_path.parent / "profile")
+            )
+        return self.context
+
+
+@unittest.skipUnless(browser_available(), "needs patchright and Chrome (patchright install chrome)")
+class TestDaemonWithStandInPage(DaemonTestCase):
+    """The daemon and BrowserSession against testdata/stand_in_notebook.html"""
+
+    daemon_class = StandInDaemon
+    # A mid-answer pause shorter than ANSWER_QUIET_MS, and unrelated DOM updates
+    notebook_url = STAND_IN_PAGE.resolve().as_uri() + "?think=1000&chunks=20&interval=100&pause=500&noise=100"
+
+    def test_stand_in_answer(self):
+        self.start()
+        thread, results = self.ask_in_background("What is in this notebook?")
+        thread.join(timeout=120)
+        self.assertEqual(results[0]["status"], "success", results[0])
+        self.assertEqual(results[0]["answer"], "Stand-in answer to: What is in this notebook?")
+
+    def test_ping_answers_while_asking(self):
+        self.start()
+        thread, results = self.ask_in_background("What is in this notebook?")
+        time.sleep(1)
+
+        self.assert_ping_is_quick()
+        self.assertTrue(is_running(self.socket_path))
+        thread.join(timeout=120)
+        self.assertEqual(results[0]["status"], "success", results[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,15 +7,30 @@ Based on the MCP server implementation
 
 import json
 import argparse
+import sqlite3
 import uuid
 import os
+from contextlib import closing, contextmanager
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
 
+# Text fields covered by search_notebooks
+SEARCH_FIELDS = ('name', 'description', 'topics', 'tags', 'use_cases')
+
+
 class NotebookLibrary:
-    """Manages a collection of NotebookLM notebooks with metadata"""
+    """
+    Manages a collection of NotebookLM notebooks with metadata
+
+    The library is stored in SQLite (data/library.db). Every change is a
+    single locked transaction, so several agents can use the library at the
+    same time without overwriting each other's changes, and search uses a
+    full-text index instead of scanning every notebook (SQLite 3.34 or
+    later; older versions scan). An existing library.json is imported on
+    first use and kept as library.json.bak.
+    """
 
     def __init__(self):
         """Initialize the notebook library"""
@@ -24,41 +39,153 @@ class NotebookLibrary:
         self.data_dir = skill_dir / "data"
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        self.library_file = self.data_dir / "library.json"
-        self.notebooks: Dict[str, Dict[str, Any]] = {}
-        self.active_notebook_id: Optional[str] = None
-
-        # Load existing library
-        self._load_library()
-
-    def _load_library(self):
-        """Load library from disk"""
-        if self.library_file.exists():
-            try:
-                with open(self.library_file, 'r') as f:
-                    data = json.load(f)
-                    self.notebooks = data.get('notebooks', {})
-                    self.active_notebook_id = data.get('active_notebook_id')
-                    print(f"📚 Loaded library with {len(self.notebooks)} notebooks")
-            except Exception as e:
-                print(f"⚠️ Error loading library: {e}")
-                self.notebooks = {}
-                self.active_notebook_id = None
-        else:
-            self._save_library()
+        self.library_file = self.data_dir / "library.db"
+        self.legacy_library_file = self.data_dir / "library.json"
+
+        self._init_db()
+        with closing(self._connect()) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM notebooks").fetchone()[0]
+        if count:
+            print(f"📚 Loaded library with {count} notebooks")
+
+    # Storage
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: writes use explicit transactions (see _transaction)
+        conn = sqlite3.connect(str(self.library_file), timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
 
-    def _save_library(self):
-        """Save library to disk"""
+    @contextmanager
+    def _transaction(self):
+        """A write transaction that holds the database lock until it commits"""
+        conn = self._connect()
         try:
-            data = {
-                'notebooks': self.notebooks,
-                'active_notebook_id': self.active_notebook_id,
-                'updated_at': datetime.now().isoformat()
-            }
-            with open(self.library_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Create the tables, and import library.json the first time"""
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS notebooks (
+                    position INTEGER PRIMARY KEY,
+                    id TEXT NOT NULL UNIQUE,
+                    data TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.has_index = self._init_index(conn)
+
+            if self._get_meta(conn, 'schema_version') is None:
+                # Retried on the next run if library.json can't be read
+                if self._import_json(conn):
+                    self._set_meta(conn, 'schema_version', '1')
+
+    def _init_index(self, conn: sqlite3.Connection) -> bool:
+        """Create the search index and bring it up to date; False if SQLite lacks it"""
+        try:
+            # Trigram tokens match any substring, like the old search did
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS notebooks_fts
+                USING fts5({', '.join(SEARCH_FIELDS)}, tokenize='trigram')
+            """)
+            conn.execute("SELECT rowid FROM notebooks_fts LIMIT 1").fetchall()
+        except sqlite3.OperationalError as e:
+            # FTS5 trigram needs SQLite 3.34 or later
+            print(f"⚠️ Search index unavailable ({e}), searching without it")
+            return False
+
+        # Changes made by a SQLite without the index aren't in it
+        if self._get_meta(conn, 'index_stale'):
+            conn.execute("DELETE FROM notebooks_fts")
+            for position, data in conn.execute("SELECT position, data FROM notebooks").fetchall():
+                self._index_notebook(conn, position, json.loads(data))
+            conn.execute("DELETE FROM meta WHERE key = 'index_stale'")
+        return True
+
+    def _import_json(self, conn: sqlite3.Connection) -> bool:
+        """Copy notebooks from the old library.json, if there is one; False if it can't be read"""
+        if not self.legacy_library_file.exists():
+            return True
+        try:
+            with open(self.legacy_library_file, 'r') as f:
+                data = json.load(f)
         except Exception as e:
-            print(f"❌ Error saving library: {e}")
+            print(f"⚠️ Error loading library: {e}")
+            return False
+
+        notebooks = data.get('notebooks', {})
+        for notebook in notebooks.values():
+            self._write_notebook(conn, notebook)
+        self._set_meta(conn, 'active_notebook_id', data.get('active_notebook_id'))
+
+        self.legacy_library_file.replace(self.legacy_library_file.with_name("library.json.bak"))
+        print(f"📚 Migrated {len(notebooks)} notebooks from library.json")
+        return True
+
+    @staticmethod
+    def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: Optional[str]):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @staticmethod
+    def _search_text(notebook: Dict[str, Any], field: str) -> str:
+        value = notebook.get(field) or ''
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def _write_notebook(self, conn: sqlite3.Connection, notebook: Dict[str, Any]):
+        """Insert or update a notebook and its search index entry"""
+        row = conn.execute("SELECT position FROM notebooks WHERE id = ?", (notebook['id'],)).fetchone()
+        data = json.dumps(notebook)
+        if row:
+            position = row[0]
+            conn.execute("UPDATE notebooks SET data = ? WHERE position = ?", (data, position))
+            if self.has_index:
+                conn.execute("DELETE FROM notebooks_fts WHERE rowid = ?", (position,))
+        else:
+            position = conn.execute(
+                "INSERT INTO notebooks (id, data) VALUES (?, ?)", (notebook['id'], data)
+            ).lastrowid
+        if self.has_index:
+            self._index_notebook(conn, position, notebook)
+        else:
+            self._set_meta(conn, 'index_stale', '1')
+
+    def _index_notebook(self, conn: sqlite3.Connection, position: int, notebook: Dict[str, Any]):
+        conn.execute(
+            f"INSERT INTO notebooks_fts (rowid, {', '.join(SEARCH_FIELDS)}) "
+            f"VALUES (?{', ?' * len(SEARCH_FIELDS)})",
+            (position, *(self._search_text(notebook, field) for field in SEARCH_FIELDS))
+        )
+
+    @staticmethod
+    def _read_notebook(conn: sqlite3.Connection, notebook_id: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute("SELECT data FROM notebooks WHERE id = ?", (notebook_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @property
+    def notebooks(self) -> Dict[str, Dict[str, Any]]:
+        """All notebooks by ID, in the order they were added"""
+        return {notebook['id']: notebook for notebook in self.list_notebooks()}
+
+    @property
+    def active_notebook_id(self) -> Optional[str]:
+        """ID of the active notebook"""
+        with closing(self._connect()) as conn:
+            return self._get_meta(conn, 'active_notebook_id')
+
+    # Notebooks
 
     def add_notebook(
         self,
@@ -88,10 +215,6 @@ class NotebookLibrary:
         # Generate ID from name
         notebook_id = name.lower().replace(' ', '-').replace('_', '-')
 
-        # Check for duplicates
-        if notebook_id in self.notebooks:
-            raise ValueError(f"Notebook with ID '{notebook_id}' already exists")
-
         # Create notebook object
         notebook = {
             'id': notebook_id,
@@ -108,14 +231,17 @@ class NotebookLibrary:
             'last_used': None
         }
 
-        # Add to library
-        self.notebooks[notebook_id] = notebook
+        with self._transaction() as conn:
+            # Check for duplicates
+            if self._read_notebook(conn, notebook_id):
+                raise ValueError(f"Notebook with ID '{notebook_id}' already exists")
 
-        # Set as active if it's the first notebook
-        if len(self.notebooks) == 1:
-            self.active_notebook_id = notebook_id
+            # Add to library
+            self._write_notebook(conn, notebook)
 
-        self._save_library()
+            # Set as active if it's the first notebook
+            if conn.execute("SELECT COUNT(*) FROM notebooks").fetchone()[0] == 1:
+                self._set_meta(conn, 'active_notebook_id', notebook_id)
 
         print(f"✅ Added notebook: {name} ({notebook_id})")
         return notebook
@@ -130,17 +256,22 @@ class NotebookLibrary:
         Returns:
             True if removed, False if not found
         """
-        if notebook_id in self.notebooks:
-            del self.notebooks[notebook_id]
-
-            # Clear active if it was removed
-            if self.active_notebook_id == notebook_id:
-                self.active_notebook_id = None
-                # Set new active if there are other notebooks
-                if self.notebooks:
-                    self.active_notebook_id = list(self.notebooks.keys())[0]
-
-            self._save_library()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT position FROM notebooks WHERE id = ?", (notebook_id,)).fetchone()
+            if row:
+                conn.execute("DELETE FROM notebooks WHERE position = ?", (row[0],))
+                if self.has_index:
+                    conn.execute("DELETE FROM notebooks_fts WHERE rowid = ?", (row[0],))
+                else:
+                    self._set_meta(conn, 'index_stale', '1')
+
+                # Clear active if it was removed
+                if self._get_meta(conn, 'active_notebook_id') == notebook_id:
+                    # Set new active if there are other notebooks
+                    first = conn.execute("SELECT id FROM notebooks ORDER BY position LIMIT 1").fetchone()
+                    self._set_meta(conn, 'active_notebook_id', first[0] if first else None)
+
+        if row:
             print(f"✅ Removed notebook: {notebook_id}")
             return True
 
@@ -168,68 +299,72 @@ class NotebookLibrary:
         Returns:
             Updated notebook object
         """
-        if notebook_id not in self.notebooks:
-            raise ValueError(f"Notebook not found: {notebook_id}")
-
-        notebook = self.notebooks[notebook_id]
-
-        # Update fields if provided
-        if name is not None:
-            notebook['name'] = name
-        if description is not None:
-            notebook['description'] = description
-        if topics is not None:
-            notebook['topics'] = topics
-        if content_types is not None:
-            notebook['content_types'] = content_types
-        if use_cases is not None:
-            notebook['use_cases'] = use_cases
-        if tags is not None:
-            notebook['tags'] = tags
-        if url is not None:
-            notebook['url'] = url
-
-        notebook['updated_at'] = datetime.now().isoformat()
-
-        self._save_library()
+        with self._transaction() as conn:
+            notebook = self._read_notebook(conn, notebook_id)
+            if not notebook:
+                raise ValueError(f"Notebook not found: {notebook_id}")
+
+            # Update fields if provided
+            if name is not None:
+                notebook['name'] = name
+            if description is not None:
+                notebook['description'] = description
+            if topics is not None:
+                notebook['topics'] = topics
+            if content_types is not None:
+                notebook['content_types'] = content_types
+            if use_cases is not None:
+                notebook['use_cases'] = use_cases
+            if tags is not None:
+                notebook['tags'] = tags
+            if url is not None:
+                notebook['url'] = url
+
+            notebook['updated_at'] = datetime.now().isoformat()
+            self._write_notebook(conn, notebook)
+
         print(f"✅ Updated notebook: {notebook['name']}")
         return notebook
 
     def get_notebook(self, notebook_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific notebook by ID"""
-        return self.notebooks.get(notebook_id)
+        with closing(self._connect()) as conn:
+            return self._read_notebook(conn, notebook_id)
 
     def list_notebooks(self) -> List[Dict[str, Any]]:
         """List all notebooks in the library"""
-        return list(self.notebooks.values())
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT data FROM notebooks ORDER BY position").fetchall()
+        return [json.loads(row[0]) for row in rows]
 
     def search_notebooks(self, query: str) -> List[Dict[str, Any]]:
         """
         Search notebooks by query
 
         Args:
-            query: Search query (searches name, description, topics, tags)
+            query: Search query (searches name, description, topics, tags, use cases)
 
         Returns:
             List of matching notebooks
         """
-        query_lower = query.lower()
-        results = []
-
-        for notebook in self.notebooks.values():
-            # Search in various fields
-            searchable = [
-                notebook['name'].lower(),
-                notebook['description'].lower(),
-                ' '.join(notebook['topics']).lower(),
-                ' '.join(notebook['tags']).lower(),
-                ' '.join(notebook.get('use_cases', [])).lower()
+        query = query.strip()
+        # Trigrams can't match fewer than three characters, so short
+        # queries fall back to scanning, as does a SQLite without the index
+        if len(query) < 3 or not self.has_index:
+            query_lower = query.lower()
+            return [
+                notebook for notebook in self.list_notebooks()
+                if any(query_lower in self._search_text(notebook, field).lower() for field in SEARCH_FIELDS)
             ]
 
-            if any(query_lower in field for field in searchable):
-                results.append(notebook)
-
-        return results
+        phrase = '"' + query.replace('"', '""') + '"'
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT n.data FROM notebooks_fts f JOIN notebooks n ON n.position = f.rowid "
+                "WHERE notebooks_fts MATCH ? ORDER BY n.position",
+                (phrase,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
 
     def select_notebook(self, notebook_id: str) -> Dict[str, Any]:
         """
@@ -241,20 +376,21 @@ class NotebookLibrary:
         Returns:
             The activated notebook
         """
-        if notebook_id not in self.notebooks:
-            raise ValueError(f"Notebook not found: {notebook_id}")
-
-        self.active_notebook_id = notebook_id
-        self._save_library()
+        with self._transaction() as conn:
+            notebook = self._read_notebook(conn, notebook_id)
+            if not notebook:
+                raise ValueError(f"Notebook not found: {notebook_id}")
+            self._set_meta(conn, 'active_notebook_id', notebook_id)
 
-        notebook = self.notebooks[notebook_id]
         print(f"✅ Activated notebook: {notebook['name']}")
         return notebook
 
     def get_active_notebook(self) -> Optional[Dict[str, Any]]:
         """Get the currently active notebook"""
-        if self.active_notebook_id:
-            return self.notebooks.get(self.active_notebook_id)
+        with closing(self._connect()) as conn:
+            active_notebook_id = self._get_meta(conn, 'active_notebook_id')
+            if active_notebook_id:
+                return self._read_notebook(conn, active_notebook_id)
         return None
 
     def increment_use_count(self, notebook_id: str) -> Dict[str, Any]:
@@ -267,31 +403,34 @@ class NotebookLibrary:
         Returns:
             Updated notebook
         """
-        if notebook_id not in self.notebooks:
-            raise ValueError(f"Notebook not found: {notebook_id}")
+        with self._transaction() as conn:
+            notebook = self._read_notebook(conn, notebook_id)
+            if not notebook:
+                raise ValueError(f"Notebook not found: {notebook_id}")
 
-        notebook = self.notebooks[notebook_id]
-        notebook['use_count'] += 1
-        notebook['last_used'] = datetime.now().isoformat()
+            notebook['use_count'] += 1
+            notebook['last_used'] = datetime.now().isoformat()
+            # Only usage changed, so the search index stays as it is
+            conn.execute("UPDATE notebooks SET data = ? WHERE id = ?", (json.dumps(notebook), notebook_id))
 
-        self._save_library()
         return notebook
 
     def get_stats(self) -> Dict[str, Any]:
         """Get library statistics"""
-        total_notebooks = len(self.notebooks)
+        notebooks = self.list_notebooks()
+        total_notebooks = len(notebooks)
         total_topics = set()
         total_use_count = 0
 
-        for notebook in self.notebooks.values():
+        for notebook in notebooks:
             total_topics.update(notebook['topics'])
             total_use_count += notebook['use_count']
 
         # Find most used
         most_used = None
-        if self.notebooks:
+        if notebooks:
             most_used = max(
-                self.notebooks.values(),
+                notebooks,
                 key=lambda n: n['use_count']
             )
 
@@ -362,9 +501,10 @@ def main():
     elif args.command == 'list':
         notebooks = library.list_notebooks()
         if notebooks:
+            active_notebook_id = library.active_notebook_id
             print("\n📚 Notebook Library:")
             for notebook in notebooks:
-                active = " [ACTIVE]" if notebook['id'] == library.active_notebook_id else ""
+                active = " [ACTIVE]" if notebook['id'] == active_notebook_id else ""
                 print(f"\n  📓 {notebook['name']}{active}")
                 print(f"     ID: {notebook['id']}")
                 print(f"     Topics: {', '.join(notebook['topics'])}")
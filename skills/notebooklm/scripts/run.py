@@ -9,6 +9,8 @@ import sys
 import subprocess
 from pathlib import Path
 
+from setup_environment import SkillEnvironment
+
 
 def get_venv_python():
     """Get the virtual environment Python executable"""
@@ -24,14 +26,17 @@ def get_venv_python():
 
 
 def ensure_venv():
-    """Ensure virtual environment exists"""
+    """Ensure virtual environment exists with the current requirements installed"""
     skill_dir = Path(__file__).parent.parent
     venv_dir = skill_dir / ".venv"
     setup_script = skill_dir / "scripts" / "setup_environment.py"
 
-    # Check if venv exists
-    if not venv_dir.exists():
-        print("🔧 First-time setup: Creating virtual environment...")
+    # Only a hash comparison when nothing changed, so this costs no subprocess
+    if not SkillEnvironment().dependencies_up_to_date():
+        if venv_dir.exists():
+            print("🔧 requirements.txt changed: Updating virtual environment...")
+        else:
+            print("🔧 First-time setup: Creating virtual environment...")
         print("   This may take a minute...")
 
         # Run setup with system Python
@@ -45,12 +50,34 @@ def ensure_venv():
     return get_venv_python()
 
 
+def run_script(venv_python: Path, script_path: Path, script_args: list):
+    """
+    Run the script with the venv Python in place of this process (never returns)
+
+    On Windows exec starts a separate process instead of replacing this one,
+    so the script is run as a child there, as before.
+    """
+    cmd = [str(venv_python), str(script_path)] + script_args
+    if os.name != 'nt':
+        # Output printed so far would be lost with the old process image
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(str(venv_python), cmd)
+
+    result = subprocess.run(cmd)
+    sys.exit(result.returncode)
+
+
 def main():
     """Main runner"""
     if len(sys.argv) < 2:
         print("Usage: python run.py <script_name> [args...]")
         print("\nAvailable scripts:")
         print("  ask_question.py    - Query NotebookLM")
+        print("  ask_many.py        - Ask several notebooks at once")
+        print("  ask_batch.py       - Run a JSONL file of questions")
+        print("  answer_cache.py    - Show or clear cached answers")
+        print("  notebook_daemon.py - Manage the background browser daemon")
         print("  notebook_manager.py - Manage notebook library")
         print("  session_manager.py  - Manage sessions")
         print("  auth_manager.py     - Handle authentication")
@@ -83,13 +110,9 @@ def main():
     # Ensure venv exists and get Python executable
     venv_python = ensure_venv()
 
-    # Build command
-    cmd = [str(venv_python), str(script_path)] + script_args
-
     # Run the script
     try:
-        result = subprocess.run(cmd)
-        sys.exit(result.returncode)
+        run_script(venv_python, script_path, script_args)
     except KeyboardInterrupt:
         print("\n⚠️ Interrupted by user")
         sys.exit(130)
@@ -4,6 +4,7 @@ Environment Setup for NotebookLM Skill
 Manages virtual environment and dependencies automatically
 """
 
+import hashlib
 import os
 import sys
 import subprocess
@@ -19,6 +20,8 @@ class SkillEnvironment:
         self.skill_dir = Path(__file__).parent.parent
         self.venv_dir = self.skill_dir / ".venv"
         self.requirements_file = self.skill_dir / "requirements.txt"
+        # Hash of the requirements.txt last installed into the venv, written once Chrome is installed too
+        self.stamp_file = self.venv_dir / ".requirements.sha256"
 
         # Python executable in venv
         if os.name == 'nt':  # Windows
@@ -48,6 +51,10 @@ class SkillEnvironment:
 
         # Install/update dependencies
         if self.requirements_file.exists():
+            if self.dependencies_up_to_date():
+                print("✅ Dependencies up to date")
+                return True
+
             print("📦 Installing dependencies...")
             try:
                 # Upgrade pip first
@@ -79,6 +86,8 @@ class SkillEnvironment:
                         text=True
                     )
                     print("✅ Chrome installed")
+                    # Only a complete setup is skipped next time
+                    self.stamp_file.write_text(self.requirements_hash())
                 except subprocess.CalledProcessError as e:
                     print(f"⚠️ Warning: Failed to install Chrome: {e}")
                     print("   You may need to run manually: python -m patchright install chrome")
@@ -93,6 +102,18 @@ class SkillEnvironment:
             print("⚠️ No requirements.txt found, skipping dependency installation")
             return True
 
+    def requirements_hash(self) -> str:
+        """SHA-256 of requirements.txt"""
+        return hashlib.sha256(self.requirements_file.read_bytes()).hexdigest()
+
+    def dependencies_up_to_date(self) -> bool:
+        """Check if the venv has the current requirements.txt installed"""
+        if not self.venv_python.exists() or not self.stamp_file.exists():
+            return False
+        if not self.requirements_file.exists():
+            return True
+        return self.stamp_file.read_text().strip() == self.requirements_hash()
+
     def is_in_skill_venv(self) -> bool:
         """Check if we're already running in the skill's venv"""
         if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
@@ -14,36 +14,96 @@ class RectAndField:
     field: dict
 
 
+def rects_intersect(r1, r2):
+    disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
+    disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
+    return not (disjoint_horizontal or disjoint_vertical)
+
+
+MAX_CELLS_PER_RECT = 1024
+
+
+# Uniform grid over each page's rects, so a rect is only compared with rects in
+# the grid cells it covers instead of with every other rect.
+class RectIndex:
+    def __init__(self, rects_and_fields):
+        self.rects_and_fields = rects_and_fields
+        # page_number -> (cell_size, {(cx, cy): [indices]}, [unindexed indices])
+        self.pages = {}
+
+        rects_by_page = {}
+        for i, rf in enumerate(rects_and_fields):
+            rects_by_page.setdefault(rf.field["page_number"], []).append(i)
+        for page_number, indices in rects_by_page.items():
+            # Cells about the size of a typical rect keep both the number of
+            # cells per rect and the number of rects per cell small.
+            sizes = sorted(max(rects_and_fields[i].rect[2] - rects_and_fields[i].rect[0],
+                               rects_and_fields[i].rect[3] - rects_and_fields[i].rect[1]) for i in indices)
+            cell_size = max(sizes[len(sizes) // 2], 1)
+            cells = {}
+            unindexed = []
+            for i in indices:
+                cell_range = self._cell_range(rects_and_fields[i].rect, cell_size)
+                if cell_range is None:
+                    unindexed.append(i)
+                    continue
+                for cell in cell_range:
+                    cells.setdefault(cell, []).append(i)
+            self.pages[page_number] = (cell_size, cells, unindexed)
+
+    @staticmethod
+    def _cell_range(rect, cell_size):
+        x0, y0, x1, y1 = rect
+        # Inverted boxes don't have a well-defined area; compare them with everything.
+        if x0 > x1 or y0 > y1:
+            return None
+        cx0, cx1 = int(x0 // cell_size), int(x1 // cell_size)
+        cy0, cy1 = int(y0 // cell_size), int(y1 // cell_size)
+        # So do boxes far larger than the others, rather than filling thousands of cells.
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > MAX_CELLS_PER_RECT:
+            return None
+        return [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+
+    # Indices j > i of rects on the same page that intersect rect i, in increasing order.
+    def intersecting_after(self, i):
+        ri = self.rects_and_fields[i]
+        cell_size, cells, unindexed = self.pages[ri.field["page_number"]]
+        cell_range = self._cell_range(ri.rect, cell_size)
+        if cell_range is None:
+            candidates = {j for indices in cells.values() for j in indices}
+        else:
+            candidates = {j for cell in cell_range for j in cells.get(cell, ())}
+        candidates.update(unindexed)
+        return [j for j in sorted(candidates)
+                if j > i and rects_intersect(ri.rect, self.rects_and_fields[j].rect)]
+
+
 # Returns a list of messages that are printed to stdout for Claude to read.
 def get_bounding_box_messages(fields_json_stream) -> list[str]:
     messages = []
     fields = json.load(fields_json_stream)
     messages.append(f"Read {len(fields['form_fields'])} fields")
 
-    def rects_intersect(r1, r2):
-        disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
-        disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
-        return not (disjoint_horizontal or disjoint_vertical)
-
     rects_and_fields = []
     for f in fields["form_fields"]:
         rects_and_fields.append(RectAndField(f["label_bounding_box"], "label", f))
         rects_and_fields.append(RectAndField(f["entry_bounding_box"], "entry", f))
+    index = RectIndex(rects_and_fields)
 
     has_error = False
     for i, ri in enumerate(rects_and_fields):
-        # This is O(N^2); we can optimize if it becomes a problem.
-        for j in range(i + 1, len(rects_and_fields)):
+        # Pairs are reported in the same order as comparing every rect with
+        # every later rect, so the first 20 messages don't depend on the index.
+        for j in index.intersecting_after(i):
             rj = rects_and_fields[j]
-            if ri.field["page_number"] == rj.field["page_number"] and rects_intersect(ri.rect, rj.rect):
-                has_error = True
-                if ri.field is rj.field:
-                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
-                else:
-                    messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
-                if len(messages) >= 20:
-                    messages.append("Aborting further checks; fix bounding boxes and try again")
-                    return messages
+            has_error = True
+            if ri.field is rj.field:
+                messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
+            else:
+                messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
+            if len(messages) >= 20:
+                messages.append("Aborting further checks; fix bounding boxes and try again")
+                return messages
         if ri.rect_type == "entry":
             if "entry_text" in ri.field:
                 font_size = ri.field["entry_text"].get("font_size", 14)
@@ -1,6 +1,7 @@
 import unittest
 import json
 import io
+import random
 from check_bounding_boxes import get_bounding_box_messages
 
 
@@ -220,7 +221,124 @@ class TestGetBoundingBoxMessages(unittest.TestCase):
         messages = get_bounding_box_messages(stream)
         self.assertTrue(any("SUCCESS" in msg for msg in messages))
         self.assertFalse(any("FAILURE" in msg for msg in messages))
-    
+
+    def brute_force_messages(self, data):
+        """Reference implementation that compares every pair of rects"""
+        messages = [f"Read {len(data['form_fields'])} fields"]
+        rects = []
+        for f in data["form_fields"]:
+            rects.append((f["label_bounding_box"], "label", f))
+            rects.append((f["entry_bounding_box"], "entry", f))
+
+        def intersect(r1, r2):
+            return not (r1[0] >= r2[2] or r1[2] <= r2[0] or r1[1] >= r2[3] or r1[3] <= r2[1])
+
+        has_error = False
+        for i, (ri, ti, fi) in enumerate(rects):
+            for rj, tj, fj in rects[i + 1:]:
+                if fi["page_number"] == fj["page_number"] and intersect(ri, rj):
+                    has_error = True
+                    if fi is fj:
+                        messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{fi['description']}` ({ri}, {rj})")
+                    else:
+                        messages.append(f"FAILURE: intersection between {ti} bounding box for `{fi['description']}` ({ri}) and {tj} bounding box for `{fj['description']}` ({rj})")
+                    if len(messages) >= 20:
+                        messages.append("Aborting further checks; fix bounding boxes and try again")
+                        return messages
+            if ti == "entry" and "entry_text" in fi:
+                font_size = fi["entry_text"].get("font_size", 14)
+                if ri[3] - ri[1] < font_size:
+                    has_error = True
+                    messages.append(f"FAILURE: entry bounding box height ({ri[3] - ri[1]}) for `{fi['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
+                    if len(messages) >= 20:
+                        messages.append("Aborting further checks; fix bounding boxes and try again")
+                        return messages
+        if not has_error:
+            messages.append("SUCCESS: All bounding boxes are valid")
+        return messages
+
+    def grid_form(self, pages, rows, columns):
+        """A generated form with a label and entry box in every cell of a grid on every page"""
+        fields = []
+        for page in range(1, pages + 1):
+            for row in range(rows):
+                for column in range(columns):
+                    x = column * 100
+                    y = row * 20
+                    fields.append({
+                        "description": f"Field p{page} r{row} c{column}",
+                        "page_number": page,
+                        "label_bounding_box": [x, y, x + 40, y + 18],
+                        "entry_bounding_box": [x + 40, y, x + 95, y + 18],
+                        "entry_text": {"font_size": 10},
+                    })
+        return {"form_fields": fields}
+
+    def random_form(self, rng, count, pages):
+        """A generated form with randomly placed and sized boxes, some overlapping"""
+        def box():
+            x, y = rng.uniform(0, 600), rng.uniform(0, 800)
+            return [x, y, x + rng.choice([1, 5, 30, 120, 400]), y + rng.uniform(2, 30)]
+        fields = []
+        for i in range(count):
+            field = {
+                "description": f"Field{i}",
+                "page_number": rng.randint(1, pages),
+                "label_bounding_box": box(),
+                "entry_bounding_box": box(),
+            }
+            if rng.random() < 0.3:
+                field["entry_text"] = {"font_size": rng.choice([8, 14, 20])}
+            fields.append(field)
+        return {"form_fields": fields}
+
+    def test_large_form_without_overlaps(self):
+        """Test a generated form with thousands of fields and no overlaps"""
+        data = self.grid_form(pages=20, rows=40, columns=6)
+        messages = get_bounding_box_messages(self.create_json_stream(data))
+        self.assertEqual(messages, ["Read 4800 fields", "SUCCESS: All bounding boxes are valid"])
+
+    def test_large_form_with_one_overlap(self):
+        """Test that a single overlap is found among thousands of fields"""
+        data = self.grid_form(pages=20, rows=40, columns=6)
+        data["form_fields"][3000]["entry_bounding_box"][2] += 20  # Runs into the next label
+        messages = get_bounding_box_messages(self.create_json_stream(data))
+        self.assertEqual(len(messages), 2)
+        self.assertIn("Field p13 r20 c0", messages[1])
+        self.assertIn("Field p13 r20 c1", messages[1])
+
+    def test_large_form_abort_matches_brute_force(self):
+        """Test that the first 20 messages and the abort match comparing every pair"""
+        data = self.grid_form(pages=10, rows=40, columns=6)
+        for field in data["form_fields"][1000::37]:
+            field["label_bounding_box"][2] += 10  # Overlaps its own entry box
+        messages = get_bounding_box_messages(self.create_json_stream(data))
+        self.assertEqual(messages[-1], "Aborting further checks; fix bounding boxes and try again")
+        self.assertEqual(messages, self.brute_force_messages(data))
+
+    def test_random_forms_match_brute_force(self):
+        """Test that random forms give exactly the messages of comparing every pair"""
+        rng = random.Random(1234)
+        for _ in range(30):
+            data = self.random_form(rng, count=rng.choice([5, 40, 300]), pages=rng.randint(1, 4))
+            with self.subTest(fields=len(data["form_fields"])):
+                messages = get_bounding_box_messages(self.create_json_stream(data))
+                self.assertEqual(messages, self.brute_force_messages(data))
+
+    def test_oversized_and_inverted_boxes_match_brute_force(self):
+        """Test boxes that span the whole page or have swapped corners"""
+        data = self.grid_form(pages=1, rows=10, columns=3)
+        data["form_fields"].append({
+            "description": "Page border",
+            "page_number": 1,
+            "label_bounding_box": [-1e6, -1e6, 1e6, 1e6],
+            "entry_bounding_box": [250, 30, 210, 10],
+        })
+        data["form_fields"].insert(0, data["form_fields"].pop())
+        messages = get_bounding_box_messages(self.create_json_stream(data))
+        self.assertTrue(any("Page border" in msg for msg in messages))
+        self.assertEqual(messages, self.brute_force_messages(data))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,12 +1,21 @@
 import sys
 from pypdf import PdfReader
 
+from extract_form_field_info import index_form_fields
+
 
 # Script for Claude to run to determine whether a PDF has fillable form fields. See forms.md.
 
 
-reader = PdfReader(sys.argv[1])
-if (reader.get_fields()):
-    print("This PDF has fillable form fields")
-else:
-    print("This PDF does not have fillable form fields; you will need to visually determine where to enter data")
+# Walks the field tree once, like extract_form_field_info.py, instead of
+# PdfReader `get_fields`, which slows down sharply on forms with many fields.
+def has_fillable_fields(reader: PdfReader):
+    return bool(index_form_fields(reader, {}))
+
+
+if __name__ == "__main__":
+    reader = PdfReader(sys.argv[1])
+    if has_fillable_fields(reader):
+        print("This PDF has fillable form fields")
+    else:
+        print("This PDF does not have fillable form fields; you will need to visually determine where to enter data")
@@ -1,35 +1,85 @@
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from pdf2image import convert_from_path
+from PIL import Image
+from pypdf import PdfReader
 
 
 # Converts each page of a PDF to a PNG image.
+#
+# Pages are rendered in chunks of consecutive pages, several chunks at a time,
+# and poppler writes the PNG files directly, so memory use does not grow with
+# the page count. Pages that would be larger than `max_dim` at the default DPI
+# are rendered at the target size instead of being rendered large and resized.
 
 
-def convert(pdf_path, output_dir, max_dim=1000):
-    images = convert_from_path(pdf_path, dpi=200)
+DPI = 200
+CHUNK_SIZE = 8
 
-    for i, image in enumerate(images):
-        # Scale image if needed to keep width/height under `max_dim`
-        width, height = image.size
-        if width > max_dim or height > max_dim:
-            scale_factor = min(max_dim / width, max_dim / height)
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-            image = image.resize((new_width, new_height))
-        
-        image_path = os.path.join(output_dir, f"page_{i+1}.png")
-        image.save(image_path)
-        print(f"Saved page {i+1} as {image_path} (size: {image.size})")
 
-    print(f"Converted {len(images)} pages to PNG images")
+# Splits the document into runs of consecutive pages that can be rendered with
+# a single poppler call: (first_page, last_page, size), where size is None to
+# render at DPI, or the length of the longest side to scale to.
+def plan_chunks(pdf_path, max_dim, chunk_size=CHUNK_SIZE, reader=None):
+    chunks = []
+    for page_number, page in enumerate((reader or PdfReader(pdf_path)).pages, start=1):
+        size = render_size(page.cropbox, max_dim)
+        if chunks and chunks[-1][2] == size and page_number - chunks[-1][0] < chunk_size:
+            chunks[-1] = (chunks[-1][0], page_number, size)
+        else:
+            chunks.append((page_number, page_number, size))
+    return chunks
+
+
+# The `size` argument for rendering a page with this cropbox (the area poppler
+# renders; pypdf falls back to the mediabox): None to render at DPI, or
+# max_dim if the page would be larger than that at DPI.
+def render_size(cropbox, max_dim):
+    # The rendered size only depends on the longest side, so rotation doesn't matter.
+    longest_side = max(cropbox.width, cropbox.height) * DPI / 72
+    return max_dim if longest_side > max_dim else None
+
+
+def render_chunk(pdf_path, output_dir, first_page, last_page, size):
+    prefix = f"_render_{first_page:06d}_"
+    paths = convert_from_path(
+        pdf_path, dpi=DPI, size=size, first_page=first_page, last_page=last_page,
+        output_folder=output_dir, output_file=prefix, fmt="png", paths_only=True)
+    results = []
+    for page_number, path in enumerate(sorted(paths), start=first_page):
+        image_path = os.path.join(output_dir, f"page_{page_number}.png")
+        os.replace(path, image_path)
+        # Only reads the PNG header.
+        with Image.open(image_path) as image:
+            results.append((page_number, image_path, image.size))
+    return results
+
+
+def convert(pdf_path, output_dir, max_dim=1000, workers=None, reader=None):
+    os.makedirs(output_dir, exist_ok=True)
+    chunks = plan_chunks(pdf_path, max_dim, reader=reader)
+    workers = workers or min(len(chunks), os.cpu_count() or 1) or 1
+
+    page_count = 0
+    # The rendering happens in poppler subprocesses, so threads are enough to
+    # keep several of them busy.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(render_chunk, pdf_path, output_dir, *chunk) for chunk in chunks]
+        for future in futures:
+            for page_number, image_path, image_size in future.result():
+                print(f"Saved page {page_number} as {image_path} (size: {image_size})")
+                page_count += 1
+
+    print(f"Converted {page_count} pages to PNG images")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: convert_pdf_to_images.py [input pdf] [output directory]")
+    if len(sys.argv) not in (3, 4):
+        print("Usage: convert_pdf_to_images.py [input pdf] [output directory] [workers]")
         sys.exit(1)
     pdf_path = sys.argv[1]
     output_directory = sys.argv[2]
-    convert(pdf_path, output_directory)
+    workers = int(sys.argv[3]) if len(sys.argv) == 4 else None
+    convert(pdf_path, output_directory, workers=workers)
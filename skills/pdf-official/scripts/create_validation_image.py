@@ -1,5 +1,8 @@
 import json
+import math
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 from PIL import Image, ImageDraw
 
@@ -8,31 +11,104 @@ from PIL import Image, ImageDraw
 # Claude creates when determining where to add text annotations in PDFs. See forms.md.
 
 
+THUMBNAIL_SIZE = 300
+
+
+def draw_validation_boxes(img, fields):
+    draw = ImageDraw.Draw(img)
+    num_boxes = 0
+    for field in fields:
+        entry_box = field['entry_bounding_box']
+        label_box = field['label_bounding_box']
+        # Draw red rectangle over entry bounding box and blue rectangle over the label.
+        draw.rectangle(entry_box, outline='red', width=2)
+        draw.rectangle(label_box, outline='blue', width=2)
+        num_boxes += 2
+    return num_boxes
+
+
 def create_validation_image(page_number, fields_json_path, input_path, output_path):
     # Input file should be in the `fields.json` format described in forms.md.
     with open(fields_json_path, 'r') as f:
         data = json.load(f)
 
-        img = Image.open(input_path)
-        draw = ImageDraw.Draw(img)
-        num_boxes = 0
-        
-        for field in data["form_fields"]:
-            if field["page_number"] == page_number:
-                entry_box = field['entry_bounding_box']
-                label_box = field['label_bounding_box']
-                # Draw red rectangle over entry bounding box and blue rectangle over the label.
-                draw.rectangle(entry_box, outline='red', width=2)
-                draw.rectangle(label_box, outline='blue', width=2)
-                num_boxes += 2
-        
-        img.save(output_path)
-        print(f"Created validation image at {output_path} with {num_boxes} bounding boxes")
+    img = Image.open(input_path)
+    num_boxes = draw_validation_boxes(img, [f for f in data["form_fields"] if f["page_number"] == page_number])
+    img.save(output_path)
+    print(f"Created validation image at {output_path} with {num_boxes} bounding boxes")
+
+
+# Draws one page's boxes and returns a thumbnail of the result for the contact sheet.
+def _create_page_image(task):
+    page_number, fields, input_path, output_path = task
+    with Image.open(input_path) as img:
+        img = img.convert("RGB")
+    num_boxes = draw_validation_boxes(img, fields)
+    img.save(output_path)
+    img.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    return page_number, output_path, num_boxes, img
+
+
+def create_contact_sheet(thumbnails, output_path):
+    # thumbnails: [(page_number, image)] in page order
+    columns = math.ceil(math.sqrt(len(thumbnails)))
+    rows = math.ceil(len(thumbnails) / columns)
+    label_height = 20
+    cell_width = max(img.width for _, img in thumbnails)
+    cell_height = max(img.height for _, img in thumbnails) + label_height
+    sheet = Image.new("RGB", (columns * cell_width, rows * cell_height), "white")
+    draw = ImageDraw.Draw(sheet)
+    for i, (page_number, img) in enumerate(thumbnails):
+        x = (i % columns) * cell_width
+        y = (i // columns) * cell_height
+        sheet.paste(img, (x + (cell_width - img.width) // 2, y + label_height))
+        draw.text((x + 4, y + 4), f"Page {page_number}", fill="black")
+    sheet.save(output_path)
+
+
+# Creates validation images for every page in one run. Page images are read from
+# `images_dir` using the names written by convert_pdf_to_images.py (page_N.png);
+# outputs are written to `output_dir` as validation_page_N.png, plus a
+# contact_sheet.png with all pages side by side.
+def create_validation_images(fields_json_path, images_dir, output_dir, workers=None):
+    with open(fields_json_path, 'r') as f:
+        data = json.load(f)
+
+    fields_by_page = {p["page_number"]: [] for p in data.get("pages", [])}
+    for field in data["form_fields"]:
+        fields_by_page.setdefault(field["page_number"], []).append(field)
+
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = []
+    for page_number in sorted(fields_by_page):
+        input_path = os.path.join(images_dir, f"page_{page_number}.png")
+        if not os.path.exists(input_path):
+            print(f"Skipping page {page_number}: {input_path} not found")
+            continue
+        output_path = os.path.join(output_dir, f"validation_page_{page_number}.png")
+        tasks.append((page_number, fields_by_page[page_number], input_path, output_path))
+    if not tasks:
+        print("No page images found")
+        return
+
+    thumbnails = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for page_number, output_path, num_boxes, thumbnail in executor.map(_create_page_image, tasks):
+            print(f"Created validation image at {output_path} with {num_boxes} bounding boxes")
+            thumbnails.append((page_number, thumbnail))
+
+    contact_sheet_path = os.path.join(output_dir, "contact_sheet.png")
+    create_contact_sheet(thumbnails, contact_sheet_path)
+    print(f"Created contact sheet at {contact_sheet_path} with {len(thumbnails)} pages")
 
 
 if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--all":
+        create_validation_images(sys.argv[2], sys.argv[3], sys.argv[4])
+        sys.exit(0)
     if len(sys.argv) != 5:
         print("Usage: create_validation_image.py [page number] [fields.json file] [input image path] [output image path]")
+        print("       create_validation_image.py --all [fields.json file] [page images directory] [output directory]")
         sys.exit(1)
     page_number = int(sys.argv[1])
     fields_json_path = sys.argv[2]
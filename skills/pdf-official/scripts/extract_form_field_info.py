@@ -1,22 +1,89 @@
+import hashlib
 import json
+import os
 import sys
 
 from pypdf import PdfReader
+from pypdf.generic import DictionaryObject
 
 
 # Extracts data for the fillable form fields in a PDF and outputs JSON that
 # Claude uses to fill the fields. See forms.md.
 
 
+# Bump when the field info format changes so stale cache files are ignored.
+FIELD_INFO_CACHE_VERSION = 1
+
+
 # This matches the format used by PdfReader `get_fields` and `update_page_form_field_values` methods.
-def get_full_annotation_field_id(annotation):
-    components = []
-    while annotation:
-        field_name = annotation.get('/T')
+# `cache` maps indirect references of field dictionaries to their full names
+# ("" for unnamed nodes). Widgets of the same field and fields sharing parents
+# then only resolve each ancestor once.
+def get_full_annotation_field_id(annotation, cache=None):
+    if cache is None:
+        cache = {}
+    # Climb until the root or an already resolved ancestor.
+    chain = []
+    prefix = ""
+    node = annotation
+    while node:
+        ref = node.indirect_reference
+        key = (ref.idnum, ref.generation) if ref is not None else None
+        if key is not None and key in cache:
+            prefix = cache[key]
+            break
+        chain.append((key, node.get('/T')))
+        node = node.get('/Parent')
+    # Resolve names from the top down, caching each ancestor on the way.
+    for key, field_name in reversed(chain):
         if field_name:
-            components.append(field_name)
-        annotation = annotation.get('/Parent')
-    return ".".join(reversed(components)) if components else None
+            prefix = f"{prefix}.{field_name}" if prefix else field_name
+        if key is not None:
+            cache[key] = prefix
+    return prefix or None
+
+
+# Walks the AcroForm field tree once and returns {field_id: field dictionary}
+# in document order. Each node is visited once even if the tree has cycles or
+# shared kids, and names are resolved through `field_id_cache`.
+def index_form_fields(reader: PdfReader, field_id_cache):
+    fields = {}
+    acro_form = reader.root_object.get('/AcroForm')
+    acro_form = acro_form.get_object() if acro_form is not None else None
+    if not isinstance(acro_form, DictionaryObject):
+        return fields
+    visited = set()
+    pending = list(reversed(acro_form['/Fields'])) if '/Fields' in acro_form else []
+    while pending:
+        node = pending.pop().get_object()
+        if not isinstance(node, DictionaryObject):
+            continue
+        ref = node.indirect_reference
+        key = (ref.idnum, ref.generation) if ref is not None else id(node)
+        if key in visited:
+            continue
+        visited.add(key)
+        # Widgets merged into their field have no name of their own.
+        if '/T' not in node:
+            continue
+        fields[get_full_annotation_field_id(node, field_id_cache)] = node
+        if '/Kids' in node:
+            pending.extend(reversed(node['/Kids']))
+    return fields
+
+
+# The possible values of a checkbox or choice field, in the same form as the
+# "/_States_" entry that PdfReader `get_fields` adds.
+def get_field_states(field):
+    ft = field.get('/FT')
+    if ft == "/Ch":
+        return list(field.get('/Opt', []))
+    if ft == "/Btn" and '/AP' in field:
+        states = list(field['/AP'].get('/N', {}).keys())
+        if "/Off" not in states:
+            states.append("/Off")
+        return states
+    return []
 
 
 def make_field_dict(field, field_id):
@@ -26,7 +93,7 @@ def make_field_dict(field, field_id):
         field_dict["type"] = "text"
     elif ft == "/Btn":
         field_dict["type"] = "checkbox"  # radio groups handled separately
-        states = field.get("/_States_", [])
+        states = get_field_states(field)
         if len(states) == 2:
             # "/Off" seems to always be the unchecked value, as suggested by
             # https://opensource.adobe.com/dc-acrobat-sdk-docs/standards/pdfstandards/pdf/PDF32000_2008.pdf#page=448
@@ -40,11 +107,11 @@ def make_field_dict(field, field_id):
                 field_dict["unchecked_value"] = states[1]
     elif ft == "/Ch":
         field_dict["type"] = "choice"
-        states = field.get("/_States_", [])
+        # Options are either [export value, display text] pairs or plain strings.
         field_dict["choice_options"] = [{
-            "value": state[0],
-            "text": state[1],
-        } for state in states]
+            "value": state[0] if isinstance(state, list) else state,
+            "text": state[1] if isinstance(state, list) else state,
+        } for state in get_field_states(field)]
     else:
         field_dict["type"] = f"unknown ({ft})"
     return field_dict
@@ -60,7 +127,9 @@ def make_field_dict(field, field_id):
 #   },
 # ]
 def get_field_info(reader: PdfReader):
-    fields = reader.get_fields()
+    # Resolved names are shared between the field tree and the page widgets.
+    field_id_cache = {}
+    fields = index_form_fields(reader, field_id_cache)
 
     field_info_by_id = {}
     possible_radio_names = set()
@@ -81,10 +150,14 @@ def get_field_info(reader: PdfReader):
     # See https://westhealth.github.io/exploring-fillable-forms-with-pdfrw.html
     radio_fields_by_id = {}
 
+    # Single pass over all widget annotations.
     for page_index, page in enumerate(reader.pages):
         annotations = page.get('/Annots', [])
         for ann in annotations:
-            field_id = get_full_annotation_field_id(ann)
+            ann = ann.get_object()
+            if ann.get('/Subtype', '/Widget') != '/Widget':
+                continue
+            field_id = get_full_annotation_field_id(ann, field_id_cache)
             if field_id in field_info_by_id:
                 field_info_by_id[field_id]["page"] = page_index + 1
                 field_info_by_id[field_id]["rect"] = ann.get('/Rect')
@@ -137,16 +210,43 @@ def get_field_info(reader: PdfReader):
     return sorted_fields
 
 
-def write_field_info(pdf_path: str, json_output_path: str):
-    reader = PdfReader(pdf_path)
-    field_info = get_field_info(reader)
+# Like `get_field_info`, but reuses the result of an earlier run on the same
+# file if `cache_dir` has one. Cache files are keyed by the SHA-256 of the PDF,
+# so any change to the file invalidates them.
+def get_field_info_cached(pdf_path: str, cache_dir: str):
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    cache_path = os.path.join(cache_dir, f"{digest.hexdigest()}-v{FIELD_INFO_CACHE_VERSION}.json")
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    field_info = get_field_info(PdfReader(pdf_path))
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary file first so concurrent runs never see a partial cache.
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(field_info, f)
+    os.replace(tmp_path, cache_path)
+    return field_info
+
+
+def write_field_info(pdf_path: str, json_output_path: str, cache_dir=None):
+    if cache_dir:
+        field_info = get_field_info_cached(pdf_path, cache_dir)
+    else:
+        field_info = get_field_info(PdfReader(pdf_path))
     with open(json_output_path, "w") as f:
         json.dump(field_info, f, indent=2)
     print(f"Wrote {len(field_info)} fields to {json_output_path}")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: extract_form_field_info.py [input pdf] [output json]")
+    if len(sys.argv) not in (3, 4):
+        print("Usage: extract_form_field_info.py [input pdf] [output json] [cache dir]")
         sys.exit(1)
-    write_field_info(sys.argv[1], sys.argv[2])
+    write_field_info(sys.argv[1], sys.argv[2], sys.argv[3] if len(sys.argv) == 4 else None)
@@ -1,5 +1,7 @@
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 from pypdf import PdfReader, PdfWriter
 
@@ -12,48 +14,151 @@ from extract_form_field_info import get_field_info
 def fill_pdf_fields(input_pdf_path: str, fields_json_path: str, output_pdf_path: str):
     with open(fields_json_path) as f:
         fields = json.load(f)
-    # Group by page number.
-    fields_by_page = {}
-    for field in fields:
-        if "value" in field:
-            field_id = field["field_id"]
-            page = field["page"]
-            if page not in fields_by_page:
-                fields_by_page[page] = {}
-            fields_by_page[page][field_id] = field["value"]
-    
-    reader = PdfReader(input_pdf_path)
-
-    has_error = False
-    field_info = get_field_info(reader)
-    fields_by_ids = {f["field_id"]: f for f in field_info}
-    for field in fields:
-        existing_field = fields_by_ids.get(field["field_id"])
-        if not existing_field:
-            has_error = True
-            print(f"ERROR: `{field['field_id']}` is not a valid field ID")
-        elif field["page"] != existing_field["page"]:
-            has_error = True
-            print(f"ERROR: Incorrect page number for `{field['field_id']}` (got {field['page']}, expected {existing_field['page']})")
-        else:
-            if "value" in field:
+
+    form = FormTemplate(input_pdf_path)
+    errors = form.validate(fields)
+    if errors:
+        for err in errors:
+            print(err)
+        sys.exit(1)
+    form.write(fields, output_pdf_path)
+
+
+# A parsed form that can be filled many times. The PDF is read and its field
+# map built once; each fill only validates against the cached field info and
+# writes a filled copy.
+class FormTemplate:
+    # `reader` and `field_info` can be passed in when the PDF has already been
+    # parsed, e.g. by a PdfSession.
+    def __init__(self, input_pdf_path: str, reader=None, field_info=None):
+        self.reader = reader or PdfReader(input_pdf_path)
+        if field_info is None:
+            field_info = get_field_info(self.reader)
+        self.fields_by_ids = {f["field_id"]: f for f in field_info}
+
+    # Returns a list of error messages; empty if all fields are valid.
+    def validate(self, fields):
+        errors = []
+        for field in fields:
+            existing_field = self.fields_by_ids.get(field["field_id"])
+            if not existing_field:
+                errors.append(f"ERROR: `{field['field_id']}` is not a valid field ID")
+            elif field["page"] != existing_field["page"]:
+                errors.append(f"ERROR: Incorrect page number for `{field['field_id']}` (got {field['page']}, expected {existing_field['page']})")
+            elif "value" in field:
                 err = validation_error_for_field_value(existing_field, field["value"])
                 if err:
-                    print(err)
-                    has_error = True
-    if has_error:
-        sys.exit(1)
+                    errors.append(err)
+        return errors
+
+    def write(self, fields, output_pdf_path: str):
+        # Group by page number.
+        fields_by_page = {}
+        for field in fields:
+            if "value" in field:
+                fields_by_page.setdefault(field["page"], {})[field["field_id"]] = field["value"]
+
+        writer = PdfWriter(clone_from=self.reader)
+        for page, field_values in fields_by_page.items():
+            writer.update_page_form_field_values(writer.pages[page - 1], field_values, auto_regenerate=False)
 
-    writer = PdfWriter(clone_from=reader)
-    for page, field_values in fields_by_page.items():
-        writer.update_page_form_field_values(writer.pages[page - 1], field_values, auto_regenerate=False)
+        # This seems to be necessary for many PDF viewers to format the form values correctly.
+        # It may cause the viewer to show a "save changes" dialog even if the user doesn't make any changes.
+        writer.set_need_appearances_writer(True)
 
-    # This seems to be necessary for many PDF viewers to format the form values correctly.
-    # It may cause the viewer to show a "save changes" dialog even if the user doesn't make any changes.
-    writer.set_need_appearances_writer(True)
-    
-    with open(output_pdf_path, "wb") as f:
-        writer.write(f)
+        with open(output_pdf_path, "wb") as f:
+            writer.write(f)
+
+
+# Batch mode: fills the same form once per line of a JSON Lines file. Each line
+# is either a list in the field_values.json format, or an object with a
+# "fields" list and an optional "output" file name (relative to the output
+# directory). Without "output", files are named <input stem>-<line number>.pdf.
+# The form is parsed once per worker process and reused for every record.
+# A line that can't be parsed or a record with errors is reported and skipped;
+# the other records are still written.
+
+_batch_form = None
+
+
+def _init_batch_worker(input_pdf_path: str):
+    global _batch_form
+    monkeypatch_pydpf_method()
+    _batch_form = FormTemplate(input_pdf_path)
+
+
+def _fill_batch_record(record):
+    line_number, fields, output_pdf_path = record
+    try:
+        errors = _batch_form.validate(fields)
+        if not errors:
+            _batch_form.write(fields, output_pdf_path)
+    except KeyError as e:
+        errors = [f"ERROR: A field entry is missing {e}"]
+    except Exception as e:
+        errors = [f"ERROR: {e}"]
+    return line_number, output_pdf_path, errors
+
+
+# Returns (records, bad_lines). bad_lines are results in the same form as
+# _fill_batch_record's, for lines that are not valid records.
+def load_batch_records(records_jsonl_path: str, output_dir: str, stem: str):
+    records = []
+    bad_lines = []
+    with open(records_jsonl_path) as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                bad_lines.append((line_number, None, [f"ERROR: Invalid JSON: {e}"]))
+                continue
+            output_name = None
+            if isinstance(record, dict):
+                output_name = record.get("output")
+                record = record.get("fields")
+            if not isinstance(record, list):
+                bad_lines.append((line_number, None, ['ERROR: Expected a list of fields or an object with a "fields" list']))
+                continue
+            output_name = output_name or f"{stem}-{line_number:05d}.pdf"
+            records.append((line_number, record, os.path.join(output_dir, output_name)))
+    return records, bad_lines
+
+
+def fill_pdf_fields_batch(input_pdf_path: str, records_jsonl_path: str, output_dir: str, workers=None):
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(input_pdf_path))[0]
+    records, bad_lines = load_batch_records(records_jsonl_path, output_dir, stem)
+    print(f"Filling {len(records)} record(s) from {input_pdf_path}")
+    failures = _report_batch_results(bad_lines)
+
+    if workers == 1:
+        _init_batch_worker(input_pdf_path)
+        results = map(_fill_batch_record, records)
+        failures += _report_batch_results(results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(input_pdf_path,)) as executor:
+            results = executor.map(_fill_batch_record, records, chunksize=16)
+            failures += _report_batch_results(results)
+
+    print(f"Wrote {len(records) + len(bad_lines) - failures} PDF(s) to {output_dir}")
+    if failures:
+        print(f"Failed: {failures}")
+    return failures
+
+
+def _report_batch_results(results):
+    failures = 0
+    for line_number, output_pdf_path, errors in results:
+        if errors:
+            failures += 1
+            print(f"[line {line_number}] FAILED")
+            for err in errors:
+                print(f"    {err}")
+        else:
+            print(f"[line {line_number}] Wrote {output_pdf_path}")
+    return failures
 
 
 def validation_error_for_field_value(field_info, field_value):
@@ -92,6 +197,9 @@ def monkeypatch_pydpf_method():
     from pypdf.constants import FieldDictionaryAttributes
 
     original_get_inherited = DictionaryObject.get_inherited
+    # Batch workers call this too; only patch once per process.
+    if getattr(original_get_inherited, "_opt_patched", False):
+        return
 
     def patched_get_inherited(self, key: str, default = None):
         result = original_get_inherited(self, key, default)
@@ -100,12 +208,22 @@ def monkeypatch_pydpf_method():
                 result = [r[0] for r in result]
         return result
 
+    patched_get_inherited._opt_patched = True
     DictionaryObject.get_inherited = patched_get_inherited
 
 
 if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "--batch":
+        if len(sys.argv) not in (5, 6):
+            print("Usage: fill_fillable_fields.py --batch [input pdf] [records.jsonl] [output dir] [workers]")
+            sys.exit(1)
+        monkeypatch_pydpf_method()
+        workers = int(sys.argv[5]) if len(sys.argv) == 6 else None
+        failures = fill_pdf_fields_batch(sys.argv[2], sys.argv[3], sys.argv[4], workers)
+        sys.exit(1 if failures else 0)
     if len(sys.argv) != 4:
         print("Usage: fill_fillable_fields.py [input pdf] [field_values.json] [output pdf]")
+        print("       fill_fillable_fields.py --batch [input pdf] [records.jsonl] [output dir] [workers]")
         sys.exit(1)
     monkeypatch_pydpf_method()
     input_pdf = sys.argv[1]
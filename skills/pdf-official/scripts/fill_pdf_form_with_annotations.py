@@ -1,4 +1,5 @@
 import json
+import os
 import sys
 
 from pypdf import PdfReader, PdfWriter
@@ -31,78 +32,156 @@ def fill_pdf_form(input_pdf_path, fields_json_path, output_pdf_path):
     # `fields.json` format described in forms.md.
     with open(fields_json_path, "r") as f:
         fields_data = json.load(f)
-    
-    # Open the PDF
-    reader = PdfReader(input_pdf_path)
-    writer = PdfWriter()
-    
-    # Copy all pages to writer
-    writer.append(reader)
-    
-    # Get PDF dimensions for each page
-    pdf_dimensions = {}
-    for i, page in enumerate(reader.pages):
-        mediabox = page.mediabox
-        pdf_dimensions[i + 1] = [mediabox.width, mediabox.height]
-    
-    # Process each form field
-    annotations = []
-    for field in fields_data["form_fields"]:
-        page_num = field["page_number"]
-        
-        # Get page dimensions and transform coordinates.
-        page_info = next(p for p in fields_data["pages"] if p["page_number"] == page_num)
-        image_width = page_info["image_width"]
-        image_height = page_info["image_height"]
-        pdf_width, pdf_height = pdf_dimensions[page_num]
-        
-        transformed_entry_box = transform_coordinates(
-            field["entry_bounding_box"],
-            image_width, image_height,
-            pdf_width, pdf_height
-        )
-        
-        # Skip empty fields
-        if "entry_text" not in field or "text" not in field["entry_text"]:
-            continue
-        entry_text = field["entry_text"]
-        text = entry_text["text"]
-        if not text:
-            continue
-        
-        font_name = entry_text.get("font", "Arial")
-        font_size = str(entry_text.get("font_size", 14)) + "pt"
-        font_color = entry_text.get("font_color", "000000")
-
-        # Font size/color seems to not work reliably across viewers:
-        # https://github.com/py-pdf/pypdf/issues/2084
-        annotation = FreeText(
-            text=text,
-            rect=transformed_entry_box,
-            font=font_name,
-            font_size=font_size,
-            font_color=font_color,
-            border_color=None,
-            background_color=None,
-        )
-        annotations.append(annotation)
-        # page_number is 0-based for pypdf
-        writer.add_annotation(page_number=page_num - 1, annotation=annotation)
-        
-    # Save the filled PDF
-    with open(output_pdf_path, "wb") as output:
-        writer.write(output)
-    
+
+    template = AnnotationTemplate(input_pdf_path, fields_data)
+    annotation_count = template.fill(output_pdf_path)
+
     print(f"Successfully filled PDF form and saved to {output_pdf_path}")
-    print(f"Added {len(annotations)} text annotations")
+    print(f"Added {annotation_count} text annotations")
+
+
+class AnnotationTemplate:
+    """A PDF and fields.json layout that can be filled many times.
+
+    The PDF is read once (or an already open `reader` is used) and every
+    entry box is transformed to PDF coordinates once, grouped by page. Each
+    fill only builds the annotations and writes a copy of the document.
+    """
+
+    def __init__(self, input_pdf_path, fields_data, reader=None):
+        self.reader = reader or PdfReader(input_pdf_path)
+
+        image_sizes = {p["page_number"]: (p["image_width"], p["image_height"]) for p in fields_data["pages"]}
+
+        # page_number -> [(field, transformed entry box)], in fields.json order
+        self.fields_by_page = {}
+        self.fields_by_description = {}
+        page_transforms = {}
+        for field in fields_data["form_fields"]:
+            page_num = field["page_number"]
+            if page_num not in page_transforms:
+                if page_num not in image_sizes:
+                    raise ValueError(f"No entry in \"pages\" for page {page_num}")
+                mediabox = self.reader.pages[page_num - 1].mediabox
+                page_transforms[page_num] = (*image_sizes[page_num], mediabox.width, mediabox.height)
+            transformed_entry_box = transform_coordinates(field["entry_bounding_box"], *page_transforms[page_num])
+            self.fields_by_page.setdefault(page_num, []).append((field, transformed_entry_box))
+            self.fields_by_description.setdefault(field.get("description"), field)
+
+    def fill(self, output_pdf_path, texts=None):
+        """Write a filled copy and return the number of annotations added.
+
+        `texts` optionally maps field descriptions to the text to enter (a
+        string, or an object in the "entry_text" format), overriding the
+        entry_text in fields.json.
+        """
+        texts = texts or {}
+        writer = PdfWriter(clone_from=self.reader)
+
+        annotation_count = 0
+        for page_num, fields in self.fields_by_page.items():
+            page = writer.pages[page_num - 1]
+            for field, transformed_entry_box in fields:
+                entry_text = field.get("entry_text", {})
+                override = texts.get(field.get("description"))
+                if isinstance(override, dict):
+                    entry_text = {**entry_text, **override}
+                elif override is not None:
+                    entry_text = {**entry_text, "text": override}
+
+                # Skip empty fields
+                text = entry_text.get("text")
+                if not text:
+                    continue
+
+                font_name = entry_text.get("font", "Arial")
+                font_size = str(entry_text.get("font_size", 14)) + "pt"
+                font_color = entry_text.get("font_color", "000000")
+
+                # Font size/color seems to not work reliably across viewers:
+                # https://github.com/py-pdf/pypdf/issues/2084
+                annotation = FreeText(
+                    text=text,
+                    rect=transformed_entry_box,
+                    font=font_name,
+                    font_size=font_size,
+                    font_color=font_color,
+                    border_color=None,
+                    background_color=None,
+                )
+                writer.add_annotation(page_number=page, annotation=annotation)
+                annotation_count += 1
+
+        # Save the filled PDF
+        with open(output_pdf_path, "wb") as output:
+            writer.write(output)
+        return annotation_count
+
+
+def fill_pdf_form_batch(input_pdf_path, fields_json_path, records_jsonl_path, output_dir):
+    """Fill one template once per line of a JSON Lines file, in a single process.
+
+    Each line is an object with a "fields" object mapping field descriptions
+    to text, and an optional "output" file name (relative to output_dir).
+    Without "output", files are named <input stem>-<line number>.pdf.
+    Fields a record leaves out keep their entry_text from fields.json, so
+    the layout's own text acts as a default for every record. A line that
+    can't be read or filled is reported and skipped.
+    Returns the number of records that failed.
+    """
+    with open(fields_json_path, "r") as f:
+        fields_data = json.load(f)
+    template = AnnotationTemplate(input_pdf_path, fields_data)
+
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(input_pdf_path))[0]
+
+    written = 0
+    failures = 0
+    with open(records_jsonl_path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                texts = record.get("fields", {}) if isinstance(record, dict) else None
+                if not isinstance(texts, dict):
+                    raise ValueError('expected an object with a "fields" object')
+                unknown = [d for d in texts if d not in template.fields_by_description]
+                if unknown:
+                    raise ValueError(f"no fields with description {unknown}")
+                output_pdf_path = os.path.join(output_dir, record.get("output") or f"{stem}-{line_number:05d}.pdf")
+                annotation_count = template.fill(output_pdf_path, texts)
+            except json.JSONDecodeError as e:
+                failures += 1
+                print(f"[line {line_number}] FAILED: invalid JSON: {e}")
+                continue
+            except Exception as e:
+                failures += 1
+                print(f"[line {line_number}] FAILED: {e}")
+                continue
+            written += 1
+            print(f"[line {line_number}] Saved {output_pdf_path} ({annotation_count} text annotations)")
+
+    print(f"Filled {written} PDF(s) in {output_dir}")
+    if failures:
+        print(f"Failed: {failures}")
+    return failures
 
 
 if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "--batch":
+        if len(sys.argv) != 6:
+            print("Usage: fill_pdf_form_with_annotations.py --batch [input pdf] [fields.json] [records.jsonl] [output dir]")
+            sys.exit(1)
+        failures = fill_pdf_form_batch(*sys.argv[2:6])
+        sys.exit(1 if failures else 0)
     if len(sys.argv) != 4:
         print("Usage: fill_pdf_form_with_annotations.py [input pdf] [fields.json] [output pdf]")
+        print("       fill_pdf_form_with_annotations.py --batch [input pdf] [fields.json] [records.jsonl] [output dir]")
         sys.exit(1)
     input_pdf = sys.argv[1]
     fields_json = sys.argv[2]
     output_pdf = sys.argv[3]
     
-    fill_pdf_form(input_pdf, fields_json, output_pdf)
\ No newline at end of file
+    fill_pdf_form(input_pdf, fields_json, output_pdf)
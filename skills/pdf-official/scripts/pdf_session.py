@@ -0,0 +1,166 @@
+import cmd
+import json
+import shlex
+import sys
+
+from pypdf import PdfReader
+
+from convert_pdf_to_images import convert
+from extract_form_field_info import get_field_info, get_field_info_cached
+from fill_fillable_fields import FormTemplate, monkeypatch_pydpf_method
+from fill_pdf_form_with_annotations import AnnotationTemplate
+
+
+# Opens a PDF once and shares the parsed document between the form scripts.
+# Use it as a library:
+#
+#   session = PdfSession("form.pdf")
+#   if session.has_fillable_fields:
+#       fields = session.field_info
+#       session.fill_fields(field_values, "filled.pdf")
+#
+# or run it as an interactive shell for multi-step form work (see forms.md):
+#
+#   python scripts/pdf_session.py form.pdf
+
+
+class PdfSession:
+    def __init__(self, pdf_path, cache_dir=None):
+        self.pdf_path = pdf_path
+        # Optional directory for caching field info across runs (see extract_form_field_info.py).
+        self.cache_dir = cache_dir
+        self.reader = PdfReader(pdf_path)
+        self._pages = {}
+        self._annotations = {}
+        self._field_info = None
+        self._form_template = None
+
+    @property
+    def page_count(self):
+        return len(self.reader.pages)
+
+    # Pages are 1-based, as in fields.json and field_info.json.
+    def page(self, page_number):
+        if page_number not in self._pages:
+            self._pages[page_number] = self.reader.pages[page_number - 1]
+        return self._pages[page_number]
+
+    def mediabox(self, page_number):
+        mediabox = self.page(page_number).mediabox
+        return mediabox.width, mediabox.height
+
+    def annotations(self, page_number):
+        if page_number not in self._annotations:
+            page = self.page(page_number)
+            annots = page['/Annots'] if '/Annots' in page else []
+            self._annotations[page_number] = [a.get_object() for a in annots]
+        return self._annotations[page_number]
+
+    # Extracts field_info once and reuses it for `fields` and `fill`.
+    @property
+    def has_fillable_fields(self):
+        return bool(self.field_info)
+
+    @property
+    def field_info(self):
+        if self._field_info is None:
+            if self.cache_dir:
+                self._field_info = get_field_info_cached(self.pdf_path, self.cache_dir)
+            else:
+                self._field_info = get_field_info(self.reader)
+        return self._field_info
+
+    def convert_to_images(self, output_dir, max_dim=1000):
+        convert(self.pdf_path, output_dir, max_dim, reader=self.reader)
+
+    # Returns the validation errors; the output is only written if there are none.
+    def fill_fields(self, fields, output_pdf_path):
+        if self._form_template is None:
+            monkeypatch_pydpf_method()
+            self._form_template = FormTemplate(self.pdf_path, reader=self.reader, field_info=self.field_info)
+        errors = self._form_template.validate(fields)
+        if not errors:
+            self._form_template.write(fields, output_pdf_path)
+        return errors
+
+    # Returns the number of annotations added.
+    def fill_with_annotations(self, fields_data, output_pdf_path):
+        template = AnnotationTemplate(self.pdf_path, fields_data, reader=self.reader)
+        return template.fill(output_pdf_path)
+
+
+class PdfShell(cmd.Cmd):
+    intro = "Type help or ? to list commands."
+
+    def __init__(self, session):
+        super().__init__()
+        self.session = session
+        self.prompt = f"pdf ({session.pdf_path})> "
+
+    def onecmd(self, line):
+        # Keep the shell alive on bad input or missing files.
+        try:
+            return super().onecmd(line)
+        except Exception as e:
+            print(f"ERROR: {e}")
+
+    def do_info(self, arg):
+        "info: page count, page sizes and whether the PDF has fillable fields"
+        print(f"{self.session.page_count} pages")
+        for page_number in range(1, self.session.page_count + 1):
+            width, height = self.session.mediabox(page_number)
+            print(f"  page {page_number}: {width} x {height}, {len(self.session.annotations(page_number))} annotations")
+        self.do_check("")
+
+    def do_check(self, arg):
+        "check: whether the PDF has fillable form fields"
+        if self.session.has_fillable_fields:
+            print("This PDF has fillable form fields")
+        else:
+            print("This PDF does not have fillable form fields; you will need to visually determine where to enter data")
+
+    def do_fields(self, arg):
+        "fields <output json>: write the fillable field info (same as extract_form_field_info.py)"
+        (json_output_path,) = shlex.split(arg)
+        with open(json_output_path, "w") as f:
+            json.dump(self.session.field_info, f, indent=2)
+        print(f"Wrote {len(self.session.field_info)} fields to {json_output_path}")
+
+    def do_images(self, arg):
+        "images <output directory> [max dim]: render pages to PNG (same as convert_pdf_to_images.py)"
+        args = shlex.split(arg)
+        self.session.convert_to_images(args[0], *(int(a) for a in args[1:2]))
+
+    def do_fill(self, arg):
+        "fill <field_values.json> <output pdf>: fill fillable fields (same as fill_fillable_fields.py)"
+        fields_json_path, output_pdf_path = shlex.split(arg)
+        with open(fields_json_path) as f:
+            fields = json.load(f)
+        errors = self.session.fill_fields(fields, output_pdf_path)
+        for err in errors:
+            print(err)
+        if not errors:
+            print(f"Saved {output_pdf_path}")
+
+    def do_annotate(self, arg):
+        "annotate <fields.json> <output pdf>: add text annotations (same as fill_pdf_form_with_annotations.py)"
+        fields_json_path, output_pdf_path = shlex.split(arg)
+        with open(fields_json_path) as f:
+            fields_data = json.load(f)
+        annotation_count = self.session.fill_with_annotations(fields_data, output_pdf_path)
+        print(f"Successfully filled PDF form and saved to {output_pdf_path}")
+        print(f"Added {annotation_count} text annotations")
+
+    def do_quit(self, arg):
+        "quit: exit the shell"
+        return True
+
+    do_EOF = do_quit
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: pdf_session.py [input pdf] [field info cache dir]")
+        sys.exit(1)
+    session = PdfSession(sys.argv[1], sys.argv[2] if len(sys.argv) == 3 else None)
+    PdfShell(session).cmdloop()
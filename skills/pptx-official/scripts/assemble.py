@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Assemble a presentation from slides of several source presentations.
+
+Usage:
+    python assemble.py output.pptx library-a.pptx:0,3 library-b.pptx:12 library-a.pptx:7
+
+Each argument after the output path is SOURCE:INDICES, where INDICES is a
+comma-separated list of 0-based slide indices. Slides appear in the output in
+the order given. The first source provides slide size, theme and masters.
+
+Every source is opened once. Identical slide masters, layouts and media are
+stored only once in the output, matched by content hash, and only the layouts
+actually used by the assembled slides are imported.
+
+Speaker notes are copied with their slides, using the output's notes master.
+Links from one slide to another (hyperlinks, action buttons) are pointed at
+the linked slide's copy when it is part of the output, and removed otherwise.
+Comments are not copied.
+"""
+
+import argparse
+import hashlib
+import sys
+from copy import deepcopy
+from pathlib import Path
+
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import Part, XmlPart
+from pptx.oxml.ns import qn
+from rearrange import (
+    R_NS,
+    PER_SLIDE_RELTYPES,
+    SKIPPED_RELTYPES,
+    partname_template,
+    remap_rel_ids,
+    rewrite_slide_list,
+)
+
+# Slide master and layout IDs share one ID space starting at 2^31
+MIN_MASTER_OR_LAYOUT_ID = 2147483648
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Assemble a presentation from slides of several source presentations.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python assemble.py output.pptx intro.pptx:0 library.pptx:12,14 outro.pptx:0
+    Creates output.pptx from slide 0 of intro.pptx, slides 12 and 14 of
+    library.pptx and slide 0 of outro.pptx
+
+  python assemble.py output.pptx library.pptx:3 other.pptx:1 library.pptx:3
+    The same slide may appear more than once
+
+Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
+        """,
+    )
+
+    parser.add_argument("output", help="Path for output PPTX file")
+    parser.add_argument(
+        "slides",
+        nargs="+",
+        help="Slides to include as SOURCE:INDICES (comma-separated, 0-based)",
+    )
+
+    args = parser.parse_args()
+
+    # Parse the slide references
+    try:
+        slide_refs = parse_slide_refs(args.slides)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # Check sources exist
+    for source in {source for source, _ in slide_refs}:
+        if not Path(source).exists():
+            print(f"Error: Source file not found: {source}")
+            sys.exit(1)
+
+    # Create output directory if needed
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        assemble_presentation(slide_refs, output_path)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error processing presentation: {e}")
+        sys.exit(1)
+
+
+def parse_slide_refs(specs):
+    """Parse SOURCE:INDICES arguments into a list of (source_path, slide_index)."""
+    slide_refs = []
+    for spec in specs:
+        source, sep, indices = spec.rpartition(":")
+        if not sep or not source:
+            raise ValueError(
+                f"Invalid slide reference '{spec}'. Use SOURCE:INDICES (e.g., deck.pptx:0,3)"
+            )
+        try:
+            slide_refs.extend((source, int(x.strip())) for x in indices.split(","))
+        except ValueError:
+            raise ValueError(
+                f"Invalid slide indices in '{spec}'. Use comma-separated integers"
+            )
+    return slide_refs
+
+
+def content_hash(*blobs):
+    """SHA-256 over one or more byte strings."""
+    digest = hashlib.sha256()
+    for blob in blobs:
+        digest.update(blob)
+    return digest.hexdigest()
+
+
+class SlideImporter:
+    """
+    Imports slides into a target presentation, from the target itself or from
+    other presentations.
+
+    Parts are imported at most once per source part. Masters, layouts and
+    binary parts (images, media) are matched against what the target already
+    holds by content hash, so identical copies are stored once.
+    """
+
+    def __init__(self, prs):
+        self.prs = prs
+        self.package = prs.part.package
+
+        # source part -> imported target part
+        self._imported = {}
+
+        # source slide part -> first imported copy, for slide-to-slide links
+        self._slide_copies = {}
+
+        # Partnames in use, so new parts never collide even before they are
+        # reachable from the package root
+        self._partnames = {part.partname for part in self.package.iter_parts()}
+
+        # Content-hash indexes of what the target already holds
+        self._part_keys = {}
+        self._master_keys = {}
+        self._blob_index = {}
+        self._master_index = {}
+        self._layout_index = {}
+        for part in self.package.iter_parts():
+            if not isinstance(part, XmlPart):
+                self._blob_index.setdefault(self._blob_key(part), part)
+        for master in prs.slide_masters:
+            self._master_index.setdefault(self._master_key(master.part), master.part)
+            for layout in master.slide_layouts:
+                self._layout_index.setdefault(
+                    self._layout_key(layout.part), layout.part
+                )
+
+        existing_ids = [
+            int(el.get("id"))
+            for el in prs.part._element.iter(qn("p:sldMasterId"))
+        ] + [
+            int(el.get("id"))
+            for master in prs.slide_masters
+            for el in master.part._element.iter(qn("p:sldLayoutId"))
+        ]
+        self._next_master_or_layout_id = max(
+            existing_ids + [MIN_MASTER_OR_LAYOUT_ID - 1]
+        ) + 1
+
+    # --- content keys ---
+
+    @staticmethod
+    def _blob_key(part):
+        return part.content_type, content_hash(part.blob)
+
+    def _part_key(self, part):
+        """Hash of `part` and, recursively, of everything it relates to."""
+        if part not in self._part_keys:
+            # Placeholder in case the parts relate to each other in a cycle
+            self._part_keys[part] = ""
+            self._part_keys[part] = content_hash(part.blob, *self._rels_key(part))
+        return self._part_keys[part]
+
+    def _rels_key(self, part, skip_reltypes=()):
+        """One entry per relationship: rId, type and the target's content."""
+        entries = []
+        for rId, rel in sorted(part.rels.items()):
+            if rel.reltype in skip_reltypes:
+                continue
+            target = rel.target_ref if rel.is_external else self._part_key(rel.target_part)
+            entries.append(f"{rId} {rel.reltype} {target}".encode())
+        return entries
+
+    def _master_key(self, master_part):
+        if master_part not in self._master_keys:
+            # Layout references differ between otherwise identical masters
+            element = deepcopy(master_part._element)
+            for lst in element.findall(qn("p:sldLayoutIdLst")):
+                element.remove(lst)
+            # The theme and images count too: identical XML can show a
+            # different logo through the same rId
+            self._master_keys[master_part] = content_hash(
+                serialize_part_xml(element),
+                *self._rels_key(master_part, {RT.SLIDE_LAYOUT}),
+            )
+        return self._master_keys[master_part]
+
+    def _layout_key(self, layout_part):
+        master_part = layout_part.part_related_by(RT.SLIDE_MASTER)
+        return self._master_key(master_part), content_hash(
+            layout_part.blob, *self._rels_key(layout_part, {RT.SLIDE_MASTER})
+        )
+
+    # --- part creation ---
+
+    def _allocate_partname(self, part):
+        template = partname_template(part.partname)
+        n = 1
+        while (template % n) in self._partnames:
+            n += 1
+        partname = type(part.partname)(template % n)
+        self._partnames.add(partname)
+        return partname
+
+    def _new_part_like(self, part, element=None):
+        partname = self._allocate_partname(part)
+        if isinstance(part, XmlPart):
+            if element is None:
+                element = deepcopy(part._element)
+            return type(part)(partname, part.content_type, self.package, element)
+        return Part(partname, part.content_type, self.package, blob=part.blob)
+
+    def _next_id(self):
+        next_id = self._next_master_or_layout_id
+        self._next_master_or_layout_id += 1
+        return str(next_id)
+
+    def _copy_rels(self, source, target, skip_reltypes=()):
+        """Import every relationship target of `source` and relate it to `target`."""
+        rId_map = {}
+        for rId, rel in source.rels.items():
+            if rel.reltype in SKIPPED_RELTYPES or rel.reltype in skip_reltypes:
+                continue
+            if rel.is_external:
+                rId_map[rId] = target.rels.get_or_add_ext_rel(
+                    rel.reltype, rel.target_ref
+                )
+            else:
+                imported = self._import_related(rel.target_part, rel.reltype)
+                rId_map[rId] = target.rels.get_or_add(rel.reltype, imported)
+
+        if isinstance(target, XmlPart):
+            remap_rel_ids(target._element, rId_map)
+
+    def _clone(self, part):
+        """Copy `part` and, recursively, everything it relates to."""
+        clone = self._new_part_like(part)
+        self._copy_rels(part, clone)
+        return clone
+
+    # --- importing ---
+
+    def _import_related(self, part, reltype):
+        """Return the target-package part to use for a slide's related `part`."""
+        if reltype == RT.SLIDE_LAYOUT:
+            return self.import_layout(part)
+        if reltype == RT.SLIDE_MASTER:
+            return self.import_master(part)
+        if reltype == RT.SLIDE:
+            # A link to another slide; link_slides() points it at the right
+            # slide (or removes it) once the whole deck is assembled
+            return part
+        if reltype in PER_SLIDE_RELTYPES:
+            # Charts, SmartArt data and embedded objects are never shared
+            return self._clone(part)
+        if part.package is self.package:
+            return part
+        if part in self._imported:
+            return self._imported[part]
+
+        if isinstance(part, XmlPart):
+            imported = self._clone(part)
+        else:
+            key = self._blob_key(part)
+            imported = self._blob_index.get(key)
+            if imported is None:
+                imported = self._new_part_like(part)
+                self._blob_index[key] = imported
+        self._imported[part] = imported
+        return imported
+
+    def import_master(self, master_part):
+        """Return the target master matching `master_part`, importing it if needed.
+
+        Imported masters start without layouts; layouts are added as slides
+        that use them are imported.
+        """
+        if master_part.package is self.package:
+            return master_part
+        if master_part in self._imported:
+            return self._imported[master_part]
+
+        key = self._master_key(master_part)
+        imported = self._master_index.get(key)
+        if imported is None:
+            element = deepcopy(master_part._element)
+            for lst in element.findall(qn("p:sldLayoutIdLst")):
+                element.remove(lst)
+            imported = self._new_part_like(master_part, element)
+
+            rId = self.prs.part.relate_to(imported, RT.SLIDE_MASTER)
+            entry = self.prs.part._element.get_or_add_sldMasterIdLst()._add_sldMasterId(
+                rId=rId
+            )
+            entry.set("id", self._next_id())
+
+            self._imported[master_part] = imported
+            self._master_index[key] = imported
+            self._copy_rels(master_part, imported, skip_reltypes={RT.SLIDE_LAYOUT})
+        else:
+            self._imported[master_part] = imported
+        return imported
+
+    def import_layout(self, layout_part):
+        """Return the target layout matching `layout_part`, importing it if needed."""
+        if layout_part.package is self.package:
+            return layout_part
+        if layout_part in self._imported:
+            return self._imported[layout_part]
+
+        key = self._layout_key(layout_part)
+        imported = self._layout_index.get(key)
+        if imported is None:
+            master = self.import_master(layout_part.part_related_by(RT.SLIDE_MASTER))
+            imported = self._new_part_like(layout_part)
+
+            rId = master.relate_to(imported, RT.SLIDE_LAYOUT)
+            entry = master._element.get_or_add_sldLayoutIdLst()._add_sldLayoutId(
+                rId=rId
+            )
+            entry.set("id", self._next_id())
+
+            self._imported[layout_part] = imported
+            self._layout_index[key] = imported
+            self._copy_rels(layout_part, imported)
+        else:
+            self._imported[layout_part] = imported
+        return imported
+
+    def import_slide(self, slide):
+        """Append a copy of `slide` (from any presentation) and return its sldId."""
+        source_part = slide.part
+        new_part = self._new_part_like(source_part)
+        rId = self.prs.part.relate_to(new_part, RT.SLIDE)
+        self._copy_rels(source_part, new_part)
+        self._slide_copies.setdefault(source_part, new_part)
+        if slide.has_notes_slide:
+            self._import_notes(slide.notes_slide.part, new_part)
+        return self.prs.slides._sldIdLst.add_sldId(rId)
+
+    def _import_notes(self, source_notes_part, slide_part):
+        """Give `slide_part` a copy of the speaker notes in `source_notes_part`.
+
+        The notes slide is created from the target's notes master and then
+        takes the source's shapes, so it never refers to the source's master.
+        """
+        has_notes_master = any(
+            rel.reltype == RT.NOTES_MASTER for rel in self.prs.part.rels.values()
+        )
+        # python-pptx names these parts itself, so record their partnames
+        notes_part = slide_part.slide.notes_slide.part
+        self._partnames.add(notes_part.partname)
+        if not has_notes_master:
+            # The first notes slide also created a notes master and its theme
+            self._partnames.update(part.partname for part in self.package.iter_parts())
+        element = notes_part._element
+        element.replace(element.cSld, deepcopy(source_notes_part._element.cSld))
+        self._copy_rels(
+            source_notes_part, notes_part, skip_reltypes={RT.SLIDE, RT.NOTES_MASTER}
+        )
+
+    def link_slides(self, slide_parts):
+        """Fix up links between slides once the deck is assembled.
+
+        A link to a slide in `slide_parts` is kept, a link to a slide that was
+        imported points at its copy, and any other link is removed. Returns
+        the number of links removed.
+        """
+        in_deck = set(slide_parts)
+        removed = 0
+        for part in slide_parts:
+            for rId, rel in list(part.rels.items()):
+                if rel.reltype != RT.SLIDE or rel.is_external:
+                    continue
+                target = rel.target_part
+                if target in in_deck:
+                    continue
+                target = self._slide_copies.get(target)
+                if target in in_deck:
+                    new_rId = part.relate_to(target, RT.SLIDE)
+                    remap_rel_ids(part._element, {rId: new_rId})
+                else:
+                    remove_rel_references(part._element, rId)
+                    removed += 1
+                part.drop_rel(rId)
+        return removed
+
+
+# Elements that only exist to hold a link
+LINK_TAGS = {qn("a:hlinkClick"), qn("a:hlinkHover"), qn("a:hlinkMouseOver")}
+
+
+def remove_rel_references(element, rId):
+    """Remove the link elements (or bare r:* attributes) that use `rId`."""
+    for el in list(element.iter()):
+        for attr, value in list(el.attrib.items()):
+            if attr.startswith(R_NS) and value == rId:
+                if el.tag in LINK_TAGS and el.getparent() is not None:
+                    el.getparent().remove(el)
+                    break
+                del el.attrib[attr]
+
+
+def assemble_presentation(slide_refs, output_path):
+    """
+    Create a presentation from slides of several source presentations.
+
+    Args:
+        slide_refs: List of (source_path, slide_index) pairs, in output order
+        output_path: Path for output PPTX file
+    """
+    if not slide_refs:
+        raise ValueError("No slides given")
+
+    # Open each source once; the first one is the base for the output
+    sources = {}
+    for source, _ in slide_refs:
+        key = str(Path(source).resolve())
+        if key not in sources:
+            print(f"Opening {source}...")
+            sources[key] = Presentation(source)
+    base_key = str(Path(slide_refs[0][0]).resolve())
+    prs = sources[base_key]
+
+    # Validate indices
+    for source, idx in slide_refs:
+        total_slides = len(sources[str(Path(source).resolve())].slides)
+        if idx < 0 or idx >= total_slides:
+            raise ValueError(
+                f"Slide index {idx} out of range for {source} (0-{total_slides - 1})"
+            )
+
+    importer = SlideImporter(prs)
+    base_sld_ids = list(prs.slides._sldIdLst)
+    used_base_slides = set()
+
+    print(f"Assembling {len(slide_refs)} slides from {len(sources)} source(s)...")
+    final_sld_ids = []
+    for i, (source, idx) in enumerate(slide_refs):
+        key = str(Path(source).resolve())
+        if key == base_key and idx not in used_base_slides:
+            # First use of a base slide: keep the original
+            final_sld_ids.append(base_sld_ids[idx])
+            used_base_slides.add(idx)
+            print(f"  [{i}] Using original slide {idx} of {source}")
+        else:
+            final_sld_ids.append(importer.import_slide(sources[key].slides[idx]))
+            print(f"  [{i}] Imported slide {idx} of {source}")
+
+    # Rewrite the slide list once, dropping unused base slides
+    removed = rewrite_slide_list(prs, final_sld_ids)
+    print(f"\nRemoved {removed} unused slides from {slide_refs[0][0]}")
+
+    dropped_links = importer.link_slides([slide.part for slide in prs.slides])
+    if dropped_links:
+        print(f"Removed {dropped_links} links to slides that are not in the output")
+
+    prs.save(output_path)
+    print(f"\nSaved assembled presentation to: {output_path}")
+    print(f"Final presentation has {len(prs.slides)} slides")
+
+
+if __name__ == "__main__":
+    main()
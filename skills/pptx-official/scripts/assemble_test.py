@@ -0,0 +1,99 @@
+import io
+import shutil
+import tempfile
+import unittest
+import zipfile
+from collections import Counter
+from pathlib import Path
+
+from PIL import Image
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from assemble import assemble_presentation
+
+
+def png(color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestAssemblePresentation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def make_deck(self, name, slide_count=2, notes=False, master_name=None, logo=None):
+        """Save a deck whose slides are titled "<name> <index>"."""
+        prs = Presentation()
+        master = prs.slide_master
+        if master_name:
+            # A distinct master and theme
+            master._element.cSld.set("name", master_name)
+            theme = master.part.part_related_by(RT.THEME)
+            theme._blob = theme.blob.replace(b'name="Office Theme"', f'name="{master_name}"'.encode())
+        if logo:
+            # Same master XML and rId in every deck, different image
+            master.part.get_or_add_image_part(io.BytesIO(logo))
+        for i in range(slide_count):
+            slide = prs.slides.add_slide(prs.slide_layouts[5])
+            slide.shapes.title.text = f"{name} {i}"
+            if notes:
+                slide.notes_slide.notes_text_frame.text = f"notes {name} {i}"
+        path = self.tmp / f"{name}.pptx"
+        prs.save(path)
+        return str(path)
+
+    def assemble(self, slide_refs):
+        output = self.tmp / "out.pptx"
+        assemble_presentation(slide_refs, output)
+        return output
+
+    def test_notes_from_several_sources(self):
+        # The output gets its notes master from the first imported notes
+        # slide, before the masters and themes of later decks are imported
+        a = self.make_deck("A")
+        b = self.make_deck("B", notes=True, master_name="B")
+        c = self.make_deck("C", notes=True, master_name="C")
+        output = self.assemble([(a, 0), (b, 0), (c, 1), (b, 1)])
+
+        with zipfile.ZipFile(output) as zf:
+            duplicates = [name for name, n in Counter(zf.namelist()).items() if n > 1]
+        self.assertEqual(duplicates, [])
+
+        prs = Presentation(output)
+        self.assertEqual([s.shapes.title.text for s in prs.slides], ["A 0", "B 0", "C 1", "B 1"])
+        self.assertFalse(prs.slides[0].has_notes_slide)
+        self.assertEqual(
+            [s.notes_slide.notes_text_frame.text for s in list(prs.slides)[1:]],
+            ["notes B 0", "notes C 1", "notes B 1"],
+        )
+        self.assertEqual(len(prs.slide_masters), 3)
+
+    def test_identical_masters_are_shared(self):
+        a = self.make_deck("A")
+        b = self.make_deck("B")
+        prs = Presentation(self.assemble([(a, 0), (b, 0)]))
+        self.assertEqual(len(prs.slide_masters), 1)
+
+    def test_masters_with_different_images_are_kept_apart(self):
+        red, blue = png("red"), png("blue")
+        a = self.make_deck("A", logo=red)
+        b = self.make_deck("B", logo=blue)
+        prs = Presentation(self.assemble([(a, 0), (b, 0)]))
+
+        self.assertEqual(len(prs.slide_masters), 2)
+        logos = []
+        for slide in prs.slides:
+            master = slide.slide_layout.slide_master.part
+            logos.append([rel.target_part.blob for rel in master.rels.values() if rel.reltype == RT.IMAGE])
+        self.assertEqual(logos, [[red], [blue]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,7 @@ This module provides functionality to:
 Classes:
     ParagraphData: Represents a text paragraph with formatting
     ShapeData: Represents a shape with position and text content
+    DeckSession: Opens a presentation once and exposes lazily computed analysis
 
 Main Functions:
     extract_text_inventory: Extract all text from a presentation
@@ -27,11 +28,13 @@ import json
 import platform
 import sys
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
+from pptx.enum.dml import MSO_FILL
 from pptx.enum.text import PP_ALIGN
 from pptx.shapes.base import BaseShape
 
@@ -174,8 +177,13 @@ class ParagraphData:
                 if hasattr(paragraph, "level"):
                     self.level = paragraph.level
 
-        # Add alignment if not LEFT (default)
-        if hasattr(paragraph, "alignment") and paragraph.alignment is not None:
+        # Add alignment if not LEFT (default). `alignment` adds an empty
+        # <a:pPr/> when none exists, so only read it when pPr is present.
+        if (
+            paragraph._p.pPr is not None
+            and hasattr(paragraph, "alignment")
+            and paragraph.alignment is not None
+        ):
             alignment_map = {
                 PP_ALIGN.CENTER: "CENTER",
                 PP_ALIGN.RIGHT: "RIGHT",
@@ -190,10 +198,12 @@ class ParagraphData:
         if hasattr(paragraph, "space_after") and paragraph.space_after:
             self.space_after = paragraph.space_after.pt
 
-        # Extract font properties from first run
+        # Extract font properties from first run. Only read an existing rPr:
+        # `run.font` adds an empty <a:rPr/> and `font.color` turns the fill into
+        # <a:solidFill/>, which would modify the presentation being inventoried.
         if paragraph.runs:
             first_run = paragraph.runs[0]
-            if hasattr(first_run, "font"):
+            if first_run._r.rPr is not None:
                 font = first_run.font
                 if font.name:
                     self.font_name = font.name
@@ -206,18 +216,20 @@ class ParagraphData:
                 if font.underline is not None:
                     self.underline = font.underline
 
-                # Handle color - both RGB and theme colors
-                try:
-                    # Try RGB color first
-                    if font.color.rgb:
-                        self.color = str(font.color.rgb)
-                except (AttributeError, TypeError):
-                    # Fall back to theme color
+                # Handle color - both RGB and theme colors (solid fills only,
+                # since anything else has no color to report)
+                if font.fill.type == MSO_FILL.SOLID:
                     try:
-                        if font.color.theme_color:
-                            self.theme_color = font.color.theme_color.name
+                        # Try RGB color first
+                        if font.color.rgb:
+                            self.color = str(font.color.rgb)
                     except (AttributeError, TypeError):
-                        pass
+                        # Fall back to theme color
+                        try:
+                            if font.color.theme_color:
+                                self.theme_color = font.color.theme_color.name
+                        except (AttributeError, TypeError):
+                            pass
 
         # Add line spacing if set
         if hasattr(paragraph, "line_spacing") and paragraph.line_spacing is not None:
@@ -277,6 +289,7 @@ class ShapeData:
         return int(inches * dpi)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_font_path(font_name: str) -> Optional[str]:
         """Get the font file path for a given font name.
 
@@ -342,6 +355,21 @@ class ShapeData:
 
         return None
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def load_font(font_name: str, font_size: int) -> Any:
+        """Load a PIL font for text measurement, cached per (name, size).
+
+        Falls back to PIL's default font if the font file cannot be found.
+        """
+        font_path = ShapeData.get_font_path(font_name)
+        if font_path:
+            try:
+                return ImageFont.truetype(font_path, size=font_size)
+            except Exception:
+                pass
+        return ImageFont.load_default()
+
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
         """Get slide dimensions from slide object.
@@ -461,9 +489,9 @@ class ShapeData:
             str, float
         ] = {}  # Dict of shape_id -> overlap area in sq inches
         self.warnings: List[str] = []
-        self._estimate_frame_overflow()
+        self.frame_overflow_bottom = self.measure_frame_overflow()
         self._calculate_slide_overflow()
-        self._detect_bullet_issues()
+        self.warnings.extend(self.find_bullet_issues())
 
     @property
     def paragraphs(self) -> List[ParagraphData]:
@@ -559,19 +587,26 @@ class ShapeData:
 
         return wrapped
 
-    def _estimate_frame_overflow(self) -> None:
-        """Estimate if text overflows the shape bounds using PIL text measurement."""
+    def measure_frame_overflow(self) -> Optional[float]:
+        """Estimate if text overflows the shape bounds using PIL text measurement.
+
+        Measures the shape's current text without changing this ShapeData, so it
+        can be used to re-check a shape after its text was replaced.
+
+        Returns:
+            Bottom overflow in inches, or None if the text fits
+        """
         if not self.shape or not hasattr(self.shape, "text_frame"):
-            return
+            return None
 
         text_frame = self.shape.text_frame  # type: ignore
         if not text_frame or not text_frame.paragraphs:
-            return
+            return None
 
         # Get usable dimensions after accounting for margins
         usable_width_px, usable_height_px = self._get_usable_dimensions(text_frame)
         if usable_width_px <= 0 or usable_height_px <= 0:
-            return
+            return None
 
         # Set up PIL for text measurement
         dummy_img = Image.new("RGB", (1, 1))
@@ -593,15 +628,7 @@ class ShapeData:
             font_name = para_data.font_name or "Arial"
             font_size = int(para_data.font_size or default_font_size)
 
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            font = self.load_font(font_name, font_size)
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
@@ -634,7 +661,8 @@ class ShapeData:
             overflow_px = total_height_px - usable_height_px
             overflow_inches = round(overflow_px / 96.0, 2)
             if overflow_inches > 0.05:  # Only report significant overflows
-                self.frame_overflow_bottom = overflow_inches
+                return overflow_inches
+        return None
 
     def _calculate_slide_overflow(self) -> None:
         """Calculate if shape overflows the slide boundaries."""
@@ -657,14 +685,18 @@ class ShapeData:
             if overflow_inches > 0.01:  # Only report significant overflows
                 self.slide_overflow_bottom = overflow_inches
 
-    def _detect_bullet_issues(self) -> None:
-        """Detect bullet point formatting issues in paragraphs."""
+    def find_bullet_issues(self) -> List[str]:
+        """Detect bullet point formatting issues in the shape's current text.
+
+        Returns:
+            List of warning messages (empty if there are no issues)
+        """
         if not self.shape or not hasattr(self.shape, "text_frame"):
-            return
+            return []
 
         text_frame = self.shape.text_frame  # type: ignore
         if not text_frame or not text_frame.paragraphs:
-            return
+            return []
 
         # Common bullet symbols that indicate manual bullets
         bullet_symbols = ["•", "●", "○"]
@@ -673,10 +705,8 @@ class ShapeData:
             text = paragraph.text.strip()
             # Check for manual bullet symbols
             if text and any(text.startswith(symbol + " ") for symbol in bullet_symbols):
-                self.warnings.append(
-                    "manual_bullet_symbol: use proper bullet formatting"
-                )
-                break
+                return ["manual_bullet_symbol: use proper bullet formatting"]
+        return []
 
     @property
     def has_any_issues(self) -> bool:
@@ -741,8 +771,13 @@ class ShapeData:
 
 def is_valid_shape(shape: BaseShape) -> bool:
     """Check if a shape contains meaningful text content."""
-    # Must have a text frame with content
-    if not hasattr(shape, "text_frame") or not shape.text_frame:  # type: ignore
+    # Must have a text frame with content. Check for an existing txBody first,
+    # since `text_frame` adds an empty one to autoshapes that lack it.
+    if not hasattr(shape, "text_frame"):
+        return False
+    if getattr(shape.element, "txBody", None) is None:
+        return False
+    if not shape.text_frame:  # type: ignore
         return False
 
     text = shape.text_frame.text.strip()  # type: ignore
@@ -916,6 +951,9 @@ def extract_text_inventory(
 ) -> InventoryData:
     """Extract text content from all slides in a PowerPoint presentation.
 
+    Extraction only reads the presentation; it never adds or changes XML, so
+    it can be run on a presentation that is about to be saved.
+
     Args:
         pptx_path: Path to the PowerPoint file
         prs: Optional Presentation object to use. If not provided, will load from pptx_path.
@@ -974,6 +1012,61 @@ def extract_text_inventory(
     return inventory
 
 
+class DeckSession:
+    """A presentation opened once, with analysis results computed on demand.
+
+    Scripts that need several views of the same deck (hidden slides, slide
+    dimensions, text inventory) should share one session instead of loading
+    the package repeatedly.
+    """
+
+    def __init__(self, pptx_path: Path, prs: Optional[Any] = None):
+        """Initialize the session.
+
+        Args:
+            pptx_path: Path to the PowerPoint file
+            prs: Optional already-loaded Presentation object for pptx_path
+        """
+        self.pptx_path = Path(pptx_path)
+        self._prs = prs
+
+    @property
+    def prs(self) -> Any:
+        """The parsed Presentation, loaded on first access."""
+        if self._prs is None:
+            self._prs = Presentation(str(self.pptx_path))
+        return self._prs
+
+    @property
+    def slide_count(self) -> int:
+        """Number of slides in the presentation."""
+        return len(self.prs.slides)
+
+    @cached_property
+    def hidden_slides(self) -> Set[int]:
+        """0-based indices of slides marked as hidden."""
+        return {
+            idx
+            for idx, slide in enumerate(self.prs.slides)
+            if slide.element.get("show") == "0"
+        }
+
+    @cached_property
+    def slide_dimensions(self) -> Tuple[float, float]:
+        """Slide (width, height) in inches, defaulting to 16:9 if unset."""
+        width_emu = self.prs.slide_width or 9144000
+        height_emu = self.prs.slide_height or 5143500
+        return (
+            ShapeData.emu_to_inches(width_emu),
+            ShapeData.emu_to_inches(height_emu),
+        )
+
+    @cached_property
+    def inventory(self) -> InventoryData:
+        """Full text inventory of the presentation."""
+        return extract_text_inventory(self.pptx_path, self.prs)
+
+
 def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> InventoryDict:
     """Extract text inventory and return as JSON-serializable dictionaries.
 
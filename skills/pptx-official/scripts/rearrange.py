@@ -10,13 +10,29 @@ Slides can be repeated (e.g., 34 appears twice).
 """
 
 import argparse
-import shutil
+import re
 import sys
 from copy import deepcopy
 from pathlib import Path
 
-import six
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part, XmlPart
+
+R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+# Parts edited in place through a single slide are copied when the slide is
+# duplicated; all other targets (images, media, layout) are shared
+PER_SLIDE_RELTYPES = {
+    RT.CHART,
+    RT.DIAGRAM_DATA,
+    RT.OLE_OBJECT,
+    RT.PACKAGE,
+    "http://schemas.microsoft.com/office/2007/relationships/diagramDrawing",
+}
+
+# Relationships that belong to the original slide only
+SKIPPED_RELTYPES = {RT.NOTES_SLIDE, RT.COMMENTS}
 
 
 def main():
@@ -72,95 +88,131 @@ Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
         sys.exit(1)
 
 
+def partname_template(partname):
+    """Turn a partname like /ppt/charts/chart3.xml into /ppt/charts/chart%d.xml."""
+    return re.sub(r"\d*(\.\w+)$", r"%d\1", str(partname))
+
+
+def remap_rel_ids(element, rId_map):
+    """Rewrite every r:* attribute (r:embed, r:link, r:id, ...) in one pass."""
+    for el in element.iter():
+        for attr, value in el.attrib.items():
+            if attr.startswith(R_NS) and value in rId_map:
+                el.set(attr, rId_map[value])
+
+
+def new_part_like(part, package):
+    """Create an unrelated copy of `part` under the next free partname."""
+    partname = package.next_partname(partname_template(part.partname))
+    if isinstance(part, XmlPart):
+        return type(part)(
+            partname, part.content_type, package, deepcopy(part._element)
+        )
+    return Part(partname, part.content_type, package, blob=part.blob)
+
+
+def copy_rels(source, target, package, clone_reltypes=None):
+    """
+    Recreate the relationships of `source` on `target` and remap the rIds used
+    in `target`'s XML.
+
+    Targets whose reltype is in `clone_reltypes` are copied (recursively, with
+    all of their own parts); all other targets are shared. With
+    clone_reltypes=None every internal target is copied.
+    """
+    rId_map = {}
+    for rId, rel in source.rels.items():
+        if rel.reltype in SKIPPED_RELTYPES:
+            continue
+        if rel.is_external:
+            rId_map[rId] = target.rels.get_or_add_ext_rel(rel.reltype, rel.target_ref)
+        elif clone_reltypes is None or rel.reltype in clone_reltypes:
+            clone = new_part_like(rel.target_part, package)
+            # Relate the clone before copying its rels so it is reachable and
+            # next_partname() sees it
+            rId_map[rId] = target.rels.get_or_add(rel.reltype, clone)
+            copy_rels(rel.target_part, clone, package)
+        else:
+            rId_map[rId] = target.rels.get_or_add(rel.reltype, rel.target_part)
+
+    if isinstance(target, XmlPart):
+        remap_rel_ids(target._element, rId_map)
+    return rId_map
+
+
 def duplicate_slide(pres, index):
-    """Duplicate a slide in the presentation."""
-    source = pres.slides[index]
-
-    # Use source's layout to preserve formatting
-    new_slide = pres.slides.add_slide(source.slide_layout)
-
-    # Collect all image and media relationships from the source slide
-    image_rels = {}
-    for rel_id, rel in six.iteritems(source.part.rels):
-        if "image" in rel.reltype or "media" in rel.reltype:
-            image_rels[rel_id] = rel
-
-    # CRITICAL: Clear placeholder shapes to avoid duplicates
-    for shape in new_slide.shapes:
-        sp = shape.element
-        sp.getparent().remove(sp)
-
-    # Copy all shapes from source
-    for shape in source.shapes:
-        el = shape.element
-        new_el = deepcopy(el)
-        new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
-
-        # Handle picture shapes - need to update the blip reference
-        # Look for all blip elements (they can be in pic or other contexts)
-        # Using the element's own xpath method without namespaces argument
-        blips = new_el.xpath(".//a:blip[@r:embed]")
-        for blip in blips:
-            old_rId = blip.get(
-                "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-            )
-            if old_rId in image_rels:
-                # Create a new relationship in the destination slide for this image
-                old_rel = image_rels[old_rId]
-                # get_or_add returns the rId directly, or adds and returns new rId
-                new_rId = new_slide.part.rels.get_or_add(
-                    old_rel.reltype, old_rel._target
-                )
-                # Update the blip's embed reference to use the new relationship ID
-                blip.set(
-                    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
-                    new_rId,
-                )
-
-    # Copy any additional image/media relationships that might be referenced elsewhere
-    for rel_id, rel in image_rels.items():
-        try:
-            new_slide.part.rels.get_or_add(rel.reltype, rel._target)
-        except Exception:
-            pass  # Relationship might already exist
-
-    return new_slide
-
-
-def delete_slide(pres, index):
-    """Delete a slide from the presentation."""
-    rId = pres.slides._sldIdLst[index].rId
-    pres.part.drop_rel(rId)
-    del pres.slides._sldIdLst[index]
-
-
-def reorder_slides(pres, slide_index, target_index):
-    """Move a slide from one position to another."""
-    slides = pres.slides._sldIdLst
-
-    # Remove slide element from current position
-    slide_element = slides[slide_index]
-    slides.remove(slide_element)
-
-    # Insert at target position
-    slides.insert(target_index, slide_element)
+    """
+    Duplicate a slide in the presentation, appending it to the slide list.
+
+    The slide XML is cloned once and all relationship references are remapped
+    in a single pass. Images, media and the layout are shared with the source
+    slide; charts, SmartArt data and embedded objects get their own copies.
+    Notes and comments are not duplicated.
+    """
+    source_part = pres.slides[index].part
+    package = source_part.package
+
+    new_part = new_part_like(source_part, package)
+    rId = pres.part.relate_to(new_part, RT.SLIDE)
+    copy_rels(source_part, new_part, package, PER_SLIDE_RELTYPES)
+    pres.slides._sldIdLst.add_sldId(rId)
+
+    return new_part.slide
+
+
+def plan_slide_sequence(slide_sequence):
+    """
+    Plan how each position in the final sequence is sourced.
+
+    The first occurrence of a template slide uses the original slide; every
+    later occurrence needs a duplicate. Returns a list of
+    (template_index, needs_duplicate) tuples in final order.
+    """
+    seen = set()
+    plan = []
+    for template_idx in slide_sequence:
+        plan.append((template_idx, template_idx in seen))
+        seen.add(template_idx)
+    return plan
+
+
+def rewrite_slide_list(pres, sld_ids):
+    """
+    Replace the presentation's sldIdLst with the given sldId elements, in order,
+    and drop the relationships of every slide that is no longer listed.
+
+    Dropped slide parts become unreachable and are omitted on save, together
+    with any media, notes or charts that only they referenced.
+    """
+    sld_id_lst = pres.slides._sldIdLst
+    keep = {sld_id.rId for sld_id in sld_ids}
+    removed_rIds = [sld_id.rId for sld_id in sld_id_lst if sld_id.rId not in keep]
+
+    for sld_id in list(sld_id_lst):
+        sld_id_lst.remove(sld_id)
+    for sld_id in sld_ids:
+        sld_id_lst.append(sld_id)
+
+    for rId in removed_rIds:
+        pres.part.drop_rel(rId)
+
+    return len(removed_rIds)
 
 
 def rearrange_presentation(template_path, output_path, slide_sequence):
     """
     Create a new presentation with slides from template in specified order.
 
+    The final slide order is planned up front, repeated slides are duplicated,
+    and the slide list is rewritten once.
+
     Args:
         template_path: Path to template PPTX file
         output_path: Path for output PPTX file
         slide_sequence: List of slide indices (0-based) to include
     """
-    # Copy template to preserve dimensions and theme
-    if template_path != output_path:
-        shutil.copy2(template_path, output_path)
-        prs = Presentation(output_path)
-    else:
-        prs = Presentation(template_path)
+    # Load the template; saving to output_path preserves dimensions and theme
+    prs = Presentation(template_path)
 
     total_slides = len(prs.slides)
 
@@ -169,57 +221,26 @@ def rearrange_presentation(template_path, output_path, slide_sequence):
         if idx < 0 or idx >= total_slides:
             raise ValueError(f"Slide index {idx} out of range (0-{total_slides - 1})")
 
-    # Track original slides and their duplicates
-    slide_map = []  # List of actual slide indices for final presentation
-    duplicated = {}  # Track duplicates: original_idx -> [duplicate_indices]
+    # Capture the original slide list before any duplicates are appended
+    original_sld_ids = list(prs.slides._sldIdLst)
 
-    # Step 1: DUPLICATE repeated slides
+    # Step 1: PLAN the final sequence and DUPLICATE only repeated slides
     print(f"Processing {len(slide_sequence)} slides from template...")
-    for i, template_idx in enumerate(slide_sequence):
-        if template_idx in duplicated and duplicated[template_idx]:
-            # Already duplicated this slide, use the duplicate
-            slide_map.append(duplicated[template_idx].pop(0))
+    final_sld_ids = []
+    for i, (template_idx, needs_duplicate) in enumerate(
+        plan_slide_sequence(slide_sequence)
+    ):
+        if needs_duplicate:
+            duplicate_slide(prs, template_idx)
+            final_sld_ids.append(prs.slides._sldIdLst[-1])
             print(f"  [{i}] Using duplicate of slide {template_idx}")
-        elif slide_sequence.count(template_idx) > 1 and template_idx not in duplicated:
-            # First occurrence of a repeated slide - create duplicates
-            slide_map.append(template_idx)
-            duplicates = []
-            count = slide_sequence.count(template_idx) - 1
-            print(
-                f"  [{i}] Using original slide {template_idx}, creating {count} duplicate(s)"
-            )
-            for _ in range(count):
-                duplicate_slide(prs, template_idx)
-                duplicates.append(len(prs.slides) - 1)
-            duplicated[template_idx] = duplicates
         else:
-            # Unique slide or first occurrence already handled, use original
-            slide_map.append(template_idx)
+            final_sld_ids.append(original_sld_ids[template_idx])
             print(f"  [{i}] Using original slide {template_idx}")
 
-    # Step 2: DELETE unwanted slides (work backwards)
-    slides_to_keep = set(slide_map)
-    print(f"\nDeleting {len(prs.slides) - len(slides_to_keep)} unused slides...")
-    for i in range(len(prs.slides) - 1, -1, -1):
-        if i not in slides_to_keep:
-            delete_slide(prs, i)
-            # Update slide_map indices after deletion
-            slide_map = [idx - 1 if idx > i else idx for idx in slide_map]
-
-    # Step 3: REORDER to final sequence
-    print(f"Reordering {len(slide_map)} slides to final sequence...")
-    for target_pos in range(len(slide_map)):
-        # Find which slide should be at target_pos
-        current_pos = slide_map[target_pos]
-        if current_pos != target_pos:
-            reorder_slides(prs, current_pos, target_pos)
-            # Update slide_map: the move shifts other slides
-            for i in range(len(slide_map)):
-                if slide_map[i] > current_pos and slide_map[i] <= target_pos:
-                    slide_map[i] -= 1
-                elif slide_map[i] < current_pos and slide_map[i] >= target_pos:
-                    slide_map[i] += 1
-            slide_map[target_pos] = target_pos
+    # Step 2: REWRITE the slide list once, dropping unused slides
+    removed = rewrite_slide_list(prs, final_sld_ids)
+    print(f"\nRemoved {removed} unused slides")
 
     # Save the presentation
     prs.save(output_path)
@@ -3,19 +3,26 @@
 
 Usage:
     python replace.py <input.pptx> <replacements.json> <output.pptx>
+    python replace.py <template.pptx> <replacements.jsonl> <output_dir> --batch [--workers N]
 
 The replacements JSON should have the structure output by inventory.py.
 ALL text shapes identified by inventory.py will have their text cleared
 unless "paragraphs" is specified in the replacements for that shape.
+
+In batch mode each line of the JSON Lines file is one replacement document
+(optionally with an "output" file name). The template is loaded and
+inventoried once per worker and every document is written to its own file.
 """
 
+import argparse
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from inventory import InventoryData, extract_text_inventory
-from pptx import Presentation
+from inventory import DeckSession, InventoryData
 from pptx.dml.color import RGBColor
 from pptx.enum.dml import MSO_THEME_COLOR
 from pptx.enum.text import PP_ALIGN
@@ -159,6 +166,41 @@ def detect_frame_overflow(inventory: InventoryData) -> Dict[str, Dict[str, float
     return overflow_map
 
 
+def remeasure_replaced_shapes(
+    inventory: InventoryData, replacements: Dict
+) -> Tuple[Dict[str, Dict[str, float]], Dict[str, Dict[str, List[str]]]]:
+    """Re-measure only the shapes that received replacement paragraphs.
+
+    Cleared shapes have no text left and untouched shapes keep their original
+    overflow, so only the replaced shapes need their text measured again.
+
+    Returns (overflow_map, warnings_map), both slide_key -> shape_key -> value,
+    with the same shape keys as the original inventory. Only shapes with
+    overflow or warnings are included.
+    """
+    overflow_map: Dict[str, Dict[str, float]] = {}
+    warnings_map: Dict[str, Dict[str, List[str]]] = {}
+
+    for slide_key, shapes_data in replacements.items():
+        if slide_key not in inventory:
+            continue
+
+        for shape_key, replacement_shape_data in shapes_data.items():
+            if "paragraphs" not in replacement_shape_data:
+                continue
+
+            shape_data = inventory[slide_key][shape_key]
+            overflow = shape_data.measure_frame_overflow()
+            if overflow is not None:
+                overflow_map.setdefault(slide_key, {})[shape_key] = overflow
+
+            warnings = shape_data.find_bullet_issues()
+            if warnings:
+                warnings_map.setdefault(slide_key, {})[shape_key] = warnings
+
+    return overflow_map, warnings_map
+
+
 def validate_replacements(inventory: InventoryData, replacements: Dict) -> List[str]:
     """Validate that all shapes in replacements exist in inventory.
 
@@ -211,157 +253,335 @@ def check_duplicate_keys(pairs):
     return result
 
 
-def apply_replacements(pptx_file: str, json_file: str, output_file: str):
-    """Apply text replacements from JSON to PowerPoint presentation."""
+class TemplateFiller:
+    """A template loaded and inventoried once, for filling many times.
 
-    # Load presentation
-    prs = Presentation(pptx_file)
+    The presentation, its inventory and the original overflow map are built
+    in the constructor. Each call to fill() applies one replacement document,
+    saves the result and then restores the original text bodies, so the same
+    loaded template can be reused for the next document.
+    """
 
-    # Get inventory of all text shapes (returns ShapeData objects)
-    # Pass prs to use same Presentation instance
-    inventory = extract_text_inventory(Path(pptx_file), prs)
+    def __init__(self, pptx_file: str):
+        # Load presentation once; the session shares it with the inventory
+        self.session = DeckSession(Path(pptx_file))
+        self.prs = self.session.prs
+
+        # Get inventory of all text shapes (returns ShapeData objects)
+        self.inventory = self.session.inventory
+
+        # Detect text overflow in original presentation
+        self.original_overflow = detect_frame_overflow(self.inventory)
+
+        # Snapshot the text body of every inventoried shape; replacements only
+        # ever modify these elements
+        self._text_bodies = [
+            (shape_data.shape.element, deepcopy(shape_data.shape.element.txBody))
+            for shapes_dict in self.inventory.values()
+            for shape_data in shapes_dict.values()
+            if shape_data.shape is not None
+        ]
+
+    def _restore(self):
+        """Put the original text bodies back after a fill."""
+        for element, txBody in self._text_bodies:
+            element.replace(element.txBody, deepcopy(txBody))
+
+    def fill(
+        self,
+        replacements: Dict,
+        output_file: str,
+        log: Callable[[str], None] = print,
+    ) -> Dict[str, int]:
+        """Apply one replacement document and save the result to output_file.
+
+        Returns a dict of shape statistics. Raises ValueError if the
+        replacements are invalid or make the output worse.
+        """
+        try:
+            return self._fill(replacements, output_file, log)
+        finally:
+            self._restore()
+
+    def _fill(
+        self, replacements: Dict, output_file: str, log: Callable[[str], None]
+    ) -> Dict[str, int]:
+        prs = self.prs
+        inventory = self.inventory
+
+        # Validate replacements
+        errors = validate_replacements(inventory, replacements)
+        if errors:
+            log("ERROR: Invalid shapes in replacement JSON:")
+            for error in errors:
+                log(f"  - {error}")
+            log("\nPlease check the inventory and update your replacement JSON.")
+            log(
+                "You can regenerate the inventory with: python inventory.py <input.pptx> <output.json>"
+            )
+            raise ValueError(f"Found {len(errors)} validation error(s)")
+
+        # Track statistics
+        shapes_processed = 0
+        shapes_cleared = 0
+        shapes_replaced = 0
+
+        # Process each slide from inventory
+        for slide_key, shapes_dict in inventory.items():
+            if not slide_key.startswith("slide-"):
+                continue
 
-    # Detect text overflow in original presentation
-    original_overflow = detect_frame_overflow(inventory)
+            slide_index = int(slide_key.split("-")[1])
 
-    # Load replacement data with duplicate key detection
-    with open(json_file, "r") as f:
-        replacements = json.load(f, object_pairs_hook=check_duplicate_keys)
+            if slide_index >= len(prs.slides):
+                log(f"Warning: Slide {slide_index} not found")
+                continue
 
-    # Validate replacements
-    errors = validate_replacements(inventory, replacements)
-    if errors:
-        print("ERROR: Invalid shapes in replacement JSON:")
-        for error in errors:
-            print(f"  - {error}")
-        print("\nPlease check the inventory and update your replacement JSON.")
-        print(
-            "You can regenerate the inventory with: python inventory.py <input.pptx> <output.json>"
-        )
-        raise ValueError(f"Found {len(errors)} validation error(s)")
+            # Process each shape from inventory
+            for shape_key, shape_data in shapes_dict.items():
+                shapes_processed += 1
 
-    # Track statistics
-    shapes_processed = 0
-    shapes_cleared = 0
-    shapes_replaced = 0
+                # Get the shape directly from ShapeData
+                shape = shape_data.shape
+                if not shape:
+                    log(f"Warning: {shape_key} has no shape reference")
+                    continue
 
-    # Process each slide from inventory
-    for slide_key, shapes_dict in inventory.items():
-        if not slide_key.startswith("slide-"):
-            continue
+                # ShapeData already validates text_frame in __init__
+                text_frame = shape.text_frame  # type: ignore
 
-        slide_index = int(slide_key.split("-")[1])
+                text_frame.clear()  # type: ignore
+                shapes_cleared += 1
 
-        if slide_index >= len(prs.slides):
-            print(f"Warning: Slide {slide_index} not found")
-            continue
+                # Check for replacement paragraphs
+                replacement_shape_data = replacements.get(slide_key, {}).get(
+                    shape_key, {}
+                )
+                if "paragraphs" not in replacement_shape_data:
+                    continue
 
-        # Process each shape from inventory
-        for shape_key, shape_data in shapes_dict.items():
-            shapes_processed += 1
+                shapes_replaced += 1
 
-            # Get the shape directly from ShapeData
-            shape = shape_data.shape
-            if not shape:
-                print(f"Warning: {shape_key} has no shape reference")
-                continue
+                # Add replacement paragraphs
+                for i, para_data in enumerate(replacement_shape_data["paragraphs"]):
+                    if i == 0:
+                        p = text_frame.paragraphs[0]  # type: ignore
+                    else:
+                        p = text_frame.add_paragraph()  # type: ignore
 
-            # ShapeData already validates text_frame in __init__
-            text_frame = shape.text_frame  # type: ignore
+                    apply_paragraph_properties(p, para_data)
 
-            text_frame.clear()  # type: ignore
-            shapes_cleared += 1
+        # Check for issues after replacements. Measurement is read-only, so only
+        # the replaced shapes are re-measured in memory; every other shape keeps
+        # its original overflow value.
+        updated_overflow, updated_warnings = remeasure_replaced_shapes(
+            inventory, replacements
+        )
 
-            # Check for replacement paragraphs
-            replacement_shape_data = replacements.get(slide_key, {}).get(shape_key, {})
-            if "paragraphs" not in replacement_shape_data:
-                continue
+        # Check if any text overflow got worse
+        overflow_errors = []
+        for slide_key, shape_overflows in updated_overflow.items():
+            for shape_key, new_overflow in shape_overflows.items():
+                # Get original overflow (0 if there was no overflow before)
+                original = self.original_overflow.get(slide_key, {}).get(
+                    shape_key, 0.0
+                )
 
-            shapes_replaced += 1
+                # Error if overflow increased
+                if new_overflow > original + 0.01:  # Small tolerance for rounding
+                    increase = new_overflow - original
+                    overflow_errors.append(
+                        f'{slide_key}/{shape_key}: overflow worsened by {increase:.2f}" '
+                        f'(was {original:.2f}", now {new_overflow:.2f}")'
+                    )
+
+        # Collect warnings from updated shapes
+        warnings = []
+        for slide_key, shape_warnings in updated_warnings.items():
+            for shape_key, shape_warning_list in shape_warnings.items():
+                for warning in shape_warning_list:
+                    warnings.append(f"{slide_key}/{shape_key}: {warning}")
 
-            # Add replacement paragraphs
-            for i, para_data in enumerate(replacement_shape_data["paragraphs"]):
-                if i == 0:
-                    p = text_frame.paragraphs[0]  # type: ignore
-                else:
-                    p = text_frame.add_paragraph()  # type: ignore
+        # Fail if there are any issues
+        if overflow_errors or warnings:
+            log("\nERROR: Issues detected in replacement output:")
+            if overflow_errors:
+                log("\nText overflow worsened:")
+                for error in overflow_errors:
+                    log(f"  - {error}")
+            if warnings:
+                log("\nFormatting warnings:")
+                for warning in warnings:
+                    log(f"  - {warning}")
+            log("\nPlease fix these issues before saving.")
+            raise ValueError(
+                f"Found {len(overflow_errors)} overflow error(s) and {len(warnings)} warning(s)"
+            )
+
+        # Save the presentation
+        prs.save(output_file)
+
+        return {
+            "slides": len(prs.slides),
+            "shapes_processed": shapes_processed,
+            "shapes_cleared": shapes_cleared,
+            "shapes_replaced": shapes_replaced,
+        }
+
+
+def apply_replacements(pptx_file: str, json_file: str, output_file: str):
+    """Apply text replacements from JSON to PowerPoint presentation."""
+
+    # Load replacement data with duplicate key detection
+    with open(json_file, "r") as f:
+        replacements = json.load(f, object_pairs_hook=check_duplicate_keys)
+
+    stats = TemplateFiller(pptx_file).fill(replacements, output_file)
+
+    # Report results
+    print(f"Saved updated presentation to: {output_file}")
+    print(f"Processed {stats['slides']} slides")
+    print(f"  - Shapes processed: {stats['shapes_processed']}")
+    print(f"  - Shapes cleared: {stats['shapes_cleared']}")
+    print(f"  - Shapes replaced: {stats['shapes_replaced']}")
 
-                apply_paragraph_properties(p, para_data)
 
-    # Check for issues after replacements
-    # Save to a temporary file and reload to avoid modifying the presentation during inventory
-    # (extract_text_inventory accesses font.color which adds empty <a:solidFill/> elements)
-    import tempfile
+# Per-process template used by batch workers (set by _init_batch_worker)
+_batch_filler: Optional[TemplateFiller] = None
 
-    with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-        prs.save(str(tmp_path))
 
+def _init_batch_worker(pptx_file: str):
+    """Load and inventory the template once per worker process."""
+    global _batch_filler
+    _batch_filler = TemplateFiller(pptx_file)
+
+
+def _fill_batch_record(task) -> Tuple[int, str, Optional[str], List[str]]:
+    """Fill one batch record; returns (line_number, output_file, error, log_lines)."""
+    line_number, replacements, output_file = task
+    log_lines: List[str] = []
+    assert _batch_filler is not None, "Batch worker not initialized"
     try:
-        updated_inventory = extract_text_inventory(tmp_path)
-        updated_overflow = detect_frame_overflow(updated_inventory)
-    finally:
-        tmp_path.unlink()  # Clean up temp file
-
-    # Check if any text overflow got worse
-    overflow_errors = []
-    for slide_key, shape_overflows in updated_overflow.items():
-        for shape_key, new_overflow in shape_overflows.items():
-            # Get original overflow (0 if there was no overflow before)
-            original = original_overflow.get(slide_key, {}).get(shape_key, 0.0)
-
-            # Error if overflow increased
-            if new_overflow > original + 0.01:  # Small tolerance for rounding
-                increase = new_overflow - original
-                overflow_errors.append(
-                    f'{slide_key}/{shape_key}: overflow worsened by {increase:.2f}" '
-                    f'(was {original:.2f}", now {new_overflow:.2f}")'
-                )
+        _batch_filler.fill(replacements, output_file, log=log_lines.append)
+        return line_number, output_file, None, log_lines
+    except Exception as e:
+        return line_number, output_file, str(e), log_lines
 
-    # Collect warnings from updated shapes
-    warnings = []
-    for slide_key, shapes_dict in updated_inventory.items():
-        for shape_key, shape_data in shapes_dict.items():
-            if shape_data.warnings:
-                for warning in shape_data.warnings:
-                    warnings.append(f"{slide_key}/{shape_key}: {warning}")
 
-    # Fail if there are any issues
-    if overflow_errors or warnings:
-        print("\nERROR: Issues detected in replacement output:")
-        if overflow_errors:
-            print("\nText overflow worsened:")
-            for error in overflow_errors:
-                print(f"  - {error}")
-        if warnings:
-            print("\nFormatting warnings:")
-            for warning in warnings:
-                print(f"  - {warning}")
-        print("\nPlease fix these issues before saving.")
-        raise ValueError(
-            f"Found {len(overflow_errors)} overflow error(s) and {len(warnings)} warning(s)"
-        )
+def load_batch_records(
+    jsonl_file: str, output_dir: Path, stem: str
+) -> List[Tuple[int, Dict, str]]:
+    """Read replacement documents from a JSON Lines file.
+
+    Each non-empty line is one replacement document. An optional "output" key
+    names the output file (relative to output_dir); otherwise files are named
+    <stem>-<line_number>.pptx.
+    """
+    records = []
+    with open(jsonl_file, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                replacements = json.loads(line, object_pairs_hook=check_duplicate_keys)
+            except ValueError as e:
+                raise ValueError(f"Line {line_number}: {e}")
+            output_name = replacements.pop("output", None) or (
+                f"{stem}-{line_number:05d}.pptx"
+            )
+            records.append((line_number, replacements, str(output_dir / output_name)))
+    return records
+
+
+def apply_replacements_batch(
+    pptx_file: str,
+    jsonl_file: str,
+    output_dir: str,
+    workers: Optional[int] = None,
+) -> int:
+    """Apply many replacement documents (JSON Lines) to one template.
+
+    The template is loaded and inventoried once per worker process and reused
+    for every document that worker handles. Each document is written to its
+    own output file. Returns the number of documents that failed.
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    records = load_batch_records(jsonl_file, output_path, Path(pptx_file).stem)
 
-    # Save the presentation
-    prs.save(output_file)
+    print(f"Filling {len(records)} document(s) from template: {pptx_file}")
 
-    # Report results
-    print(f"Saved updated presentation to: {output_file}")
-    print(f"Processed {len(prs.slides)} slides")
-    print(f"  - Shapes processed: {shapes_processed}")
-    print(f"  - Shapes cleared: {shapes_cleared}")
-    print(f"  - Shapes replaced: {shapes_replaced}")
+    if workers == 1:
+        _init_batch_worker(pptx_file)
+        results = map(_fill_batch_record, records)
+        failures = _report_batch_results(results)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(pptx_file,),
+        ) as executor:
+            results = executor.map(_fill_batch_record, records, chunksize=8)
+            failures = _report_batch_results(results)
+
+    print(f"Saved {len(records) - failures} presentation(s) to: {output_dir}")
+    if failures:
+        print(f"  - Failed: {failures}")
+    return failures
+
+
+def _report_batch_results(results) -> int:
+    """Print per-record results as they arrive and return the failure count."""
+    failures = 0
+    for line_number, output_file, error, log_lines in results:
+        if error:
+            failures += 1
+            print(f"[line {line_number}] FAILED: {error}")
+            for log_line in log_lines:
+                if log_line.strip():
+                    print(f"    {log_line.lstrip()}")
+        else:
+            print(f"[line {line_number}] Saved {output_file}")
+    return failures
 
 
 def main():
     """Main entry point for command-line usage."""
-    if len(sys.argv) != 4:
-        print(__doc__)
-        sys.exit(1)
-
-    input_pptx = Path(sys.argv[1])
-    replacements_json = Path(sys.argv[2])
-    output_pptx = Path(sys.argv[3])
+    parser = argparse.ArgumentParser(
+        description="Apply text replacements to a PowerPoint presentation.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python replace.py input.pptx replacements.json output.pptx
+    Applies one replacement document
+
+  python replace.py template.pptx recipients.jsonl out_dir/ --batch --workers 4
+    Applies every line of recipients.jsonl, writing one presentation per line
+        """,
+    )
+    parser.add_argument("input", help="Input PowerPoint file (.pptx)")
+    parser.add_argument(
+        "replacements", help="Replacements JSON file (JSON Lines with --batch)"
+    )
+    parser.add_argument(
+        "output", help="Output PowerPoint file (output directory with --batch)"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Treat replacements as JSON Lines, one document per output file",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --batch (default: CPU count)",
+    )
+
+    args = parser.parse_args()
+
+    input_pptx = Path(args.input)
+    replacements_json = Path(args.replacements)
 
     if not input_pptx.exists():
         print(f"Error: Input file '{input_pptx}' not found")
@@ -372,7 +592,14 @@ def main():
         sys.exit(1)
 
     try:
-        apply_replacements(str(input_pptx), str(replacements_json), str(output_pptx))
+        if args.batch:
+            failures = apply_replacements_batch(
+                str(input_pptx), str(replacements_json), args.output, args.workers
+            )
+            if failures:
+                sys.exit(1)
+        else:
+            apply_replacements(str(input_pptx), str(replacements_json), args.output)
     except Exception as e:
         print(f"Error applying replacements: {e}")
         import traceback
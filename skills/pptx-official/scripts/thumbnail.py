@@ -46,9 +46,8 @@ import sys
 import tempfile
 from pathlib import Path
 
-from inventory import extract_text_inventory
+from inventory import DeckSession
 from PIL import Image, ImageDraw, ImageFont
-from pptx import Presentation
 
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
@@ -107,19 +106,22 @@ def main():
 
     try:
         with tempfile.TemporaryDirectory() as temp_dir:
+            # Open the deck once for all analysis steps
+            session = DeckSession(input_path)
+
             # Get placeholder regions if outlining is enabled
             placeholder_regions = None
             slide_dimensions = None
             if args.outline_placeholders:
                 print("Extracting placeholder regions...")
                 placeholder_regions, slide_dimensions = get_placeholder_regions(
-                    input_path
+                    session
                 )
                 if placeholder_regions:
                     print(f"Found placeholders on {len(placeholder_regions)} slides")
 
             # Convert slides to images
-            slide_images = convert_to_images(input_path, Path(temp_dir), CONVERSION_DPI)
+            slide_images = convert_to_images(session, Path(temp_dir), CONVERSION_DPI)
             if not slide_images:
                 print("Error: No slides found")
                 sys.exit(1)
@@ -156,23 +158,18 @@ def create_hidden_slide_placeholder(size):
     return img
 
 
-def get_placeholder_regions(pptx_path):
+def get_placeholder_regions(session):
     """Extract ALL text regions from the presentation.
 
+    Takes a DeckSession so the inventory is shared with other analysis steps.
     Returns a tuple of (placeholder_regions, slide_dimensions).
     text_regions is a dict mapping slide indices to lists of text regions.
     Each region is a dict with 'left', 'top', 'width', 'height' in inches.
     slide_dimensions is a tuple of (width_inches, height_inches).
     """
-    prs = Presentation(str(pptx_path))
-    inventory = extract_text_inventory(pptx_path, prs)
     placeholder_regions = {}
 
-    # Get actual slide dimensions in inches (EMU to inches conversion)
-    slide_width_inches = (prs.slide_width or 9144000) / 914400.0
-    slide_height_inches = (prs.slide_height or 5143500) / 914400.0
-
-    for slide_key, shapes in inventory.items():
+    for slide_key, shapes in session.inventory.items():
         # Extract slide index from "slide-N" format
         slide_idx = int(slide_key.split("-")[1])
         regions = []
@@ -191,22 +188,19 @@ def get_placeholder_regions(pptx_path):
         if regions:
             placeholder_regions[slide_idx] = regions
 
-    return placeholder_regions, (slide_width_inches, slide_height_inches)
+    return placeholder_regions, session.slide_dimensions
 
 
-def convert_to_images(pptx_path, temp_dir, dpi):
-    """Convert PowerPoint to images via PDF, handling hidden slides."""
+def convert_to_images(session, temp_dir, dpi):
+    """Convert PowerPoint to in-memory PIL images via PDF, handling hidden slides."""
+    pptx_path = session.pptx_path
+
     # Detect hidden slides
     print("Analyzing presentation...")
-    prs = Presentation(str(pptx_path))
-    total_slides = len(prs.slides)
+    total_slides = session.slide_count
 
     # Find hidden slides (1-based indexing for display)
-    hidden_slides = {
-        idx + 1
-        for idx, slide in enumerate(prs.slides)
-        if slide.element.get("show") == "0"
-    }
+    hidden_slides = {idx + 1 for idx in session.hidden_slides}
 
     print(f"Total slides: {total_slides}")
     if hidden_slides:
@@ -232,36 +226,37 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     if result.returncode != 0 or not pdf_path.exists():
         raise RuntimeError("PDF conversion failed")
 
-    # Convert PDF to images
+    # Convert PDF to images, streaming PPM frames from pdftoppm's stdout
+    # (no output root) so slides are decoded in memory instead of being
+    # written to and re-read from disk as JPEGs
     print(f"Converting to images at {dpi} DPI...")
-    result = subprocess.run(
-        ["pdftoppm", "-jpeg", "-r", str(dpi), str(pdf_path), str(temp_dir / "slide")],
-        capture_output=True,
-        text=True,
+    process = subprocess.Popen(
+        ["pdftoppm", "-r", str(dpi), str(pdf_path)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
     )
-    if result.returncode != 0:
+    try:
+        visible_images = list(read_ppm_frames(process.stdout))
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    if returncode != 0:
         raise RuntimeError("Image conversion failed")
 
-    visible_images = sorted(temp_dir.glob("slide-*.jpg"))
-
     # Create full list with placeholders for hidden slides
     all_images = []
     visible_idx = 0
 
     # Get placeholder dimensions from first visible slide
     if visible_images:
-        with Image.open(visible_images[0]) as img:
-            placeholder_size = img.size
+        placeholder_size = visible_images[0].size
     else:
         placeholder_size = (1920, 1080)
 
     for slide_num in range(1, total_slides + 1):
         if slide_num in hidden_slides:
             # Create placeholder image for hidden slide
-            placeholder_path = temp_dir / f"hidden-{slide_num:03d}.jpg"
-            placeholder_img = create_hidden_slide_placeholder(placeholder_size)
-            placeholder_img.save(placeholder_path, "JPEG")
-            all_images.append(placeholder_path)
+            all_images.append(create_hidden_slide_placeholder(placeholder_size))
         else:
             # Use the actual visible slide image
             if visible_idx < len(visible_images):
@@ -271,15 +266,58 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     return all_images
 
 
+def read_ppm_frames(stream):
+    """Yield RGB images from a stream of concatenated binary PPM (P6) frames.
+
+    pdftoppm writes one frame per page to stdout when no output root is given.
+    """
+    while True:
+        magic = stream.read(2)
+        if not magic:
+            return
+        if magic != b"P6":
+            raise RuntimeError(f"Unexpected PPM frame header: {magic!r}")
+
+        # Header fields: width, height, maxval (separated by whitespace/comments)
+        fields = []
+        token = b""
+        while len(fields) < 3:
+            char = stream.read(1)
+            if not char:
+                raise RuntimeError("Truncated PPM header")
+            if char == b"#" and not token:
+                # Skip comment to end of line
+                while char not in (b"\n", b""):
+                    char = stream.read(1)
+                continue
+            if char.isspace():
+                if token:
+                    fields.append(int(token))
+                    token = b""
+                continue
+            token += char
+        # The single whitespace byte after maxval was consumed by the loop above
+
+        width, height, maxval = fields
+        if maxval > 255:
+            raise RuntimeError(f"Unsupported PPM maxval: {maxval}")
+
+        size = width * height * 3
+        data = stream.read(size)
+        if len(data) != size:
+            raise RuntimeError("Truncated PPM frame data")
+        yield Image.frombytes("RGB", (width, height), data)
+
+
 def create_grids(
-    image_paths,
+    images,
     cols,
     width,
     output_path,
     placeholder_regions=None,
     slide_dimensions=None,
 ):
-    """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid."""
+    """Create multiple thumbnail grids from in-memory slide images, max cols×(cols+1) images per grid."""
     # Maximum images per grid is cols × (cols + 1) for better proportions
     max_images_per_grid = cols * (cols + 1)
     grid_files = []
@@ -290,10 +328,10 @@ def create_grids(
 
     # Split images into chunks
     for chunk_idx, start_idx in enumerate(
-        range(0, len(image_paths), max_images_per_grid)
+        range(0, len(images), max_images_per_grid)
     ):
-        end_idx = min(start_idx + max_images_per_grid, len(image_paths))
-        chunk_images = image_paths[start_idx:end_idx]
+        end_idx = min(start_idx + max_images_per_grid, len(images))
+        chunk_images = images[start_idx:end_idx]
 
         # Create grid for this chunk
         grid = create_grid(
@@ -301,7 +339,7 @@ def create_grids(
         )
 
         # Generate output filename
-        if len(image_paths) <= max_images_per_grid:
+        if len(images) <= max_images_per_grid:
             # Single grid - use base filename without suffix
             grid_filename = output_path
         else:
@@ -319,7 +357,7 @@ def create_grids(
 
 
 def create_grid(
-    image_paths,
+    images,
     cols,
     width,
     start_slide_num=0,
@@ -331,12 +369,11 @@ def create_grid(
     label_padding = int(font_size * LABEL_PADDING_RATIO)
 
     # Get dimensions
-    with Image.open(image_paths[0]) as img:
-        aspect = img.height / img.width
+    aspect = images[0].height / images[0].width
     height = int(width * aspect)
 
     # Calculate grid size
-    rows = (len(image_paths) + cols - 1) // cols
+    rows = (len(images) + cols - 1) // cols
     grid_w = cols * width + (cols + 1) * GRID_PADDING
     grid_h = rows * (height + font_size + label_padding * 2) + (rows + 1) * GRID_PADDING
 
@@ -353,7 +390,7 @@ def create_grid(
         font = ImageFont.load_default()
 
     # Place thumbnails
-    for i, img_path in enumerate(image_paths):
+    for i, img in enumerate(images):
         row, col = i // cols, i % cols
         x = col * width + (col + 1) * GRID_PADDING
         y_base = (
@@ -374,75 +411,74 @@ def create_grid(
         # Add thumbnail below label with proportional spacing
         y_thumbnail = y_base + label_padding + font_size + label_padding
 
-        with Image.open(img_path) as img:
-            # Get original dimensions before thumbnail
-            orig_w, orig_h = img.size
-
-            # Apply placeholder outlines if enabled
-            if placeholder_regions and (start_slide_num + i) in placeholder_regions:
-                # Convert to RGBA for transparency support
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-
-                # Get the regions for this slide
-                regions = placeholder_regions[start_slide_num + i]
-
-                # Calculate scale factors using actual slide dimensions
-                if slide_dimensions:
-                    slide_width_inches, slide_height_inches = slide_dimensions
-                else:
-                    # Fallback: estimate from image size at CONVERSION_DPI
-                    slide_width_inches = orig_w / CONVERSION_DPI
-                    slide_height_inches = orig_h / CONVERSION_DPI
-
-                x_scale = orig_w / slide_width_inches
-                y_scale = orig_h / slide_height_inches
-
-                # Create a highlight overlay
-                overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-
-                # Highlight each placeholder region
-                for region in regions:
-                    # Convert from inches to pixels in the original image
-                    px_left = int(region["left"] * x_scale)
-                    px_top = int(region["top"] * y_scale)
-                    px_width = int(region["width"] * x_scale)
-                    px_height = int(region["height"] * y_scale)
-
-                    # Draw highlight outline with red color and thick stroke
-                    # Using a bright red outline instead of fill
-                    stroke_width = max(
-                        5, min(orig_w, orig_h) // 150
-                    )  # Thicker proportional stroke width
-                    overlay_draw.rectangle(
-                        [(px_left, px_top), (px_left + px_width, px_top + px_height)],
-                        outline=(255, 0, 0, 255),  # Bright red, fully opaque
-                        width=stroke_width,
-                    )
-
-                # Composite the overlay onto the image using alpha blending
-                img = Image.alpha_composite(img, overlay)
-                # Convert back to RGB for JPEG saving
-                img = img.convert("RGB")
-
-            img.thumbnail((width, height), Image.Resampling.LANCZOS)
-            w, h = img.size
-            tx = x + (width - w) // 2
-            ty = y_thumbnail + (height - h) // 2
-            grid.paste(img, (tx, ty))
-
-            # Add border
-            if BORDER_WIDTH > 0:
-                draw.rectangle(
-                    [
-                        (tx - BORDER_WIDTH, ty - BORDER_WIDTH),
-                        (tx + w + BORDER_WIDTH - 1, ty + h + BORDER_WIDTH - 1),
-                    ],
-                    outline="gray",
-                    width=BORDER_WIDTH,
+        # Get original dimensions before thumbnail
+        orig_w, orig_h = img.size
+
+        # Apply placeholder outlines if enabled
+        if placeholder_regions and (start_slide_num + i) in placeholder_regions:
+            # Convert to RGBA for transparency support
+            if img.mode != "RGBA":
+                img = img.convert("RGBA")
+
+            # Get the regions for this slide
+            regions = placeholder_regions[start_slide_num + i]
+
+            # Calculate scale factors using actual slide dimensions
+            if slide_dimensions:
+                slide_width_inches, slide_height_inches = slide_dimensions
+            else:
+                # Fallback: estimate from image size at CONVERSION_DPI
+                slide_width_inches = orig_w / CONVERSION_DPI
+                slide_height_inches = orig_h / CONVERSION_DPI
+
+            x_scale = orig_w / slide_width_inches
+            y_scale = orig_h / slide_height_inches
+
+            # Create a highlight overlay
+            overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
+            overlay_draw = ImageDraw.Draw(overlay)
+
+            # Highlight each placeholder region
+            for region in regions:
+                # Convert from inches to pixels in the original image
+                px_left = int(region["left"] * x_scale)
+                px_top = int(region["top"] * y_scale)
+                px_width = int(region["width"] * x_scale)
+                px_height = int(region["height"] * y_scale)
+
+                # Draw highlight outline with red color and thick stroke
+                # Using a bright red outline instead of fill
+                stroke_width = max(
+                    5, min(orig_w, orig_h) // 150
+                )  # Thicker proportional stroke width
+                overlay_draw.rectangle(
+                    [(px_left, px_top), (px_left + px_width, px_top + px_height)],
+                    outline=(255, 0, 0, 255),  # Bright red, fully opaque
+                    width=stroke_width,
                 )
 
+            # Composite the overlay onto the image using alpha blending
+            img = Image.alpha_composite(img, overlay)
+            # Convert back to RGB for JPEG saving
+            img = img.convert("RGB")
+
+        img.thumbnail((width, height), Image.Resampling.LANCZOS)
+        w, h = img.size
+        tx = x + (width - w) // 2
+        ty = y_thumbnail + (height - h) // 2
+        grid.paste(img, (tx, ty))
+
+        # Add border
+        if BORDER_WIDTH > 0:
+            draw.rectangle(
+                [
+                    (tx - BORDER_WIDTH, ty - BORDER_WIDTH),
+                    (tx + w + BORDER_WIDTH - 1, ty + h + BORDER_WIDTH - 1),
+                ],
+                outline="gray",
+                width=BORDER_WIDTH,
+            )
+
     return grid
 
 